@@ -4,6 +4,15 @@
 
 set -e
 
+# Machine-readable output: run all probes concurrently under one deadline
+# (utils/health_check.py) instead of the sequential checks below
+case "$1" in
+    --json|--prometheus)
+        exec python3 "$(dirname "$0")/../utils/health_check.py" \
+            --format "${1#--}" --deadline "${HEALTH_CHECK_DEADLINE:-3}"
+        ;;
+esac
+
 # Colors for output
 RED='\033[0;31m'
 GREEN='\033[0;32m'
@@ -0,0 +1,73 @@
+-- ARIA Reminder Index Plan Check
+-- Seeds ~1M reminders into a scratch copy of aria_reminders and fails if
+-- get_upcoming_reminders / get_overdue_reminders stop using an index.
+-- Everything runs in a rolled-back transaction on a temp table.
+--
+-- The temp table is named aria_reminders, so it shadows the real one
+-- (pg_temp comes first in the search path) and the functions' own queries
+-- run against it: no lock is taken on the live table and its statistics
+-- are left alone. SQL functions (010 and later) are EXPLAINed directly and
+-- must be inlined; plpgsql versions hide their plan behind a Function
+-- Scan, so for those the equivalent query is EXPLAINed instead.
+--
+-- Usage: psql -v ON_ERROR_STOP=1 -f supabase/checks/reminder_index_plans.sql
+
+BEGIN;
+
+CREATE TEMP TABLE aria_reminders (LIKE public.aria_reminders INCLUDING ALL) ON COMMIT DROP;
+
+-- 200 users, ~2% of rows still active, rest completed history
+INSERT INTO pg_temp.aria_reminders (user_id, reminder_text, remind_at, completed, completed_at, snoozed_until)
+SELECT
+  'user_' || (g % 200),
+  'Reminder ' || g,
+  NOW() + ((g % 20000) - 10000) * INTERVAL '1 minute',
+  g % 50 <> 0,
+  CASE WHEN g % 50 <> 0 THEN NOW() - (g % 1000) * INTERVAL '1 hour' END,
+  CASE WHEN g % 500 = 0 THEN NOW() + INTERVAL '30 minutes' END
+FROM generate_series(1, 1000000) g;
+
+ANALYZE pg_temp.aria_reminders;
+
+DO $$
+DECLARE
+  v_check RECORD;
+  v_plan TEXT;
+  v_query TEXT;
+BEGIN
+  FOR v_check IN
+    SELECT c.fn, c.call, c.equivalent, l.lanname
+    FROM (VALUES
+      ('get_upcoming_reminders',
+       $q$SELECT * FROM get_upcoming_reminders('user_7', 24)$q$,
+       $q$SELECT r.id FROM aria_reminders r
+          WHERE r.user_id = 'user_7' AND NOT r.completed
+            AND COALESCE(r.snoozed_until, r.remind_at) >= NOW()
+            AND COALESCE(r.snoozed_until, r.remind_at) <= NOW() + make_interval(hours => 24)
+          ORDER BY COALESCE(r.snoozed_until, r.remind_at)$q$),
+      ('get_overdue_reminders',
+       $q$SELECT * FROM get_overdue_reminders('user_7')$q$,
+       $q$SELECT r.id FROM aria_reminders r
+          WHERE r.user_id = 'user_7' AND NOT r.completed
+            AND COALESCE(r.snoozed_until, r.remind_at) < NOW()
+          ORDER BY COALESCE(r.snoozed_until, r.remind_at)$q$)
+    ) AS c (fn, call, equivalent)
+    JOIN pg_proc p ON p.proname = c.fn
+    JOIN pg_namespace n ON n.oid = p.pronamespace AND n.nspname = 'public'
+    JOIN pg_language l ON l.oid = p.prolang
+  LOOP
+    v_query := CASE WHEN v_check.lanname = 'sql' THEN v_check.call ELSE v_check.equivalent END;
+    EXECUTE 'EXPLAIN (FORMAT JSON) ' || v_query INTO v_plan;
+
+    IF v_check.lanname = 'sql' AND v_plan LIKE '%Function Scan%' THEN
+      RAISE EXCEPTION '% is no longer inlined -- plan: %', v_check.fn, v_plan;
+    END IF;
+    IF v_plan LIKE '%Seq Scan%' OR v_plan NOT LIKE '%Index%' THEN
+      RAISE EXCEPTION '% does not use an index: % -- plan: %', v_check.fn, v_query, v_plan;
+    END IF;
+  END LOOP;
+
+  RAISE NOTICE 'Reminder index plans OK';
+END $$;
+
+ROLLBACK;
@@ -0,0 +1,35 @@
+-- ARIA Reminder Snapshot
+-- Returns overdue, upcoming and summary data in a single round trip
+-- Created: October 17, 2026
+
+-- Snapshot of a user's reminder state for conversation start.
+-- Rows are returned as JSONB so overdue, upcoming and summary fit in one
+-- result; interval columns are dropped and recomputed by the caller from as_of.
+CREATE OR REPLACE FUNCTION get_reminder_snapshot(
+  p_user_id TEXT DEFAULT 'damon',
+  p_upcoming_hours INTEGER DEFAULT 2
+)
+RETURNS TABLE (
+  as_of TIMESTAMPTZ,
+  overdue JSONB,
+  upcoming JSONB,
+  summary JSONB
+) AS $$
+  SELECT
+    NOW(),
+    COALESCE(
+      (SELECT jsonb_agg(to_jsonb(o) - 'overdue_by' ORDER BY o.remind_at)
+       FROM get_overdue_reminders(p_user_id) o),
+      '[]'::JSONB
+    ),
+    COALESCE(
+      (SELECT jsonb_agg(to_jsonb(u) - 'time_until' ORDER BY u.remind_at)
+       FROM get_upcoming_reminders(p_user_id, p_upcoming_hours) u),
+      '[]'::JSONB
+    ),
+    (SELECT to_jsonb(s) - 'user_id'
+     FROM aria_reminder_summary s
+     WHERE s.user_id = p_user_id);
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION get_reminder_snapshot IS 'Get overdue, upcoming and summary reminder data in one call';
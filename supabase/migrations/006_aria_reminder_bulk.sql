@@ -0,0 +1,77 @@
+-- ARIA Reminder Bulk Operations
+-- Set-based completion with recurrence handling
+-- Created: October 17, 2026
+
+-- Complete many reminders in one statement (and handle recurrence).
+-- Mirrors complete_reminder(): one result row per distinct requested id.
+-- Next occurrences get pre-generated ids so they can be mapped back to
+-- the reminder they were created from.
+CREATE OR REPLACE FUNCTION complete_reminders(
+  p_reminder_ids UUID[]
+)
+RETURNS TABLE (
+  reminder_id UUID,
+  success BOOLEAN,
+  message TEXT,
+  next_reminder_id UUID
+) AS $$
+  WITH requested AS (
+    SELECT DISTINCT unnest(p_reminder_ids) AS id
+  ),
+  locked AS (
+    SELECT r.*
+    FROM aria_reminders r
+    JOIN requested q ON q.id = r.id
+    FOR UPDATE OF r
+  ),
+  done AS (
+    UPDATE aria_reminders r
+    SET completed = TRUE, completed_at = NOW()
+    FROM locked l
+    WHERE r.id = l.id AND NOT l.completed
+    RETURNING r.*
+  ),
+  next_occurrence AS (
+    SELECT
+      d.id AS source_id,
+      gen_random_uuid() AS next_id,
+      d.user_id, d.reminder_text, d.recurrence, d.recurrence_end_date,
+      d.priority, d.category, d.metadata, d.source,
+      CASE d.recurrence
+        WHEN 'daily' THEN d.remind_at + INTERVAL '1 day'
+        WHEN 'weekly' THEN d.remind_at + INTERVAL '1 week'
+        WHEN 'monthly' THEN d.remind_at + INTERVAL '1 month'
+        WHEN 'yearly' THEN d.remind_at + INTERVAL '1 year'
+      END AS next_remind_at
+    FROM done d
+    WHERE d.recurrence IS NOT NULL
+  ),
+  inserted AS (
+    INSERT INTO aria_reminders (
+      id, user_id, reminder_text, remind_at, recurrence,
+      recurrence_end_date, priority, category, metadata, source
+    )
+    SELECT
+      n.next_id, n.user_id, n.reminder_text, n.next_remind_at, n.recurrence,
+      n.recurrence_end_date, n.priority, n.category, n.metadata, n.source
+    FROM next_occurrence n
+    WHERE n.recurrence_end_date IS NULL OR n.next_remind_at <= n.recurrence_end_date
+    RETURNING id
+  )
+  SELECT
+    q.id,
+    l.id IS NOT NULL AND NOT l.completed,
+    CASE
+      WHEN l.id IS NULL THEN 'Reminder not found'
+      WHEN l.completed THEN 'Reminder already completed'
+      WHEN i.id IS NOT NULL THEN 'Completed. Next reminder created.'
+      ELSE 'Reminder completed'
+    END,
+    i.id
+  FROM requested q
+  LEFT JOIN locked l ON l.id = q.id
+  LEFT JOIN next_occurrence n ON n.source_id = q.id
+  LEFT JOIN inserted i ON i.id = n.next_id;
+$$ LANGUAGE sql;
+
+COMMENT ON FUNCTION complete_reminders IS 'Complete many reminders and handle recurrence in one statement';
@@ -0,0 +1,36 @@
+-- ARIA Reminder Change Notifications
+-- NOTIFY listeners (e.g. the reminder dispatcher) when reminders change
+-- Created: October 17, 2026
+
+-- Payload carries everything a dispatcher needs to maintain its timer
+-- queue, so listeners do not have to re-read the row on every change.
+CREATE OR REPLACE FUNCTION notify_aria_reminder_change()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_row aria_reminders%ROWTYPE;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    v_row := OLD;
+  ELSE
+    v_row := NEW;
+  END IF;
+
+  PERFORM pg_notify('aria_reminders', json_build_object(
+    'op', TG_OP,
+    'id', v_row.id,
+    'user_id', v_row.user_id,
+    'completed', v_row.completed,
+    'due_at', COALESCE(v_row.snoozed_until, v_row.remind_at)
+  )::TEXT);
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS aria_reminders_notify ON aria_reminders;
+CREATE TRIGGER aria_reminders_notify
+AFTER INSERT OR UPDATE OR DELETE ON aria_reminders
+FOR EACH ROW
+EXECUTE FUNCTION notify_aria_reminder_change();
+
+COMMENT ON FUNCTION notify_aria_reminder_change IS 'Publish reminder changes on the aria_reminders NOTIFY channel';
@@ -0,0 +1,113 @@
+-- ARIA Reminder Index Fix
+-- Replaces the NOW()-based partial indexes with time-independent ones
+-- Created: October 17, 2026
+
+-- idx_reminders_remind_at and idx_reminders_overdue used NOW() in their
+-- predicates. Index predicates must be IMMUTABLE, so these either failed to
+-- create or could never be matched by the planner.
+DROP INDEX IF EXISTS idx_reminders_remind_at;
+DROP INDEX IF EXISTS idx_reminders_overdue;
+
+-- Active reminders by user and effective due time (snooze wins over remind_at)
+CREATE INDEX IF NOT EXISTS idx_reminders_user_due
+  ON aria_reminders (user_id, (COALESCE(snoozed_until, remind_at)))
+  WHERE NOT completed;
+
+-- Get upcoming reminders, by effective due time.
+-- A snoozed reminder shows up when its snooze ends.
+CREATE OR REPLACE FUNCTION get_upcoming_reminders(
+  p_user_id TEXT DEFAULT 'damon',
+  p_hours INTEGER DEFAULT 24
+)
+RETURNS TABLE (
+  id UUID,
+  reminder_text TEXT,
+  remind_at TIMESTAMPTZ,
+  priority TEXT,
+  category TEXT,
+  time_until INTERVAL
+) AS $$
+BEGIN
+  RETURN QUERY
+  SELECT
+    r.id,
+    r.reminder_text,
+    r.remind_at,
+    r.priority,
+    r.category,
+    COALESCE(r.snoozed_until, r.remind_at) - NOW() as time_until
+  FROM aria_reminders r
+  WHERE r.user_id = p_user_id
+    AND NOT r.completed
+    AND COALESCE(r.snoozed_until, r.remind_at) >= NOW()
+    AND COALESCE(r.snoozed_until, r.remind_at) <= NOW() + make_interval(hours => p_hours)
+  ORDER BY COALESCE(r.snoozed_until, r.remind_at) ASC;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Get overdue reminders, by effective due time.
+-- A snoozed reminder is not overdue until its snooze ends.
+CREATE OR REPLACE FUNCTION get_overdue_reminders(
+  p_user_id TEXT DEFAULT 'damon'
+)
+RETURNS TABLE (
+  id UUID,
+  reminder_text TEXT,
+  remind_at TIMESTAMPTZ,
+  priority TEXT,
+  category TEXT,
+  overdue_by INTERVAL
+) AS $$
+BEGIN
+  RETURN QUERY
+  SELECT
+    r.id,
+    r.reminder_text,
+    r.remind_at,
+    r.priority,
+    r.category,
+    NOW() - COALESCE(r.snoozed_until, r.remind_at) as overdue_by
+  FROM aria_reminders r
+  WHERE r.user_id = p_user_id
+    AND NOT r.completed
+    AND COALESCE(r.snoozed_until, r.remind_at) < NOW()
+  ORDER BY COALESCE(r.snoozed_until, r.remind_at) ASC;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Snapshot rows now carry their interval as seconds, since time_until and
+-- overdue_by are no longer derivable from remind_at alone.
+CREATE OR REPLACE FUNCTION get_reminder_snapshot(
+  p_user_id TEXT DEFAULT 'damon',
+  p_upcoming_hours INTEGER DEFAULT 2
+)
+RETURNS TABLE (
+  as_of TIMESTAMPTZ,
+  overdue JSONB,
+  upcoming JSONB,
+  summary JSONB
+) AS $$
+  SELECT
+    NOW(),
+    COALESCE(
+      (SELECT jsonb_agg(
+         (to_jsonb(o) - 'overdue_by')
+           || jsonb_build_object('overdue_by_seconds', EXTRACT(EPOCH FROM o.overdue_by))
+         ORDER BY o.overdue_by DESC)
+       FROM get_overdue_reminders(p_user_id) o),
+      '[]'::JSONB
+    ),
+    COALESCE(
+      (SELECT jsonb_agg(
+         (to_jsonb(u) - 'time_until')
+           || jsonb_build_object('time_until_seconds', EXTRACT(EPOCH FROM u.time_until))
+         ORDER BY u.time_until)
+       FROM get_upcoming_reminders(p_user_id, p_upcoming_hours) u),
+      '[]'::JSONB
+    ),
+    (SELECT to_jsonb(s) - 'user_id'
+     FROM aria_reminder_summary s
+     WHERE s.user_id = p_user_id);
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON INDEX idx_reminders_user_due IS 'Active reminders by user and effective due time';
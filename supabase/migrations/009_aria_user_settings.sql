@@ -0,0 +1,16 @@
+-- ARIA User Settings
+-- Per-user preferences, starting with timezone
+-- Created: October 17, 2026
+
+CREATE TABLE IF NOT EXISTS aria_user_settings (
+  user_id TEXT PRIMARY KEY,
+  timezone TEXT NOT NULL DEFAULT 'America/Los_Angeles',
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+INSERT INTO aria_user_settings (user_id, timezone)
+VALUES ('damon', 'America/Los_Angeles')
+ON CONFLICT (user_id) DO NOTHING;
+
+COMMENT ON TABLE aria_user_settings IS 'Per-user settings such as timezone';
@@ -0,0 +1,85 @@
+-- ARIA Reminder SQL Functions
+-- Rewrites the reminder read functions as inlinable LANGUAGE sql STABLE
+-- Created: October 17, 2026
+
+-- A plpgsql set-returning function is a black box to the planner: it runs
+-- its own query and hands back a materialized result. A single-SELECT
+-- LANGUAGE sql STABLE function is inlined into the calling query instead, so
+-- the user_id / due-time conditions reach idx_reminders_user_due directly.
+-- Intervals are built with make_interval rather than by casting strings.
+-- Semantics are unchanged from 008_aria_reminder_indexes.sql.
+
+CREATE OR REPLACE FUNCTION get_upcoming_reminders(
+  p_user_id TEXT DEFAULT 'damon',
+  p_hours INTEGER DEFAULT 24
+)
+RETURNS TABLE (
+  id UUID,
+  reminder_text TEXT,
+  remind_at TIMESTAMPTZ,
+  priority TEXT,
+  category TEXT,
+  time_until INTERVAL
+) AS $$
+  SELECT
+    r.id,
+    r.reminder_text,
+    r.remind_at,
+    r.priority,
+    r.category,
+    COALESCE(r.snoozed_until, r.remind_at) - NOW() as time_until
+  FROM aria_reminders r
+  WHERE r.user_id = p_user_id
+    AND NOT r.completed
+    AND COALESCE(r.snoozed_until, r.remind_at) >= NOW()
+    AND COALESCE(r.snoozed_until, r.remind_at) <= NOW() + make_interval(hours => p_hours)
+  ORDER BY COALESCE(r.snoozed_until, r.remind_at) ASC;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_overdue_reminders(
+  p_user_id TEXT DEFAULT 'damon'
+)
+RETURNS TABLE (
+  id UUID,
+  reminder_text TEXT,
+  remind_at TIMESTAMPTZ,
+  priority TEXT,
+  category TEXT,
+  overdue_by INTERVAL
+) AS $$
+  SELECT
+    r.id,
+    r.reminder_text,
+    r.remind_at,
+    r.priority,
+    r.category,
+    NOW() - COALESCE(r.snoozed_until, r.remind_at) as overdue_by
+  FROM aria_reminders r
+  WHERE r.user_id = p_user_id
+    AND NOT r.completed
+    AND COALESCE(r.snoozed_until, r.remind_at) < NOW()
+  ORDER BY COALESCE(r.snoozed_until, r.remind_at) ASC;
+$$ LANGUAGE sql STABLE;
+
+-- snooze_reminder writes, so it stays VOLATILE, but no longer needs plpgsql
+-- or a string-built interval. complete_reminder keeps plpgsql for its
+-- branching (single-reminder path; complete_reminders is set-based).
+CREATE OR REPLACE FUNCTION snooze_reminder(
+  p_reminder_id UUID,
+  p_snooze_minutes INTEGER DEFAULT 30
+)
+RETURNS BOOLEAN AS $$
+  WITH snoozed AS (
+    UPDATE aria_reminders
+    SET
+      snoozed_until = NOW() + make_interval(mins => p_snooze_minutes),
+      snooze_count = snooze_count + 1
+    WHERE id = p_reminder_id AND NOT completed
+    RETURNING 1
+  )
+  SELECT EXISTS (SELECT 1 FROM snoozed);
+$$ LANGUAGE sql;
+
+COMMENT ON FUNCTION get_upcoming_reminders IS 'Get reminders due in the next N hours (inlinable)';
+COMMENT ON FUNCTION get_overdue_reminders IS 'Get reminders that are past due (inlinable)';
+COMMENT ON FUNCTION snooze_reminder IS 'Snooze a reminder for N minutes';
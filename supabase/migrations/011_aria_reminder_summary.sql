@@ -0,0 +1,187 @@
+-- ARIA Reminder Summary Counts
+-- Replaces the full-scan aria_reminder_summary view with trigger-maintained
+-- counts plus index range scans for the time-dependent columns
+-- Created: October 17, 2026
+
+-- The 004 view grouped the whole of aria_reminders (completed history
+-- included) on every call. Now:
+--   total_active         -> aria_reminder_counts, kept current by triggers
+--   overdue/upcoming_*   -> range counts on idx_reminders_user_due
+--   completed_this_week  -> range count on idx_reminders_user_completed
+-- Time windows use the effective due time (snooze wins), matching the
+-- 008 functions.
+
+CREATE TABLE IF NOT EXISTS aria_reminder_counts (
+  user_id TEXT PRIMARY KEY,
+  total_active BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_reminders_user_completed
+  ON aria_reminders (user_id, completed_at)
+  WHERE completed;
+
+-- Apply per-user deltas. Users are locked in user_id order so concurrent
+-- multi-user statements can't deadlock on the counts rows.
+CREATE OR REPLACE FUNCTION apply_reminder_count_deltas(p_deltas JSONB)
+RETURNS VOID AS $$
+  INSERT INTO aria_reminder_counts AS c (user_id, total_active, updated_at)
+  SELECT d.key, d.value::BIGINT, NOW()
+  FROM jsonb_each_text(p_deltas) d
+  ORDER BY d.key
+  ON CONFLICT (user_id) DO UPDATE
+  SET total_active = c.total_active + EXCLUDED.total_active,
+      updated_at = NOW();
+$$ LANGUAGE sql;
+
+-- Statement-level triggers with transition tables, so a bulk insert or a
+-- complete_reminders() call costs one counts update per user, not per row.
+-- Transition tables need one trigger per event. aria_reminders.user_id is
+-- nullable; rows without a user are not counted (a NULL key would make
+-- jsonb_object_agg fail the triggering statement).
+CREATE OR REPLACE FUNCTION aria_reminder_counts_insert()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_deltas JSONB;
+BEGIN
+  SELECT jsonb_object_agg(user_id, n) INTO v_deltas
+  FROM (SELECT user_id, COUNT(*) FILTER (WHERE NOT completed) AS n
+        FROM new_rows WHERE user_id IS NOT NULL GROUP BY user_id) d;
+
+  IF v_deltas IS NOT NULL THEN
+    PERFORM apply_reminder_count_deltas(v_deltas);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION aria_reminder_counts_delete()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_deltas JSONB;
+BEGIN
+  SELECT jsonb_object_agg(user_id, -n) INTO v_deltas
+  FROM (SELECT user_id, COUNT(*) AS n
+        FROM old_rows WHERE NOT completed AND user_id IS NOT NULL GROUP BY user_id) d;
+
+  IF v_deltas IS NOT NULL THEN
+    PERFORM apply_reminder_count_deltas(v_deltas);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION aria_reminder_counts_update()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_deltas JSONB;
+BEGIN
+  -- Covers completion, un-completion and user_id changes; snoozes and text
+  -- edits produce no delta and leave the counts table alone.
+  SELECT jsonb_object_agg(user_id, n) INTO v_deltas
+  FROM (
+    SELECT user_id, SUM(n) AS n
+    FROM (
+      SELECT user_id, 1 AS n FROM new_rows WHERE NOT completed
+      UNION ALL
+      SELECT user_id, -1 FROM old_rows WHERE NOT completed
+    ) changes
+    WHERE user_id IS NOT NULL
+    GROUP BY user_id
+    HAVING SUM(n) <> 0
+  ) d;
+
+  IF v_deltas IS NOT NULL THEN
+    PERFORM apply_reminder_count_deltas(v_deltas);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION aria_reminder_counts_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE aria_reminder_counts SET total_active = 0, updated_at = NOW();
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS aria_reminder_counts_insert ON aria_reminders;
+CREATE TRIGGER aria_reminder_counts_insert
+  AFTER INSERT ON aria_reminders
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION aria_reminder_counts_insert();
+
+DROP TRIGGER IF EXISTS aria_reminder_counts_update ON aria_reminders;
+CREATE TRIGGER aria_reminder_counts_update
+  AFTER UPDATE ON aria_reminders
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION aria_reminder_counts_update();
+
+DROP TRIGGER IF EXISTS aria_reminder_counts_delete ON aria_reminders;
+CREATE TRIGGER aria_reminder_counts_delete
+  AFTER DELETE ON aria_reminders
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION aria_reminder_counts_delete();
+
+DROP TRIGGER IF EXISTS aria_reminder_counts_truncate ON aria_reminders;
+CREATE TRIGGER aria_reminder_counts_truncate
+  AFTER TRUNCATE ON aria_reminders
+  FOR EACH STATEMENT EXECUTE FUNCTION aria_reminder_counts_truncate();
+
+-- Recompute counts from aria_reminders (backfill, or repair after triggers
+-- were disabled). With a user, only that user's active rows are read.
+CREATE OR REPLACE FUNCTION refresh_reminder_counts(
+  p_user_id TEXT DEFAULT NULL
+)
+RETURNS INTEGER AS $$
+DECLARE
+  v_users INTEGER;
+BEGIN
+  IF p_user_id IS NULL THEN
+    LOCK TABLE aria_reminder_counts IN EXCLUSIVE MODE;
+    DELETE FROM aria_reminder_counts;
+    INSERT INTO aria_reminder_counts (user_id, total_active)
+    SELECT user_id, COUNT(*) FILTER (WHERE NOT completed)
+    FROM aria_reminders
+    WHERE user_id IS NOT NULL
+    GROUP BY user_id;
+  ELSE
+    INSERT INTO aria_reminder_counts AS c (user_id, total_active)
+    SELECT p_user_id, COUNT(*)
+    FROM aria_reminders
+    WHERE user_id = p_user_id AND NOT completed
+    ON CONFLICT (user_id) DO UPDATE
+    SET total_active = EXCLUDED.total_active, updated_at = NOW();
+  END IF;
+
+  GET DIAGNOSTICS v_users = ROW_COUNT;
+  RETURN v_users;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT refresh_reminder_counts();
+
+-- Same columns as the 004 view, so get_reminder_summary and
+-- get_reminder_snapshot pick it up unchanged.
+CREATE OR REPLACE VIEW aria_reminder_summary AS
+SELECT
+  c.user_id,
+  (SELECT COUNT(*) FROM aria_reminders r
+   WHERE r.user_id = c.user_id AND NOT r.completed
+     AND COALESCE(r.snoozed_until, r.remind_at) < NOW()) as overdue_count,
+  (SELECT COUNT(*) FROM aria_reminders r
+   WHERE r.user_id = c.user_id AND NOT r.completed
+     AND COALESCE(r.snoozed_until, r.remind_at) BETWEEN NOW() AND NOW() + INTERVAL '2 hours') as upcoming_soon,
+  (SELECT COUNT(*) FROM aria_reminders r
+   WHERE r.user_id = c.user_id AND NOT r.completed
+     AND COALESCE(r.snoozed_until, r.remind_at) BETWEEN NOW() AND NOW() + INTERVAL '24 hours') as upcoming_today,
+  c.total_active,
+  (SELECT COUNT(*) FROM aria_reminders r
+   WHERE r.user_id = c.user_id AND r.completed
+     AND r.completed_at > NOW() - INTERVAL '7 days') as completed_this_week
+FROM aria_reminder_counts c;
+
+COMMENT ON TABLE aria_reminder_counts IS 'Per-user active reminder counts, maintained by triggers';
+COMMENT ON FUNCTION refresh_reminder_counts IS 'Recompute aria_reminder_counts from aria_reminders';
+COMMENT ON INDEX idx_reminders_user_completed IS 'Completed reminders by user and completion time';
@@ -0,0 +1,153 @@
+-- ARIA Reminder Archive
+-- Moves completed reminders out of the hot table into aria_reminders_archive
+-- Created: October 17, 2026
+
+-- aria_reminders holds active reminders plus the last few days of
+-- completions (get_reminder_summary's completed_this_week reads those).
+-- Anything completed earlier is moved to the archive by
+-- archive_completed_reminders(), run from pg_cron when available or from
+-- ReminderManager.archive_completed_reminders(). Everything that works on
+-- active reminders keeps reading aria_reminders only; history is opt-in
+-- through get_reminder_history().
+
+-- Same columns as aria_reminders, in the same order, plus archived_at.
+-- Columns added to aria_reminders later must be added here too, and to
+-- the ON CONFLICT update in archive_completed_reminders().
+CREATE TABLE IF NOT EXISTS aria_reminders_archive (
+  LIKE aria_reminders INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+  archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_reminders_archive_user_completed
+  ON aria_reminders_archive (user_id, completed_at DESC);
+
+-- Move one batch of old completions. Returns rows moved; call until it
+-- returns less than p_batch_size to drain. p_older_than below 7 days would
+-- undercount completed_this_week.
+CREATE OR REPLACE FUNCTION archive_completed_reminders(
+  p_older_than INTERVAL DEFAULT INTERVAL '7 days',
+  p_batch_size INTEGER DEFAULT 10000
+)
+RETURNS INTEGER AS $$
+  WITH batch AS (
+    SELECT id
+    FROM aria_reminders
+    WHERE completed AND completed_at < NOW() - p_older_than
+    LIMIT p_batch_size
+    FOR UPDATE SKIP LOCKED
+  ),
+  moved AS (
+    DELETE FROM aria_reminders r
+    USING batch
+    WHERE r.id = batch.id
+    RETURNING r.*
+  ),
+  -- An id can already be archived (e.g. a row restored into the hot table
+  -- and completed again). The row just deleted is the current one, so it
+  -- replaces the archived copy rather than being dropped.
+  archived AS (
+    INSERT INTO aria_reminders_archive
+    SELECT moved.*, NOW() FROM moved
+    ON CONFLICT (id) DO UPDATE
+    SET user_id = EXCLUDED.user_id,
+        reminder_text = EXCLUDED.reminder_text,
+        remind_at = EXCLUDED.remind_at,
+        created_at = EXCLUDED.created_at,
+        completed = EXCLUDED.completed,
+        completed_at = EXCLUDED.completed_at,
+        snoozed_until = EXCLUDED.snoozed_until,
+        snooze_count = EXCLUDED.snooze_count,
+        recurrence = EXCLUDED.recurrence,
+        recurrence_end_date = EXCLUDED.recurrence_end_date,
+        priority = EXCLUDED.priority,
+        category = EXCLUDED.category,
+        metadata = EXCLUDED.metadata,
+        source = EXCLUDED.source,
+        archived_at = EXCLUDED.archived_at
+    RETURNING 1
+  )
+  SELECT COUNT(*)::INTEGER FROM moved;
+$$ LANGUAGE sql;
+
+-- Completed and archived reminders for a user, newest completion first.
+-- Active reminders are left to get_upcoming/get_overdue_reminders.
+CREATE OR REPLACE FUNCTION get_reminder_history(
+  p_user_id TEXT DEFAULT 'damon',
+  p_since TIMESTAMPTZ DEFAULT NULL,
+  p_limit INTEGER DEFAULT 100
+)
+RETURNS TABLE (
+  id UUID,
+  reminder_text TEXT,
+  remind_at TIMESTAMPTZ,
+  completed_at TIMESTAMPTZ,
+  recurrence TEXT,
+  priority TEXT,
+  category TEXT,
+  archived BOOLEAN
+) AS $$
+  SELECT * FROM (
+    (SELECT r.id, r.reminder_text, r.remind_at, r.completed_at,
+            r.recurrence, r.priority, r.category, FALSE
+     FROM aria_reminders r
+     WHERE r.user_id = p_user_id AND r.completed
+       AND (p_since IS NULL OR r.completed_at >= p_since)
+     ORDER BY r.completed_at DESC
+     LIMIT p_limit)
+    UNION ALL
+    (SELECT a.id, a.reminder_text, a.remind_at, a.completed_at,
+            a.recurrence, a.priority, a.category, TRUE
+     FROM aria_reminders_archive a
+     WHERE a.user_id = p_user_id
+       AND (p_since IS NULL OR a.completed_at >= p_since)
+     ORDER BY a.completed_at DESC
+     LIMIT p_limit)
+  ) h
+  ORDER BY h.completed_at DESC
+  LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- Archiving deletes completed rows; listeners only care about active
+-- reminders, so don't publish one NOTIFY per archived row.
+CREATE OR REPLACE FUNCTION notify_aria_reminder_change()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_row aria_reminders%ROWTYPE;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    IF OLD.completed THEN
+      RETURN NULL;
+    END IF;
+    v_row := OLD;
+  ELSE
+    v_row := NEW;
+  END IF;
+
+  PERFORM pg_notify('aria_reminders', json_build_object(
+    'op', TG_OP,
+    'id', v_row.id,
+    'user_id', v_row.user_id,
+    'completed', v_row.completed,
+    'due_at', COALESCE(v_row.snoozed_until, v_row.remind_at)
+  )::TEXT);
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Nightly mover, if pg_cron is installed (it is on Supabase)
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+    PERFORM cron.schedule(
+      'aria-archive-reminders', '17 3 * * *',
+      $cron$SELECT archive_completed_reminders(INTERVAL '7 days', 100000)$cron$
+    );
+  END IF;
+END;
+$$;
+
+COMMENT ON TABLE aria_reminders_archive IS 'Completed reminders moved out of aria_reminders';
+COMMENT ON FUNCTION archive_completed_reminders IS 'Move one batch of old completed reminders to the archive';
+COMMENT ON FUNCTION get_reminder_history IS 'Completed and archived reminders, newest first';
@@ -0,0 +1,45 @@
+-- ARIA Dispatcher Heartbeat
+-- Lets health checks see whether reminder_dispatcher.py is alive and on time
+-- Created: October 17, 2026
+
+-- One row per dispatcher process, upserted every few seconds from its main
+-- loop. utils/health_check.py reads beat_at for liveness and last_lag /
+-- max_lag (seconds between due time and firing) for dispatch lag.
+CREATE TABLE IF NOT EXISTS aria_dispatcher_heartbeat (
+  dispatcher_id TEXT PRIMARY KEY,   -- hostname:pid
+  user_id TEXT,                     -- NULL = dispatches for all users
+  started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  beat_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  scheduled INTEGER NOT NULL DEFAULT 0,
+  fired BIGINT NOT NULL DEFAULT 0,
+  last_lag DOUBLE PRECISION NOT NULL DEFAULT 0,
+  max_lag DOUBLE PRECISION NOT NULL DEFAULT 0
+);
+
+-- Rows from stopped dispatchers stay until they are older than a day, so a
+-- crash remains visible to the health check in the meantime.
+CREATE OR REPLACE FUNCTION dispatcher_heartbeat(
+  p_dispatcher_id TEXT,
+  p_user_id TEXT,
+  p_scheduled INTEGER,
+  p_fired BIGINT,
+  p_last_lag DOUBLE PRECISION,
+  p_max_lag DOUBLE PRECISION
+)
+RETURNS VOID AS $$
+  DELETE FROM aria_dispatcher_heartbeat
+  WHERE beat_at < NOW() - INTERVAL '1 day';
+
+  INSERT INTO aria_dispatcher_heartbeat AS h
+    (dispatcher_id, user_id, scheduled, fired, last_lag, max_lag)
+  VALUES (p_dispatcher_id, p_user_id, p_scheduled, p_fired, p_last_lag, p_max_lag)
+  ON CONFLICT (dispatcher_id) DO UPDATE
+  SET beat_at = NOW(),
+      scheduled = EXCLUDED.scheduled,
+      fired = EXCLUDED.fired,
+      last_lag = EXCLUDED.last_lag,
+      max_lag = EXCLUDED.max_lag;
+$$ LANGUAGE sql;
+
+COMMENT ON TABLE aria_dispatcher_heartbeat IS 'Liveness and lag of running reminder dispatchers';
+COMMENT ON FUNCTION dispatcher_heartbeat IS 'Upsert a dispatcher heartbeat row';
@@ -0,0 +1,210 @@
+-- ARIA Vector Search Functions
+-- k-NN-first search over message and memory embeddings, with per-call
+-- index tuning and per-interface partial indexes
+-- Created: October 17, 2026
+
+-- The 003 search functions put "1 - (embedding <=> q) > threshold" in the
+-- WHERE clause and search_aria_messages adds "p_interface_source IS NULL OR
+-- interface_source = p_interface_source". Neither can be answered by an
+-- ivfflat/HNSW index, which only returns rows in distance order, so the
+-- planner falls back to scanning and sorting every embedding.
+--
+-- The match_* functions below ask the index for the k nearest rows first
+-- (ORDER BY distance LIMIT k) and apply the threshold to those k rows. The
+-- interface filter is inlined as a literal so the planner can pick the
+-- matching partial index; a generic plan with a parameter can't use one.
+-- The 003 functions keep their signatures for the existing workflows.
+-- The match_* functions change settings, so they are VOLATILE.
+-- HNSW indexes need pgvector 0.5.0 or later.
+
+-- One HNSW index per interface, so filtered searches still get k results
+-- from an index instead of post-filtering a global top-k, and one over
+-- active memories, which is all memory lookups ever want.
+--
+-- A plain CREATE INDEX blocks writes for the whole build, and CONCURRENTLY
+-- can't run inside a transaction, so (as in 015) the indexes are only
+-- built here on empty tables and on analyzed tables of at most 100,000
+-- rows.
+-- For larger tables the migration prints the CREATE INDEX CONCURRENTLY
+-- statement to run by hand.
+DO $$
+DECLARE
+  v_index RECORD;
+  v_ddl TEXT;
+BEGIN
+  FOR v_index IN
+    SELECT d.index_name, d.table_name, d.predicate, c.reltuples, c.relpages
+    FROM (VALUES
+      ('idx_aria_messages_embedding_web', 'aria_messages', $p$interface_source = 'web'$p$),
+      ('idx_aria_messages_embedding_telegram', 'aria_messages', $p$interface_source = 'telegram'$p$),
+      ('idx_aria_messages_embedding_cli', 'aria_messages', $p$interface_source = 'cli'$p$),
+      ('idx_aria_memory_embedding_active', 'aria_unified_memory', 'is_active = TRUE')
+    ) AS d (index_name, table_name, predicate)
+    JOIN pg_class c ON c.oid = d.table_name::regclass
+    WHERE to_regclass(d.index_name) IS NULL
+  LOOP
+    v_ddl := format('CREATE INDEX %%s %I ON %I USING hnsw (embedding vector_cosine_ops) WHERE %s',
+                    v_index.index_name, v_index.table_name, v_index.predicate);
+    -- reltuples is -1 until the first ANALYZE; relpages = 0 means empty
+    IF v_index.reltuples BETWEEN 0 AND 100000 OR v_index.relpages = 0 THEN
+      EXECUTE format(v_ddl, '');
+    ELSE
+      RAISE NOTICE 'Skipped % on %, build it outside a transaction: %;',
+        v_index.index_name, v_index.table_name, format(v_ddl, 'CONCURRENTLY');
+    END IF;
+  END LOOP;
+END;
+$$;
+
+-- Set ivfflat.probes / hnsw.ef_search for the rest of the transaction and
+-- return the previous values, so callers can put them back afterwards.
+-- NULL leaves a setting alone.
+CREATE OR REPLACE FUNCTION apply_vector_search_settings(
+  p_probes INTEGER,
+  p_ef_search INTEGER
+)
+RETURNS TEXT[] AS $$
+DECLARE
+  v_previous TEXT[] := ARRAY[
+    current_setting('ivfflat.probes', true),
+    current_setting('hnsw.ef_search', true)
+  ];
+BEGIN
+  IF p_probes IS NOT NULL THEN
+    PERFORM set_config('ivfflat.probes', p_probes::TEXT, true);
+  END IF;
+  IF p_ef_search IS NOT NULL THEN
+    PERFORM set_config('hnsw.ef_search', p_ef_search::TEXT, true);
+  END IF;
+  RETURN v_previous;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Messages nearest to query_embedding, most similar first.
+-- HNSW returns at most ef_search rows, so ef_search (p_ef_search, or the
+-- session setting) is always raised to at least match_count.
+CREATE OR REPLACE FUNCTION match_aria_messages(
+  query_embedding VECTOR(1536),
+  match_count INTEGER DEFAULT 10,
+  match_threshold FLOAT DEFAULT 0.0,
+  p_interface_source TEXT DEFAULT NULL,
+  p_probes INTEGER DEFAULT NULL,
+  p_ef_search INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+  id UUID,
+  conversation_id UUID,
+  role TEXT,
+  content TEXT,
+  interface_source TEXT,
+  created_at TIMESTAMPTZ,
+  similarity FLOAT
+) AS $$
+DECLARE
+  v_previous TEXT[];
+BEGIN
+  v_previous := apply_vector_search_settings(
+    p_probes,
+    GREATEST(COALESCE(p_ef_search, current_setting('hnsw.ef_search', true)::INTEGER, 40),
+             match_count)
+  );
+
+  RETURN QUERY EXECUTE format($q$
+    SELECT k.id, k.conversation_id, k.role, k.content, k.interface_source,
+           k.created_at, 1 - k.distance
+    FROM (
+      SELECT am.id, am.conversation_id, am.role, am.content, am.interface_source,
+             am.created_at, am.embedding <=> $1 AS distance
+      FROM aria_messages am
+      WHERE am.embedding IS NOT NULL %s
+      ORDER BY am.embedding <=> $1
+      LIMIT $2
+    ) k
+    WHERE 1 - k.distance > $3
+    ORDER BY k.distance
+  $q$,
+    CASE WHEN p_interface_source IS NOT NULL
+         THEN format('AND am.interface_source = %L', p_interface_source)
+         ELSE '' END
+  ) USING query_embedding, match_count, match_threshold;
+
+  PERFORM apply_vector_search_settings(v_previous[1]::INTEGER, v_previous[2]::INTEGER);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Same result columns as the 003 search_similar_conversations; the
+-- conversation join happens after the k-NN step
+CREATE OR REPLACE FUNCTION match_similar_conversations(
+  query_embedding VECTOR(1536),
+  match_count INTEGER DEFAULT 10,
+  match_threshold FLOAT DEFAULT 0.0,
+  p_probes INTEGER DEFAULT NULL,
+  p_ef_search INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+  id UUID,
+  session_id VARCHAR,
+  message JSONB,
+  role TEXT,
+  msg_timestamp TIMESTAMPTZ,
+  similarity FLOAT
+) AS $$
+  SELECT
+    m.id,
+    ac.session_id,
+    jsonb_build_object('content', m.content) AS message,
+    m.role,
+    m.created_at AS msg_timestamp,
+    m.similarity
+  FROM match_aria_messages(query_embedding, match_count, match_threshold,
+                           NULL, p_probes, p_ef_search) m
+  JOIN aria_conversations ac ON ac.id = m.conversation_id
+  ORDER BY m.similarity DESC;
+$$ LANGUAGE sql;
+
+-- Active memories nearest to query_embedding (idx_aria_memory_embedding_active)
+CREATE OR REPLACE FUNCTION match_aria_memory(
+  query_embedding VECTOR(1536),
+  match_count INTEGER DEFAULT 10,
+  match_threshold FLOAT DEFAULT 0.0,
+  p_probes INTEGER DEFAULT NULL,
+  p_ef_search INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+  id UUID,
+  memory_type TEXT,
+  content TEXT,
+  confidence FLOAT,
+  created_at TIMESTAMPTZ,
+  similarity FLOAT
+) AS $$
+DECLARE
+  v_previous TEXT[];
+BEGIN
+  v_previous := apply_vector_search_settings(
+    p_probes,
+    GREATEST(COALESCE(p_ef_search, current_setting('hnsw.ef_search', true)::INTEGER, 40),
+             match_count)
+  );
+
+  RETURN QUERY
+  SELECT k.id, k.memory_type, k.content, k.confidence, k.created_at, 1 - k.distance
+  FROM (
+    SELECT mem.id, mem.memory_type, mem.content, mem.confidence, mem.created_at,
+           mem.embedding <=> query_embedding AS distance
+    FROM aria_unified_memory mem
+    WHERE mem.is_active = TRUE AND mem.embedding IS NOT NULL
+    ORDER BY mem.embedding <=> query_embedding
+    LIMIT match_count
+  ) k
+  WHERE 1 - k.distance > match_threshold
+  ORDER BY k.distance;
+
+  PERFORM apply_vector_search_settings(v_previous[1]::INTEGER, v_previous[2]::INTEGER);
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION apply_vector_search_settings IS 'Set ivfflat.probes/hnsw.ef_search for the transaction, returning the old values';
+COMMENT ON FUNCTION match_aria_messages IS 'k-NN message search, threshold applied after the index scan';
+COMMENT ON FUNCTION match_similar_conversations IS 'k-NN version of search_similar_conversations';
+COMMENT ON FUNCTION match_aria_memory IS 'k-NN search over active memories';
@@ -0,0 +1,63 @@
+-- ARIA Vector Indexes
+-- Replaces the ivfflat indexes built on empty tables by 001 with HNSW
+-- Created: October 17, 2026
+
+-- ivfflat picks its list centroids from the rows present at CREATE INDEX
+-- time. 001 created all four embedding indexes on empty tables, so every
+-- row lands in lists trained on nothing and recall drops as the tables grow.
+-- HNSW needs no training step and keeps recall as rows are added.
+--
+-- Small tables are converted here. Rebuilding a large table's index inside a
+-- migration would block writes for the whole build, so tables above
+-- 100,000 rows, and non-empty tables never analyzed (size unknown), are
+-- left to:
+--     python utils/vector_index.py rebuild
+-- which builds CONCURRENTLY, picks HNSW or a sized ivfflat, and records
+-- recall@k before and after in aria_vector_index_reports.
+-- Needs pgvector 0.5.0 or later.
+
+CREATE TABLE IF NOT EXISTS aria_vector_index_reports (
+  id BIGSERIAL PRIMARY KEY,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  table_name TEXT NOT NULL,
+  index_name TEXT NOT NULL,
+  method TEXT NOT NULL,            -- 'hnsw' or 'ivfflat'
+  options JSONB NOT NULL,          -- {"m": 16, ...} or {"lists": 1000}
+  row_count BIGINT NOT NULL,
+  k INTEGER NOT NULL,
+  queries INTEGER NOT NULL,
+  recall_before FLOAT,             -- NULL when there was no index
+  recall_after FLOAT,
+  latency_before_ms FLOAT,         -- median
+  latency_after_ms FLOAT,
+  build_seconds FLOAT
+);
+
+CREATE INDEX IF NOT EXISTS idx_vector_index_reports_table
+  ON aria_vector_index_reports (table_name, created_at DESC);
+
+DO $$
+DECLARE
+  v_index RECORD;
+BEGIN
+  FOR v_index IN
+    SELECT i.relname AS index_name, t.relname AS table_name
+    FROM pg_index x
+    JOIN pg_class i ON i.oid = x.indexrelid
+    JOIN pg_class t ON t.oid = x.indrelid
+    JOIN pg_am am ON am.oid = i.relam
+    WHERE i.relname IN ('idx_aria_conversations_embedding', 'idx_aria_messages_embedding',
+                        'idx_aria_attachments_embedding', 'idx_aria_memory_embedding')
+      AND am.amname = 'ivfflat'
+      -- reltuples is -1 until the first ANALYZE; relpages = 0 means empty
+      AND (t.reltuples BETWEEN 0 AND 100000 OR t.relpages = 0)
+  LOOP
+    EXECUTE format('DROP INDEX %I', v_index.index_name);
+    EXECUTE format('CREATE INDEX %I ON %I USING hnsw (embedding vector_cosine_ops)',
+                   v_index.index_name, v_index.table_name);
+    RAISE NOTICE 'Rebuilt % as HNSW', v_index.index_name;
+  END LOOP;
+END;
+$$;
+
+COMMENT ON TABLE aria_vector_index_reports IS 'Recall@k and latency before/after each vector index rebuild';
@@ -0,0 +1,20 @@
+-- ARIA Embedding Backfill Indexes
+-- Lets utils/embedding_backfill.py find rows without an embedding cheaply
+-- Created: October 17, 2026
+
+-- The backfill walks "WHERE embedding IS NULL AND id > $last ORDER BY id".
+-- These partial indexes hold only the rows still waiting for an embedding,
+-- so they shrink to nothing as the backfill catches up and each page is an
+-- index range scan instead of a table scan.
+CREATE INDEX IF NOT EXISTS idx_aria_messages_embedding_missing
+  ON aria_messages (id) WHERE embedding IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_aria_attachments_embedding_missing
+  ON aria_attachments (id) WHERE embedding IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_aria_memory_embedding_missing
+  ON aria_unified_memory (id) WHERE embedding IS NULL;
+
+COMMENT ON INDEX idx_aria_messages_embedding_missing IS 'Messages awaiting an embedding (backfill)';
+COMMENT ON INDEX idx_aria_attachments_embedding_missing IS 'Attachments awaiting an embedding (backfill)';
+COMMENT ON INDEX idx_aria_memory_embedding_missing IS 'Memories awaiting an embedding (backfill)';
@@ -0,0 +1,49 @@
+-- ARIA Memory Change Notifications
+-- NOTIFY in-process memory indexes (utils/memory_index.py) when memories change
+-- Created: October 17, 2026
+
+-- The payload carries only the id and whether the row belongs in the index.
+-- A 1536-float embedding doesn't fit in a NOTIFY payload (8000 bytes), so
+-- listeners fetch changed rows themselves, batching ids that arrive
+-- together. Updates that don't touch an indexed column (e.g. a backfill
+-- writing the same embedding twice) are not published.
+CREATE OR REPLACE FUNCTION notify_aria_memory_change()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'UPDATE'
+     AND NEW.embedding IS NOT DISTINCT FROM OLD.embedding
+     AND NEW.is_active IS NOT DISTINCT FROM OLD.is_active
+     AND NEW.content IS NOT DISTINCT FROM OLD.content
+     AND NEW.memory_type IS NOT DISTINCT FROM OLD.memory_type
+     AND NEW.confidence IS NOT DISTINCT FROM OLD.confidence THEN
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP = 'DELETE' THEN
+    PERFORM pg_notify('aria_memory', json_build_object(
+      'op', TG_OP, 'id', OLD.id, 'indexed', FALSE
+    )::TEXT);
+  ELSE
+    PERFORM pg_notify('aria_memory', json_build_object(
+      'op', TG_OP, 'id', NEW.id,
+      'indexed', NEW.is_active IS TRUE AND NEW.embedding IS NOT NULL
+    )::TEXT);
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS aria_memory_notify ON aria_unified_memory;
+CREATE TRIGGER aria_memory_notify
+AFTER INSERT OR UPDATE OR DELETE ON aria_unified_memory
+FOR EACH ROW
+EXECUTE FUNCTION notify_aria_memory_change();
+
+-- Incremental refresh without a listener reads rows created after the
+-- index's watermark
+CREATE INDEX IF NOT EXISTS idx_aria_memory_active_created
+  ON aria_unified_memory (created_at)
+  WHERE is_active = TRUE AND embedding IS NOT NULL;
+
+COMMENT ON FUNCTION notify_aria_memory_change IS 'Publish memory changes on the aria_memory NOTIFY channel';
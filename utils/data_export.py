@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Data Export Module for ARIA
+Streaming, resumable NDJSON export and import of ARIA tables
+
+Each table is walked in primary-key order one chunk at a time, and each
+chunk is streamed with COPY (SELECT row_to_json(...)) TO STDOUT straight
+into a part file. Memory stays bounded by the copy buffer, whatever the
+table size. Progress is
+checkpointed after every part, so an interrupted export resumes where it
+stopped. An incremental export only takes rows whose created_at/updated_at
+is past a previous export's watermark.
+
+Layout of an export directory:
+
+    <dir>/checkpoint.json                   watermarks, part and row counts
+    <dir>/<table>/part-00000.ndjson[.gz]    one JSON object per row
+
+    python data_export.py export /backups/aria-20261017 --user damon
+    python data_export.py export /backups/aria-20261018 --incremental-from /backups/aria-20261017
+    python data_export.py import /backups/aria-20261017 --tables aria_reminders
+"""
+
+import gzip
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2 import sql
+
+from reminders import ReminderManager
+
+CHECKPOINT = "checkpoint.json"
+IMPORT_CHECKPOINT = "import_checkpoint.json"
+
+# COPY in CSV mode with quote and delimiter bytes that never occur in JSON,
+# so row_to_json output passes through unescaped (text mode would double
+# every backslash)
+COPY_OPTIONS = "FORMAT csv, QUOTE e'\\x01', DELIMITER e'\\x02'"
+
+INCREMENTAL_OVERLAP = "INTERVAL '5 minutes'"
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """How a table is chunked and filtered to one user"""
+    name: str
+    watermark: str          # created_at/updated_at column for incremental mode
+    user_filter: str        # SQL predicate on alias t, with one %s for the user id
+
+
+# Import order respects foreign keys (messages and memory reference conversations)
+TABLES = [
+    TableSpec("aria_reminders", "created_at", "t.user_id = %s"),
+    TableSpec("aria_conversations", "updated_at", "t.user_id::text = %s"),
+    TableSpec("aria_messages", "created_at",
+              "t.conversation_id IN (SELECT id FROM aria_conversations WHERE user_id::text = %s)"),
+    TableSpec("aria_unified_memory", "created_at",
+              "t.source_conversation_id IN (SELECT id FROM aria_conversations WHERE user_id::text = %s)"),
+]
+TABLES_BY_NAME = {spec.name: spec for spec in TABLES}
+
+
+def connect(dsn: Optional[str] = None):
+    """Connect with a DSN, or the same environment settings as ReminderManager"""
+    dsn = dsn or os.environ.get("SUPABASE_DB_URL")
+    if dsn:
+        return psycopg2.connect(dsn)
+    cfg = ReminderManager._get_db_config()
+    return psycopg2.connect(
+        host=cfg["host"], port=cfg["port"], user=cfg["user"],
+        password=cfg["password"], database=cfg["database"]
+    )
+
+
+def _read_json(path: str, default: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def _write_json(path: str, data: Dict[str, Any]):
+    """Write atomically so a crash never leaves a torn checkpoint"""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class _TailWriter:
+    """File wrapper that counts lines and remembers the last one"""
+
+    def __init__(self, f):
+        self.f = f
+        self.lines = 0
+        self.last = b""                 # last complete line
+        self.partial: List[bytes] = []  # chunks after the last newline
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.f.write(data)
+        newlines = data.count(b"\n")
+        self.lines += newlines
+        if not newlines:
+            self.partial.append(data)
+            return len(data)
+
+        # Only the bytes around the last newline are kept, so a chunk costs
+        # O(len(chunk)) however long the export or its rows are
+        head, _, rest = data.rpartition(b"\n")
+        head = head.rstrip(b"\n")
+        if b"\n" in head:
+            line = head.rpartition(b"\n")[2]
+        else:
+            line = b"".join(self.partial) + head
+        if line:
+            self.last = line
+        self.partial = [rest] if rest else []
+        return len(data)
+
+    def last_line(self) -> Optional[bytes]:
+        if self.partial:
+            return b"".join(self.partial)
+        return self.last or None
+
+
+class Exporter:
+    """Streams ARIA tables to NDJSON part files"""
+
+    def __init__(
+        self,
+        conn,
+        out_dir: str,
+        user_id: Optional[str] = None,
+        chunk_rows: int = 50000,
+        compress: bool = False,
+        incremental_from: Optional[str] = None
+    ):
+        """
+        Initialize exporter.
+
+        Args:
+            conn: psycopg2 connection (used read-only)
+            out_dir: Export directory; an existing checkpoint there is resumed
+            user_id: Only export this user's rows
+            chunk_rows: Rows per part file
+            compress: gzip part files
+            incremental_from: Previous export directory; only rows past its
+                              watermarks are exported
+        """
+        self.conn = conn
+        self.out_dir = out_dir
+        self.user_id = user_id
+        self.chunk_rows = chunk_rows
+        self.compress = compress
+
+        os.makedirs(out_dir, exist_ok=True)
+        self.checkpoint_path = os.path.join(out_dir, CHECKPOINT)
+        self.checkpoint = _read_json(self.checkpoint_path, {
+            "user_id": user_id,
+            "incremental_from": incremental_from,
+            "started_at": time.time(),
+            "tables": {}
+        })
+        if self.checkpoint["user_id"] != user_id:
+            raise ValueError(
+                f"{out_dir} holds an export for user {self.checkpoint['user_id']!r}, not {user_id!r}"
+            )
+
+        self.previous: Dict[str, Any] = {}
+        incremental_from = self.checkpoint["incremental_from"]
+        if incremental_from:
+            self.previous = _read_json(os.path.join(incremental_from, CHECKPOINT), {"tables": {}})["tables"]
+
+    def _filters(self, spec: TableSpec, state: Dict[str, Any]) -> tuple:
+        """WHERE clause and params for the user filter and incremental lower bound"""
+        conditions: List[str] = []
+        params: List[Any] = []
+        if self.user_id is not None:
+            conditions.append(spec.user_filter)
+            params.append(self.user_id)
+        if state.get("since") is not None:
+            # Overlap absorbs rows whose timestamp predates the previous
+            # snapshot but which committed after it; the importer upserts
+            conditions.append(f"t.{spec.watermark} > %s::timestamptz - {INCREMENTAL_OVERLAP}")
+            params.append(state["since"])
+        return conditions, params
+
+    def _start_table(self, spec: TableSpec) -> Dict[str, Any]:
+        """Record the since/watermark bounds for a table's first run"""
+        state = {
+            "since": self.previous.get(spec.name, {}).get("watermark"),
+            "watermark": None, "last_id": None, "parts": 0, "rows": 0, "done": False
+        }
+        conditions, params = self._filters(spec, state)
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        with self.conn.cursor() as cur:
+            cur.execute(f"SELECT max(t.{spec.watermark}) FROM {spec.name} t {where}", params)
+            watermark = cur.fetchone()[0]
+        # Nothing new: keep the previous watermark for the next increment
+        state["watermark"] = watermark.isoformat() if watermark else state["since"]
+        return state
+
+    def _chunk_query(self, spec: TableSpec, state: Dict[str, Any]) -> str:
+        """COPY of the next chunk, walking the primary key"""
+        conditions, params = self._filters(spec, state)
+        if state["last_id"] is not None:
+            conditions.append("t.id > %s::uuid")
+            params.append(state["last_id"])
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+
+        with self.conn.cursor() as cur:
+            select = cur.mogrify(
+                f"SELECT row_to_json(t) FROM {spec.name} t {where} ORDER BY t.id LIMIT %s",
+                params + [self.chunk_rows]
+            ).decode("utf-8")
+        return f"COPY ({select}) TO STDOUT WITH ({COPY_OPTIONS})"
+
+    def _part_path(self, table: str, part: int) -> str:
+        suffix = ".ndjson.gz" if self.compress else ".ndjson"
+        return os.path.join(self.out_dir, table, f"part-{part:05d}{suffix}")
+
+    def export_table(self, spec: TableSpec) -> int:
+        """Export one table from its checkpoint; returns rows written this run"""
+        state = self.checkpoint["tables"].get(spec.name)
+        if state is None:
+            state = self.checkpoint["tables"][spec.name] = self._start_table(spec)
+            _write_json(self.checkpoint_path, self.checkpoint)
+        if state["done"]:
+            return 0
+
+        os.makedirs(os.path.join(self.out_dir, spec.name), exist_ok=True)
+        written = 0
+        while True:
+            path = self._part_path(spec.name, state["parts"])
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as raw:
+                f = gzip.GzipFile(fileobj=raw, mode="wb") if self.compress else raw
+                tail = _TailWriter(f)
+                with self.conn.cursor() as cur:
+                    cur.copy_expert(self._chunk_query(spec, state), tail)
+                if self.compress:
+                    f.close()
+                raw.flush()
+                os.fsync(raw.fileno())
+
+            if tail.lines == 0:
+                os.remove(tmp)
+                state["done"] = True
+                _write_json(self.checkpoint_path, self.checkpoint)
+                return written
+
+            os.replace(tmp, path)
+            state["last_id"] = json.loads(tail.last_line())["id"]
+            state["parts"] += 1
+            state["rows"] += tail.lines
+            written += tail.lines
+            _write_json(self.checkpoint_path, self.checkpoint)
+
+            if tail.lines < self.chunk_rows:
+                state["done"] = True
+                _write_json(self.checkpoint_path, self.checkpoint)
+                return written
+
+    def run(self, tables: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Export tables in one repeatable-read snapshot.
+
+        Returns:
+            The checkpoint (per-table watermarks, parts and row counts)
+        """
+        self.conn.set_session(
+            isolation_level=psycopg2.extensions.ISOLATION_LEVEL_REPEATABLE_READ, readonly=True
+        )
+        try:
+            for spec in TABLES:
+                if tables and spec.name not in tables:
+                    continue
+                start = time.monotonic()
+                rows = self.export_table(spec)
+                elapsed = time.monotonic() - start
+                print(f"{spec.name}: {rows} rows in {elapsed:.1f}s "
+                      f"({rows / elapsed if elapsed else 0:.0f} rows/s)", file=sys.stderr)
+        finally:
+            self.conn.rollback()
+
+        self.checkpoint["finished_at"] = time.time()
+        _write_json(self.checkpoint_path, self.checkpoint)
+        return self.checkpoint
+
+
+class Importer:
+    """Loads NDJSON part files back into ARIA tables (upsert by id)"""
+
+    def __init__(self, conn, in_dir: str):
+        self.conn = conn
+        self.in_dir = in_dir
+        self.checkpoint_path = os.path.join(in_dir, IMPORT_CHECKPOINT)
+        self.checkpoint = _read_json(self.checkpoint_path, {"imported": []})
+
+    def _columns(self, table: str) -> List[str]:
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT attname FROM pg_attribute
+                WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+                ORDER BY attnum
+            """, (table,))
+            return [r[0] for r in cur.fetchall()]
+
+    def import_part(self, table: str, path: str, columns: List[str]) -> int:
+        """Load one part file in its own transaction; returns rows upserted"""
+        opener = gzip.open if path.endswith(".gz") else open
+        cols = sql.SQL(", ").join(sql.Identifier(c) for c in columns)
+        updates = sql.SQL(", ").join(
+            sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c)) for c in columns if c != "id"
+        )
+
+        with self.conn.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE IF NOT EXISTS aria_import_rows (doc JSONB) ON COMMIT DELETE ROWS")
+            with opener(path, "rb") as f:
+                cur.copy_expert(f"COPY aria_import_rows (doc) FROM STDIN WITH ({COPY_OPTIONS})", f)
+            cur.execute(sql.SQL("""
+                INSERT INTO {table} ({cols})
+                SELECT {cols} FROM (
+                    SELECT (jsonb_populate_record(NULL::{table}, doc)).* FROM aria_import_rows
+                ) r
+                ON CONFLICT (id) DO UPDATE SET {updates}
+            """).format(table=sql.Identifier(table), cols=cols, updates=updates))
+            rows = cur.rowcount
+        self.conn.commit()
+        return rows
+
+    def run(self, tables: Optional[List[str]] = None) -> Dict[str, int]:
+        """Import every part not yet imported; returns rows per table"""
+        done = set(self.checkpoint["imported"])
+        totals: Dict[str, int] = {}
+        for spec in TABLES:
+            if tables and spec.name not in tables:
+                continue
+            table_dir = os.path.join(self.in_dir, spec.name)
+            if not os.path.isdir(table_dir):
+                continue
+            columns = self._columns(spec.name)
+            totals[spec.name] = 0
+            for name in sorted(os.listdir(table_dir)):
+                key = f"{spec.name}/{name}"
+                if not name.startswith("part-") or name.endswith(".tmp") or key in done:
+                    continue
+                totals[spec.name] += self.import_part(spec.name, os.path.join(table_dir, name), columns)
+                self.checkpoint["imported"].append(key)
+                _write_json(self.checkpoint_path, self.checkpoint)
+            print(f"{spec.name}: {totals[spec.name]} rows", file=sys.stderr)
+        return totals
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ARIA streaming export/import")
+    parser.add_argument("--dsn", help="Postgres DSN (default: $SUPABASE_DB_URL or POSTGRES_* env)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="Export tables to NDJSON part files")
+    export.add_argument("dir")
+    export.add_argument("--tables", help="Comma-separated subset of " + ",".join(TABLES_BY_NAME))
+    export.add_argument("--user", help="Only export this user's data")
+    export.add_argument("--chunk-rows", type=int, default=50000)
+    export.add_argument("--gzip", action="store_true", help="Compress part files")
+    export.add_argument("--incremental-from", help="Previous export directory")
+
+    load = sub.add_parser("import", help="Upsert an export directory into the database")
+    load.add_argument("dir")
+    load.add_argument("--tables", help="Comma-separated subset of " + ",".join(TABLES_BY_NAME))
+
+    args = parser.parse_args()
+    selected = args.tables.split(",") if args.tables else None
+    unknown = set(selected or []) - set(TABLES_BY_NAME)
+    if unknown:
+        parser.error(f"Unknown tables: {', '.join(sorted(unknown))}")
+
+    conn = connect(args.dsn)
+    try:
+        if args.command == "export":
+            Exporter(conn, args.dir, user_id=args.user, chunk_rows=args.chunk_rows,
+                     compress=args.gzip, incremental_from=args.incremental_from).run(selected)
+        else:
+            Importer(conn, args.dir).run(selected)
+    finally:
+        conn.close()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Database Pool Module for ARIA
+Thread-safe, bounded psycopg2 connection pool with health checks and metrics
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional, Dict, Any
+
+import psycopg2
+import psycopg2.extensions
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the timeout"""
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that carries pool bookkeeping"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        # Names of server-side prepared statements on this session (db_statements.py)
+        self.prepared = set()
+
+
+class ConnectionPool:
+    """
+    Bounded pool of psycopg2 connections.
+
+    Connections are created lazily up to max_size. Idle connections are
+    reused LIFO so the warmest ones stay in use; a connection that has been
+    idle longer than health_check_interval is pinged before being handed out
+    and replaced if the ping fails.
+    """
+
+    def __init__(
+        self,
+        db_config: Dict[str, str],
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 10.0,
+        health_check_interval: float = 30.0,
+        max_lifetime: float = 3600.0
+    ):
+        """
+        Initialize connection pool.
+
+        Args:
+            db_config: Database configuration dict with host, port, user, password, database
+            min_size: Connections opened eagerly on first use
+            max_size: Hard upper bound on open connections
+            timeout: Seconds to wait for a free connection before PoolTimeout
+            health_check_interval: Idle seconds after which a connection is pinged
+            max_lifetime: Seconds after which a connection is recycled
+        """
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size, max_size >= 1")
+
+        self.db_config = db_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.max_lifetime = max_lifetime
+
+        self._idle = deque()
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+        self._warmed = False
+
+        # Metrics
+        self._acquired = 0
+        self._hits = 0
+        self._misses = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._health_check_failures = 0
+        self._discarded = 0
+
+    def _connect(self) -> PooledConnection:
+        """Open a new physical connection"""
+        return psycopg2.connect(
+            host=self.db_config["host"],
+            port=self.db_config["port"],
+            user=self.db_config["user"],
+            password=self.db_config["password"],
+            database=self.db_config["database"],
+            connection_factory=PooledConnection
+        )
+
+    def _is_healthy(self, conn: PooledConnection) -> bool:
+        """Check that an idle connection is still usable"""
+        if conn.closed:
+            return False
+        now = time.monotonic()
+        if now - conn.created_at > self.max_lifetime:
+            return False
+        if now - conn.last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            self._health_check_failures += 1
+            return False
+
+    def _discard(self, conn: PooledConnection):
+        """Close a connection that is no longer wanted"""
+        self._discarded += 1
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def _warm(self):
+        """Open min_size connections (called once, outside the lock)"""
+        with self._cond:
+            if self._warmed:
+                return
+            self._warmed = True
+        opened = []
+        for _ in range(self.min_size):
+            try:
+                opened.append(self._connect())
+            except psycopg2.Error:
+                break
+        with self._cond:
+            self._idle.extend(opened)
+            self._cond.notify_all()
+
+    def getconn(self, timeout: Optional[float] = None) -> PooledConnection:
+        """
+        Take a connection from the pool.
+
+        Args:
+            timeout: Override the pool's wait timeout
+
+        Returns:
+            An open connection; must be returned with putconn()
+        """
+        if not self._warmed and self.min_size:
+            self._warm()
+
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = None
+
+        with self._cond:
+            if self._closed:
+                raise PoolTimeout("Connection pool is closed")
+
+            while not self._idle and self._in_use >= self.max_size:
+                if waited is None:
+                    waited = time.monotonic()
+                    self._waits += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"No connection available within {timeout:.1f}s "
+                        f"(max_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+
+            conn = self._idle.pop() if self._idle else None
+            self._in_use += 1
+
+        if waited is not None:
+            elapsed = time.monotonic() - waited
+            with self._cond:
+                self._wait_time_total += elapsed
+                self._wait_time_max = max(self._wait_time_max, elapsed)
+
+        if conn is not None:
+            # Health check runs outside the lock so a slow ping doesn't stall others
+            if self._is_healthy(conn):
+                with self._cond:
+                    self._acquired += 1
+                    self._hits += 1
+                conn.last_used = time.monotonic()
+                return conn
+            self._discard(conn)
+            conn = None
+
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._acquired += 1
+            self._misses += 1
+        return conn
+
+    def putconn(self, conn: PooledConnection, discard: bool = False):
+        """
+        Return a connection to the pool.
+
+        Args:
+            conn: Connection obtained from getconn()
+            discard: Close the connection instead of reusing it
+        """
+        if not discard and not conn.closed:
+            try:
+                # Never hand out a connection with an open transaction
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        if discard or conn.closed:
+            self._discard(conn)
+            conn = None
+        else:
+            conn.last_used = time.monotonic()
+
+        with self._cond:
+            self._in_use -= 1
+            if conn is not None:
+                if self._closed:
+                    self._discard(conn)
+                else:
+                    self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """
+        Borrow a connection for the duration of a with-block.
+
+        Commits on success, rolls back on error. Connections that fail with
+        an OperationalError/InterfaceError are discarded rather than reused.
+        """
+        conn = self.getconn(timeout)
+        discard = False
+        try:
+            yield conn
+            conn.commit()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
+        except Exception:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                discard = True
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    def close(self):
+        """Close all idle connections and refuse new checkouts"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get pool metrics.
+
+        Returns:
+            Dict with sizes, hit rate and wait time statistics
+        """
+        with self._cond:
+            acquired = self._acquired
+            return {
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "acquired": acquired,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / acquired if acquired else 0.0,
+                "waits": self._waits,
+                "wait_time_total": self._wait_time_total,
+                "wait_time_avg": self._wait_time_total / self._waits if self._waits else 0.0,
+                "wait_time_max": self._wait_time_max,
+                "timeouts": self._timeouts,
+                "health_check_failures": self._health_check_failures,
+                "discarded": self._discarded
+            }
+
+
+_pools: Dict[tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+# Pools inherited across fork() belong to the parent. Closing them in the
+# child would terminate the parent's sessions, so keep them referenced
+# (never garbage collected) and start over with empty pools.
+_inherited_pools = []
+
+
+def _abandon_pools_after_fork():
+    global _pools_lock
+    _inherited_pools.extend(_pools.values())
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_abandon_pools_after_fork)
+
+
+def get_pool(db_config: Dict[str, str], **kwargs) -> ConnectionPool:
+    """
+    Get the process-wide pool for a database configuration.
+
+    Args:
+        db_config: Database configuration dict with host, port, user, password, database
+        **kwargs: ConnectionPool options, used only when the pool is first created
+
+    Returns:
+        Shared ConnectionPool for this configuration
+    """
+    key = tuple(sorted((k, str(v)) for k, v in db_config.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = ConnectionPool(db_config, **kwargs)
+            _pools[key] = pool
+        return pool
+
+
+def close_all_pools():
+    """Close every shared pool (e.g. at shutdown)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Prepared Statements Module for ARIA
+Server-side prepared statements, prepared once per pooled connection
+
+psycopg2 sends every query as text, so Postgres parses and plans it again
+on each call. A Statement is PREPAREd the first time it runs on a given
+connection and EXECUTEd from then on; the set of names already prepared
+lives on the PooledConnection (see db_pool.py).
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Sequence, Tuple
+
+import psycopg2
+import psycopg2.errors
+
+_PLACEHOLDER = re.compile(r"\$\d+")
+
+
+@dataclass(frozen=True)
+class Statement:
+    """A named SQL statement with $n placeholders"""
+    name: str
+    sql: str
+    arg_types: Tuple[str, ...] = ()
+    text_sql: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Same statement with psycopg2 placeholders, for unprepared execution.
+        # Placeholders must appear once each, in order ($1, $2, ...).
+        object.__setattr__(self, "text_sql", _PLACEHOLDER.sub("%s", self.sql))
+
+    def _prepare(self, cur):
+        types = f" ({', '.join(self.arg_types)})" if self.arg_types else ""
+        cur.execute(f"PREPARE {self.name}{types} AS {self.sql}")
+        cur.connection.prepared.add(self.name)
+
+    def execute(self, cur, params: Sequence = ()):
+        """
+        Run the statement on cur, preparing it on this connection if needed.
+
+        Connections without prepared-statement tracking (not from a
+        ConnectionPool) run the plain SQL instead.
+        """
+        conn = cur.connection
+        prepared = getattr(conn, "prepared", None)
+        if prepared is None:
+            cur.execute(self.text_sql, params)
+            return
+
+        if self.name not in prepared:
+            self._prepare(cur)
+
+        placeholders = ", ".join(["%s"] * len(params))
+        execute_sql = f"EXECUTE {self.name} ({placeholders})" if params else f"EXECUTE {self.name}"
+        try:
+            cur.execute(execute_sql, params)
+        except psycopg2.errors.InvalidSqlStatementName:
+            # Prepared statements were dropped behind our back (DISCARD ALL,
+            # a pooler reset). Only safe as the first statement of a transaction,
+            # which is how ReminderManager uses statements.
+            conn.rollback()
+            prepared.clear()
+            self._prepare(cur)
+            cur.execute(execute_sql, params)
+        except psycopg2.errors.FeatureNotSupported:
+            # "cached plan must not change result type": a table, view or
+            # function behind the statement changed shape since it was
+            # prepared. Same first-statement caveat as above.
+            conn.rollback()
+            cur.execute(f"DEALLOCATE {self.name}")
+            prepared.discard(self.name)
+            self._prepare(cur)
+            cur.execute(execute_sql, params)
+
+    def execute_unprepared(self, cur, params: Sequence = ()):
+        """Run the statement as plain SQL text (for comparison benchmarks)"""
+        cur.execute(self.text_sql, params)
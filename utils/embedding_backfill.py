@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Embedding Backfill Module for ARIA
+Resumable worker that embeds messages, attachments and memories whose
+embedding is still NULL
+
+Each table is walked in id order with keyset pagination over the
+"embedding IS NULL" partial indexes (016_aria_embedding_backfill.sql). Each
+page is embedded in one batch through EmbeddingService (deduplicated and
+cached, embeddings.py) and written back with one bulk UPDATE. Requests and
+input size are rate limited. The last id done per table is checkpointed
+after every page, so a stopped or crashed run resumes where it left off.
+Ids are random UUIDs, so rows inserted during a pass can land behind it;
+a run that finds a table's pass complete starts a new one, which only
+reads rows that are still NULL. Rows with no text are skipped, as are
+rows whose text the backend rejects (recorded in the checkpoint).
+
+    python embedding_backfill.py --backend hashing --batch-size 500
+    python embedding_backfill.py --tables aria_messages --rpm 300 --tpm 500000
+"""
+
+import json
+import logging
+import os
+import signal
+import threading
+import time
+import urllib.error
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any
+
+from embeddings import EmbeddingService
+
+logger = logging.getLogger("aria.embedding_backfill")
+
+DEFAULT_CHECKPOINT = os.environ.get(
+    "ARIA_BACKFILL_CHECKPOINT", os.path.expanduser("~/.aria/embedding_backfill.json")
+)
+
+
+@dataclass(frozen=True)
+class BackfillSource:
+    """Where a table's embedding text comes from"""
+    table: str
+    text: str               # SQL expression over alias t
+
+
+SOURCES = [
+    BackfillSource("aria_unified_memory", "t.content"),
+    BackfillSource("aria_messages", "t.content"),
+    BackfillSource("aria_attachments", "t.extracted_text"),
+]
+SOURCES_BY_TABLE = {source.table: source for source in SOURCES}
+
+# Backend responses that reject the input itself; retrying can't help, but
+# other texts in the same page may still be fine
+REJECTED_STATUS = (400, 413, 422)
+
+
+def _rejected(error: Exception) -> bool:
+    return isinstance(error, urllib.error.HTTPError) and error.code in REJECTED_STATUS
+
+
+def _read_json(path: str, default: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def _write_json(path: str, data: Dict[str, Any]):
+    """Write atomically so a crash never leaves a torn checkpoint"""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class RateLimiter:
+    """Token bucket: per_minute units per minute, with bursts up to one minute's worth"""
+
+    def __init__(self, per_minute: Optional[float]):
+        self.rate = per_minute / 60.0 if per_minute else None
+        self.capacity = per_minute or 0.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def acquire(self, amount: float = 1.0, stop: Optional[threading.Event] = None) -> float:
+        """
+        Take amount units, sleeping until they are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate is None:
+            return 0.0
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return waited
+            delay = (amount - self.tokens) / self.rate
+            if stop is not None and stop.wait(delay):
+                return waited
+            if stop is None:
+                time.sleep(delay)
+            waited += delay
+
+
+class EmbeddingBackfill:
+    """Embeds rows with a NULL embedding, page by page"""
+
+    def __init__(
+        self,
+        service: EmbeddingService,
+        checkpoint_path: str = DEFAULT_CHECKPOINT,
+        batch_size: int = 256,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        progress_interval: float = 10.0
+    ):
+        """
+        Initialize backfill.
+
+        Args:
+            service: EmbeddingService used to embed and write back
+            checkpoint_path: JSON file recording progress per table
+            batch_size: Rows per page (one backend request per page at most)
+            requests_per_minute: Limit on pages per minute (None = unlimited)
+            tokens_per_minute: Limit on input size, estimated as characters / 4
+            progress_interval: Seconds between progress log lines
+        """
+        self.service = service
+        self.checkpoint_path = checkpoint_path
+        self.batch_size = batch_size
+        self.requests = RateLimiter(requests_per_minute)
+        self.tokens = RateLimiter(tokens_per_minute)
+        self.progress_interval = progress_interval
+        self._stop = threading.Event()
+
+        os.makedirs(os.path.dirname(os.path.abspath(checkpoint_path)), exist_ok=True)
+        self.checkpoint = _read_json(checkpoint_path, {"tables": {}})
+
+        self.stats = {
+            "rows_seen": 0,
+            "rows_embedded": 0,
+            "rows_skipped": 0,
+            "pages": 0,
+            "rate_limited_seconds": 0.0,
+            "started_at": None
+        }
+        self._remaining: Dict[str, int] = {}
+
+    def _state(self, table: str) -> Dict[str, Any]:
+        return self.checkpoint["tables"].setdefault(
+            table, {"last_id": None, "rows": 0, "skipped": 0, "rejected": [],
+                    "done": False, "passes": 0}
+        )
+
+    def count_missing(self, source: BackfillSource) -> int:
+        """Rows after the checkpoint that still have no embedding"""
+        state = self._state(source.table)
+        query = f"SELECT COUNT(*) FROM {source.table} t WHERE t.embedding IS NULL"
+        params: tuple = ()
+        if state["last_id"]:
+            query += " AND t.id > %s"
+            params = (state["last_id"],)
+        with self.service.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                return cur.fetchone()[0]
+
+    def _page(self, source: BackfillSource, last_id: Optional[str]) -> List[tuple]:
+        query = f"""
+            SELECT t.id::text, {source.text}
+            FROM {source.table} t
+            WHERE t.embedding IS NULL
+        """
+        params: list = []
+        if last_id:
+            query += " AND t.id > %s"
+            params.append(last_id)
+        query += " ORDER BY t.id LIMIT %s"
+        params.append(self.batch_size)
+        with self.service.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, tuple(params))
+                return cur.fetchall()
+
+    def _embed_page(self, source: BackfillSource, todo: List[tuple]) -> tuple:
+        """
+        Embed and write one page; if the backend rejects the batch, retry
+        row by row so only the offending texts are left out.
+
+        Returns:
+            (rows written, ids the backend rejected)
+        """
+        # Rows embedded concurrently by a workflow are left alone
+        try:
+            return self.service.embed_rows(source.table, todo, only_missing=True), []
+        except urllib.error.HTTPError as e:
+            if not _rejected(e):
+                raise
+            logger.warning("%s: backend rejected a page (%s), retrying row by row",
+                           source.table, e)
+
+        written, rejected = 0, []
+        for row in todo:
+            try:
+                written += self.service.embed_rows(source.table, [row], only_missing=True)
+            except urllib.error.HTTPError as e:
+                if not _rejected(e):
+                    raise
+                logger.warning("%s: skipping %s, rejected by backend: %s", source.table, row[0], e)
+                rejected.append(row[0])
+        return written, rejected
+
+    def backfill_table(self, source: BackfillSource) -> int:
+        """
+        Embed every NULL-embedding row of one table, resuming from the checkpoint.
+
+        Returns:
+            Rows embedded in this run
+        """
+        state = self._state(source.table)
+        rejected_before = set(state.setdefault("rejected", []))
+        embedded = 0
+        last_log = time.monotonic()
+        while not self._stop.is_set():
+            rows = self._page(source, state["last_id"])
+            if not rows:
+                state["done"] = True
+                _write_json(self.checkpoint_path, self.checkpoint)
+                break
+
+            # Texts rejected on an earlier page or pass stay skipped
+            todo = [(row_id, text) for row_id, text in rows
+                    if text and text.strip() and row_id not in rejected_before]
+            self.stats["rate_limited_seconds"] += self.requests.acquire(1, self._stop)
+            self.stats["rate_limited_seconds"] += self.tokens.acquire(
+                sum(len(text) for _, text in todo) / 4, self._stop
+            )
+            if self._stop.is_set():
+                break
+
+            written, rejected = self._embed_page(source, todo) if todo else (0, [])
+            skipped = len(rows) - len(todo) + len(rejected)
+
+            state["last_id"] = rows[-1][0]
+            state["rows"] += written
+            state["skipped"] += skipped
+            state["rejected"].extend(rejected)
+            rejected_before.update(rejected)
+            _write_json(self.checkpoint_path, self.checkpoint)
+
+            embedded += written
+            self.stats["rows_seen"] += len(rows)
+            self.stats["rows_embedded"] += written
+            self.stats["rows_skipped"] += skipped
+            self.stats["pages"] += 1
+            self._remaining[source.table] = max(0, self._remaining.get(source.table, 0) - len(rows))
+
+            if time.monotonic() - last_log >= self.progress_interval:
+                last_log = time.monotonic()
+                metrics = self.get_metrics()
+                logger.info("%s: %d embedded, %d remaining overall, %.1f rows/s, ETA %.0fs",
+                            source.table, state["rows"], metrics["remaining"],
+                            metrics["rows_per_second"], metrics["eta_seconds"])
+        return embedded
+
+    def run(self, tables: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Backfill the given tables (default: all sources) in order.
+
+        Returns:
+            get_metrics() at the end of the run
+        """
+        sources = [SOURCES_BY_TABLE[t] for t in tables] if tables else SOURCES
+        self.stats["started_at"] = time.time()
+        for source in sources:
+            state = self._state(source.table)
+            if state["done"]:
+                state.update(last_id=None, done=False, passes=state.get("passes", 0) + 1)
+            self._remaining[source.table] = self.count_missing(source)
+        logger.info("Rows awaiting embeddings: %s", self._remaining)
+
+        for source in sources:
+            if self._stop.is_set():
+                break
+            self.backfill_table(source)
+        return self.get_metrics()
+
+    def reset(self, tables: Optional[List[str]] = None):
+        """Forget progress so the next run rescans from the start"""
+        for table in tables or list(SOURCES_BY_TABLE):
+            self.checkpoint["tables"].pop(table, None)
+        _write_json(self.checkpoint_path, self.checkpoint)
+
+    def stop(self):
+        """Finish the current page and return from run()"""
+        self._stop.set()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Progress counters, throughput, ETA and embedding service metrics"""
+        elapsed = time.time() - self.stats["started_at"] if self.stats["started_at"] else 0.0
+        rate = self.stats["rows_seen"] / elapsed if elapsed else 0.0
+        remaining = sum(self._remaining.values())
+        return dict(
+            self.stats,
+            elapsed_seconds=elapsed,
+            rows_per_second=rate,
+            remaining=remaining,
+            eta_seconds=remaining / rate if rate else None,
+            tables=self.checkpoint["tables"],
+            embeddings=self.service.get_metrics()
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from embeddings import get_backend, BACKENDS
+
+    parser = argparse.ArgumentParser(description="ARIA embedding backfill")
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                        help="Embedding backend (default: $ARIA_EMBEDDING_BACKEND or openai)")
+    parser.add_argument("--tables", help="Comma-separated subset of " + ",".join(SOURCES_BY_TABLE))
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--rpm", type=float, help="Max embedding requests per minute")
+    parser.add_argument("--tpm", type=float, help="Max input tokens per minute (chars / 4)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--reset", action="store_true", help="Discard the checkpoint first")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr,
+                        format="%(asctime)s %(levelname)s %(message)s")
+
+    tables = args.tables.split(",") if args.tables else None
+    unknown = [t for t in tables or [] if t not in SOURCES_BY_TABLE]
+    if unknown:
+        parser.error(f"Unknown tables: {', '.join(unknown)}")
+
+    backfill = EmbeddingBackfill(
+        EmbeddingService(get_backend(args.backend)),
+        checkpoint_path=args.checkpoint,
+        batch_size=args.batch_size,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm
+    )
+    if args.reset:
+        backfill.reset(tables)
+    signal.signal(signal.SIGTERM, lambda *_: backfill.stop())
+    try:
+        metrics = backfill.run(tables)
+    except KeyboardInterrupt:
+        backfill.stop()
+        metrics = backfill.get_metrics()
+    print(json.dumps(metrics, indent=2, default=str))
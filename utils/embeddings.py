@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Embeddings Module for ARIA
+Batched, cached text embeddings for the VECTOR(1536) columns
+
+Texts are deduplicated by content hash, looked up in a local SQLite cache
+(float32 blobs keyed by model and sha256), and only the misses go to the
+backend, in batches of up to backend.max_batch texts per request. Vectors
+are written back with one COPY into a temp table and one UPDATE ... FROM per
+batch instead of an UPDATE per row.
+
+Backends are pluggable: OpenAIBackend calls the embeddings API,
+HashingBackend is a deterministic local stand-in (token feature hashing)
+for tests and offline runs.
+
+    python embeddings.py --backend hashing embed "call the dentist"
+    python embeddings.py stats
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from array import array
+from typing import Optional, List, Dict, Any, Sequence, Tuple
+
+from db_pool import ConnectionPool, get_pool
+from reminders import ReminderManager
+from vector_search import to_vector_literal
+
+logger = logging.getLogger("aria.embeddings")
+
+DIMENSIONS = 1536
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "ARIA_EMBEDDING_CACHE", os.path.expanduser("~/.aria/embedding_cache.sqlite3")
+)
+
+# Tables with an embedding VECTOR(1536) column and a UUID id
+EMBEDDING_TABLES = ("aria_conversations", "aria_messages", "aria_attachments", "aria_unified_memory")
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model TEXT NOT NULL,
+    hash BLOB NOT NULL,             -- sha256 of the text
+    vector BLOB NOT NULL,           -- float32, native byte order
+    created_at REAL NOT NULL,
+    PRIMARY KEY (model, hash)
+) WITHOUT ROWID;
+"""
+
+
+def content_hash(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingBackend:
+    """Turns a batch of texts into vectors"""
+
+    model = ""
+    dimensions = DIMENSIONS
+    max_batch = 100
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+    @property
+    def cache_key(self) -> str:
+        """Cache namespace; vectors are only shared by identical model and size"""
+        return f"{self.model}/{self.dimensions}"
+
+
+class OpenAIBackend(EmbeddingBackend):
+    """OpenAI embeddings API (one request per batch, retried on 429/5xx)"""
+
+    URL = "https://api.openai.com/v1/embeddings"
+
+    def __init__(
+        self,
+        model: str = "text-embedding-3-small",
+        api_key: Optional[str] = None,
+        max_batch: int = 512,
+        timeout: float = 60.0,
+        max_retries: int = 5,
+        max_chars: int = 24000
+    ):
+        """
+        Args:
+            model: Embedding model; must produce 1536 dimensions
+            api_key: API key (default: $OPENAI_API_KEY)
+            max_batch: Texts per request (the API allows 2048)
+            timeout: Seconds per request
+            max_retries: Retries on rate limits and server errors
+            max_chars: Texts are truncated to this length to stay under the
+                       model's token limit
+        """
+        self.model = model
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY not configured")
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_chars = max_chars
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        body = json.dumps({
+            "model": self.model,
+            "input": [text[:self.max_chars] for text in texts]
+        }).encode("utf-8")
+
+        delay, attempt = 1.0, 0
+        while True:
+            request = urllib.request.Request(self.URL, data=body, method="POST", headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self.api_key}"
+            })
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    data = json.load(response)["data"]
+                return [item["embedding"] for item in sorted(data, key=lambda d: d["index"])]
+            except urllib.error.HTTPError as e:
+                if attempt == self.max_retries or (e.code != 429 and e.code < 500):
+                    raise
+                wait = float(e.headers.get("Retry-After") or delay)
+            except urllib.error.URLError:
+                if attempt == self.max_retries:
+                    raise
+                wait = delay
+            attempt += 1
+            logger.warning("Embedding request failed, retrying in %.1fs", wait)
+            time.sleep(wait)
+            delay = min(delay * 2, 60.0)
+
+
+class HashingBackend(EmbeddingBackend):
+    """
+    Deterministic local embeddings by token feature hashing.
+
+    Texts sharing words get a positive cosine similarity, which is enough to
+    exercise search and caching end to end without network access. Not a
+    substitute for a real model's semantics.
+    """
+
+    model = "hashing-v1"
+    max_batch = 1000
+
+    def __init__(self, dimensions: int = DIMENSIONS):
+        self.dimensions = dimensions
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        tokens = re.findall(r"\w+", text.lower()) or [text]
+        for token in tokens:
+            h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+            vector[h % self.dimensions] += 1.0 if (h >> 63) else -1.0
+        norm = sum(x * x for x in vector) ** 0.5 or 1.0
+        return [x / norm for x in vector]
+
+
+BACKENDS = {"openai": OpenAIBackend, "hashing": HashingBackend}
+
+
+def get_backend(name: Optional[str] = None) -> EmbeddingBackend:
+    """Backend by name (default: $ARIA_EMBEDDING_BACKEND or 'openai')"""
+    name = name or os.environ.get("ARIA_EMBEDDING_BACKEND", "openai")
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {name}")
+    return BACKENDS[name]()
+
+
+class EmbeddingCache:
+    """On-disk cache of vectors keyed by (backend cache_key, sha256 of text)"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(CACHE_SCHEMA)
+        self._lock = threading.Lock()
+
+    def get_many(self, model: str, hashes: List[bytes]) -> Dict[bytes, List[float]]:
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(hashes), 500):
+                chunk = hashes[i:i + 500]
+                rows = self._db.execute(
+                    f"SELECT hash, vector FROM embedding_cache "
+                    f"WHERE model = ? AND hash IN ({','.join('?' * len(chunk))})",
+                    [model, *chunk]
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = array("f", blob).tolist()
+        return found
+
+    def put_many(self, model: str, items: List[Tuple[bytes, Sequence[float]]]):
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embedding_cache (model, hash, vector, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(model, h, array("f", vector).tobytes(), now) for h, vector in items]
+                )
+                self._db.execute("COMMIT")
+            except sqlite3.Error:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT model, COUNT(*) FROM embedding_cache GROUP BY model"
+            ).fetchall()
+        return {
+            "path": self.path,
+            "bytes": os.path.getsize(self.path),
+            "entries": dict(rows)
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class EmbeddingService:
+    """Embeds texts through a backend with deduplication and caching"""
+
+    def __init__(
+        self,
+        backend: Optional[EmbeddingBackend] = None,
+        cache: Optional[EmbeddingCache] = None,
+        db_config: Optional[Dict[str, str]] = None,
+        pool: Optional[ConnectionPool] = None
+    ):
+        """
+        Initialize embedding service.
+
+        Args:
+            backend: Embedding backend (default: get_backend())
+            cache: Vector cache (default: EmbeddingCache at DEFAULT_CACHE_PATH)
+            db_config: Database configuration dict with host, port, user, password, database
+                      If None, reads from environment or uses Docker defaults
+            pool: Connection pool for write-back. If None, uses the shared pool
+                  for db_config (opened on first write)
+        """
+        self.backend = backend or get_backend()
+        self.cache = cache or EmbeddingCache()
+        self.db_config = db_config or ReminderManager._get_db_config()
+        self._pool = pool
+
+        self.stats = {
+            "texts": 0,
+            "duplicates": 0,
+            "cache_hits": 0,
+            "embedded": 0,
+            "requests": 0,
+            "request_seconds": 0.0,
+            "rows_written": 0
+        }
+
+    @property
+    def pool(self) -> ConnectionPool:
+        if self._pool is None:
+            self._pool = get_pool(self.db_config)
+        return self._pool
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, in order.
+
+        Identical texts are embedded once, cached texts not at all.
+
+        Raises:
+            ValueError: If a text is empty
+        """
+        if any(not text or not text.strip() for text in texts):
+            raise ValueError("Cannot embed empty text")
+
+        hashes = [content_hash(text) for text in texts]
+        unique: Dict[bytes, str] = {}
+        for h, text in zip(hashes, texts):
+            unique.setdefault(h, text)
+        self.stats["texts"] += len(texts)
+        self.stats["duplicates"] += len(texts) - len(unique)
+
+        model, key = self.backend.model, self.backend.cache_key
+        dimensions = self.backend.dimensions
+        # Entries of the wrong size (e.g. written by an older build) are misses
+        vectors = {h: v for h, v in self.cache.get_many(key, list(unique)).items()
+                   if len(v) == dimensions}
+        self.stats["cache_hits"] += len(vectors)
+
+        missing = [h for h in unique if h not in vectors]
+        for i in range(0, len(missing), self.backend.max_batch):
+            batch = missing[i:i + self.backend.max_batch]
+            start = time.monotonic()
+            embedded = self.backend.embed([unique[h] for h in batch])
+            self.stats["requests"] += 1
+            self.stats["request_seconds"] += time.monotonic() - start
+            if len(embedded) != len(batch) or any(len(v) != dimensions for v in embedded):
+                raise ValueError(f"Backend {model} returned malformed embeddings")
+            self.cache.put_many(key, list(zip(batch, embedded)))
+            vectors.update(zip(batch, embedded))
+            self.stats["embedded"] += len(batch)
+
+        return [vectors[h] for h in hashes]
+
+    def write(
+        self,
+        table: str,
+        rows: List[Tuple[str, Sequence[float]]],
+        only_missing: bool = False
+    ) -> int:
+        """
+        Write (id, vector) pairs to a table's embedding column.
+
+        One COPY into a temp table and one UPDATE ... FROM, in one transaction.
+
+        Args:
+            table: One of EMBEDDING_TABLES
+            rows: (id, vector) pairs
+            only_missing: Leave rows that already have an embedding alone
+
+        Returns:
+            Number of rows updated
+        """
+        if table not in EMBEDDING_TABLES:
+            raise ValueError(f"Not an embedding table: {table}")
+        if not rows:
+            return 0
+
+        buffer = io.StringIO()
+        for row_id, vector in rows:
+            buffer.write(f"{row_id}\t{to_vector_literal(vector)}\n")
+        buffer.seek(0)
+
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS aria_embedding_updates "
+                    "(id UUID PRIMARY KEY, embedding VECTOR(1536)) ON COMMIT DELETE ROWS"
+                )
+                cur.copy_expert("COPY aria_embedding_updates (id, embedding) FROM STDIN", buffer)
+                cur.execute(
+                    f"UPDATE {table} t SET embedding = u.embedding "
+                    f"FROM aria_embedding_updates u WHERE t.id = u.id"
+                    + (" AND t.embedding IS NULL" if only_missing else "")
+                )
+                updated = cur.rowcount
+        self.stats["rows_written"] += updated
+        return updated
+
+    def embed_rows(
+        self,
+        table: str,
+        rows: List[Tuple[str, str]],
+        only_missing: bool = False
+    ) -> int:
+        """Embed (id, text) pairs and write the vectors back; returns rows updated"""
+        vectors = self.embed([text for _, text in rows])
+        return self.write(table, [(row_id, v) for (row_id, _), v in zip(rows, vectors)], only_missing)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Counters plus cache hit rate and backend requests saved"""
+        unique = self.stats["texts"] - self.stats["duplicates"]
+        return dict(
+            self.stats,
+            model=self.backend.model,
+            hit_rate=self.stats["cache_hits"] / unique if unique else 0.0
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ARIA embeddings")
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                        help="Embedding backend (default: $ARIA_EMBEDDING_BACKEND or openai)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    embed = sub.add_parser("embed", help="Embed texts and print vector previews")
+    embed.add_argument("texts", nargs="+")
+    sub.add_parser("stats", help="Show cache size")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        print(json.dumps(EmbeddingCache().stats(), indent=2))
+    else:
+        service = EmbeddingService(get_backend(args.backend))
+        for text, vector in zip(args.texts, service.embed(args.texts)):
+            print(json.dumps({"text": text, "dimensions": len(vector),
+                              "head": [round(x, 5) for x in vector[:5]]}))
+        print(json.dumps(service.get_metrics(), indent=2))
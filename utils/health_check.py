@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Health Check Module for ARIA
+Concurrent service probes under a global deadline, with JSON and
+Prometheus output
+
+Every probe runs in its own thread and the whole check returns when the
+deadline passes, so a hung endpoint costs one deadline instead of one
+timeout per probe. Probes still running at the deadline are reported as
+failed. Database checks share one connection and one round trip.
+"""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field, asdict
+from typing import Optional, List, Dict, Any, Callable
+
+import psycopg2
+
+from reminders import ReminderManager
+
+OK, WARN, FAIL = "ok", "warn", "fail"
+STATUS_VALUES = {OK: 1.0, WARN: 0.5, FAIL: 0.0}
+
+
+@dataclass
+class Check:
+    """Result of one health check"""
+    name: str
+    status: str
+    detail: str
+    latency: float = 0.0
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+
+def _graded(value: float, warn: float, fail: float) -> str:
+    """Status for a value where higher is worse"""
+    if value >= fail:
+        return FAIL
+    if value >= warn:
+        return WARN
+    return OK
+
+
+def _http_status(url: str, timeout: float, headers: Optional[Dict[str, str]] = None) -> int:
+    """HTTP status of a GET (0 if the host couldn't be reached)"""
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read(1024)
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, socket.timeout, OSError):
+        return 0
+
+
+# Probes. Each takes the remaining time budget in seconds and returns one
+# or more Checks; exceptions are turned into a failed check by the runner.
+
+def probe_docker(timeout: float) -> List[Check]:
+    if shutil.which("docker") is None:
+        return [Check("docker", FAIL, "Docker not installed")]
+    result = subprocess.run(
+        ["docker", "ps", "--format", "{{.Names}}"],
+        capture_output=True, text=True, timeout=timeout
+    )
+    if result.returncode != 0:
+        return [Check("docker", FAIL, "Docker daemon not accessible")]
+
+    containers = [name for name in result.stdout.split()
+                  if any(key in name for key in ("aria", "n8n", "supabase"))]
+    return [
+        Check("docker", OK, "Docker daemon running"),
+        Check("containers", OK if containers else WARN,
+              ", ".join(containers) or "No ARIA-related containers found",
+              metrics={"containers_running": len(containers)})
+    ]
+
+
+def probe_supabase(timeout: float) -> List[Check]:
+    url = os.environ.get("SUPABASE_URL")
+    if not url:
+        return [Check("supabase", WARN, "SUPABASE_URL not configured")]
+    status = _http_status(f"{url}/rest/v1/", timeout,
+                          {"apikey": os.environ.get("SUPABASE_ANON_KEY", "none")})
+    if status == 0:
+        return [Check("supabase", FAIL, "Supabase API not reachable")]
+    return [Check("supabase", OK, f"Supabase API reachable (HTTP {status})")]
+
+
+def probe_n8n(timeout: float) -> List[Check]:
+    url = os.environ.get("N8N_URL", "http://localhost:5678")
+    status = _http_status(f"{url}/healthz", timeout)
+    if status == 200:
+        return [Check("n8n", OK, "n8n health endpoint OK")]
+    if status:
+        return [Check("n8n", OK, f"n8n reachable (HTTP {status})")]
+    return [Check("n8n", WARN, f"n8n not reachable at {url}")]
+
+
+def probe_openai(timeout: float) -> List[Check]:
+    key = os.environ.get("OPENAI_API_KEY")
+    if not key:
+        return [Check("openai", WARN, "OPENAI_API_KEY not configured")]
+    status = _http_status("https://api.openai.com/v1/models", timeout,
+                          {"Authorization": f"Bearer {key}"})
+    if status == 200:
+        return [Check("openai", OK, "OpenAI API accessible")]
+    if status == 401:
+        return [Check("openai", FAIL, "OpenAI API key invalid")]
+    return [Check("openai", WARN, f"OpenAI API returned {status:03d}")]
+
+
+def probe_telegram(timeout: float) -> List[Check]:
+    token = os.environ.get("TELEGRAM_BOT_TOKEN")
+    if not token:
+        return [Check("telegram", WARN, "TELEGRAM_BOT_TOKEN not configured")]
+    try:
+        with urllib.request.urlopen(f"https://api.telegram.org/bot{token}/getMe",
+                                    timeout=timeout) as response:
+            body = json.load(response)
+    except urllib.error.HTTPError:
+        return [Check("telegram", FAIL, "Telegram bot token invalid")]
+    except (urllib.error.URLError, socket.timeout, OSError):
+        return [Check("telegram", WARN, "Telegram API not reachable")]
+    if not body.get("ok"):
+        return [Check("telegram", FAIL, "Telegram bot token invalid")]
+    return [Check("telegram", OK, f"Telegram bot active: @{body['result'].get('username')}")]
+
+
+def probe_host(timeout: float) -> List[Check]:
+    usage = shutil.disk_usage("/")
+    disk = usage.used / usage.total
+
+    meminfo = {}
+    with open("/proc/meminfo") as f:
+        for line in f:
+            key, value = line.split(":", 1)
+            meminfo[key] = int(value.split()[0])
+    memory = meminfo["MemAvailable"] / meminfo["MemTotal"]
+
+    return [
+        Check("disk", _graded(disk, 0.80, 0.90), f"Disk usage: {disk:.0%}",
+              metrics={"disk_used_ratio": disk}),
+        Check("memory", _graded(1 - memory, 0.80, 0.90), f"Memory available: {memory:.0%}",
+              metrics={"memory_available_ratio": memory})
+    ]
+
+
+DATABASE_QUERY = """
+    SELECT
+      (SELECT COUNT(*) FROM pg_stat_activity),
+      current_setting('max_connections')::INTEGER,
+      (SELECT COUNT(*) FROM pg_stat_activity
+       WHERE state = 'idle in transaction'
+         AND xact_start < NOW() - INTERVAL '1 minute'),
+      (SELECT EXTRACT(EPOCH FROM NOW() - MAX(beat_at)) FROM aria_dispatcher_heartbeat),
+      (SELECT MAX(last_lag) FROM aria_dispatcher_heartbeat
+       WHERE beat_at > NOW() - INTERVAL '5 minutes'),
+      (SELECT COUNT(*) FROM aria_interface_sync WHERE delivered = FALSE),
+      (SELECT EXTRACT(EPOCH FROM NOW() - MIN(m.created_at))
+       FROM aria_interface_sync s JOIN aria_messages m ON m.id = s.message_id
+       WHERE s.delivered = FALSE)
+"""
+
+
+def probe_database(timeout: float, dsn: Optional[str] = None) -> List[Check]:
+    """Connection saturation, dispatcher heartbeat and sync backlog"""
+    timeout_ms = max(1, int(timeout * 1000))
+    options = f"-c statement_timeout={timeout_ms}"
+    dsn = dsn or os.environ.get("SUPABASE_DB_URL")
+    if dsn:
+        conn = psycopg2.connect(dsn, connect_timeout=max(1, int(timeout)), options=options)
+    else:
+        cfg = ReminderManager._get_db_config()
+        conn = psycopg2.connect(
+            host=cfg["host"], port=cfg["port"], user=cfg["user"],
+            password=cfg["password"], database=cfg["database"],
+            connect_timeout=max(1, int(timeout)), options=options
+        )
+    try:
+        with conn.cursor() as cur:
+            cur.execute(DATABASE_QUERY)
+            (used, max_connections, stuck, beat_age, lag,
+             sync_pending, sync_age) = cur.fetchone()
+    finally:
+        conn.close()
+
+    saturation = used / max_connections
+    checks = [
+        Check("database", OK, "Database reachable"),
+        Check("db_connections",
+              FAIL if saturation >= 0.95 else WARN if saturation >= 0.80 or stuck else OK,
+              f"{used}/{max_connections} connections, {stuck} idle in transaction > 1m",
+              metrics={"db_connections_used": used, "db_connections_max": max_connections,
+                       "db_connections_idle_in_transaction": stuck})
+    ]
+
+    if beat_age is None:
+        checks.append(Check("dispatcher", WARN, "No dispatcher heartbeat recorded"))
+    else:
+        beat_age = float(beat_age)
+        lag = float(lag or 0.0)
+        status = _graded(beat_age, 60, 300)
+        if status == OK:
+            status = _graded(lag, 30, 300)
+        checks.append(Check(
+            "dispatcher", status,
+            f"Heartbeat {beat_age:.0f}s ago, last dispatch lag {lag:.1f}s",
+            metrics={"dispatcher_heartbeat_age_seconds": beat_age,
+                     "dispatcher_lag_seconds": lag}
+        ))
+
+    sync_age = float(sync_age or 0.0)
+    checks.append(Check(
+        "sync_backlog",
+        FAIL if sync_age >= 3600 else WARN if sync_pending >= 100 or sync_age >= 300 else OK,
+        f"{sync_pending} undelivered, oldest {sync_age:.0f}s",
+        metrics={"sync_pending": sync_pending, "sync_oldest_age_seconds": sync_age}
+    ))
+    return checks
+
+
+PROBES: Dict[str, Callable[[float], List[Check]]] = {
+    "docker": probe_docker,
+    "supabase": probe_supabase,
+    "n8n": probe_n8n,
+    "openai": probe_openai,
+    "telegram": probe_telegram,
+    "host": probe_host,
+    "database": probe_database
+}
+
+
+def run_checks(
+    deadline: float = 3.0,
+    probes: Optional[Dict[str, Callable[[float], List[Check]]]] = None
+) -> Dict[str, Any]:
+    """
+    Run probes concurrently and collect their results.
+
+    Args:
+        deadline: Seconds the whole run may take; each probe gets this as its
+                  own I/O timeout, and probes still running at the deadline
+                  are reported as failed
+        probes: Probes to run (default: all of PROBES)
+
+    Returns:
+        Dict with status (worst of all checks), duration and checks
+    """
+    probes = probes if probes is not None else PROBES
+    start = time.monotonic()
+    checks: List[Check] = []
+
+    def timed(name: str, probe: Callable[[float], List[Check]]) -> List[Check]:
+        probe_start = time.monotonic()
+        try:
+            results = probe(deadline)
+        except Exception as e:
+            results = [Check(name, FAIL, f"{type(e).__name__}: {e}")]
+        latency = time.monotonic() - probe_start
+        for check in results:
+            check.latency = latency
+        return results
+
+    # Daemon threads, so a probe stuck past the deadline can't hold up exit
+    results: Dict[str, List[Check]] = {}
+    threads = []
+    for name, probe in probes.items():
+        thread = threading.Thread(
+            target=lambda n=name, p=probe: results.__setitem__(n, timed(n, p)),
+            name=f"aria-health-{name}", daemon=True
+        )
+        thread.start()
+        threads.append((name, thread))
+
+    for name, thread in threads:
+        thread.join(max(0.0, deadline - (time.monotonic() - start)))
+        if name in results:
+            checks.extend(results[name])
+        else:
+            checks.append(Check(name, FAIL, f"Timed out after {deadline:.1f}s",
+                                latency=deadline))
+
+    checks.sort(key=lambda c: c.name)
+    worst = min((STATUS_VALUES[c.status] for c in checks), default=1.0)
+    return {
+        "status": next(s for s, v in STATUS_VALUES.items() if v == worst),
+        "timestamp": time.time(),
+        "duration": time.monotonic() - start,
+        "checks": [asdict(c) for c in checks]
+    }
+
+
+def format_prometheus(report: Dict[str, Any]) -> str:
+    """Render a run_checks() report in the Prometheus text exposition format"""
+    lines = [
+        "# HELP aria_health_status Check status (1 ok, 0.5 warn, 0 fail)",
+        "# TYPE aria_health_status gauge"
+    ]
+    for check in report["checks"]:
+        lines.append(f'aria_health_status{{check="{check["name"]}"}} '
+                     f'{STATUS_VALUES[check["status"]]}')
+
+    lines += [
+        "# HELP aria_health_probe_latency_seconds Time taken by the probe behind a check",
+        "# TYPE aria_health_probe_latency_seconds gauge"
+    ]
+    for check in report["checks"]:
+        lines.append(f'aria_health_probe_latency_seconds{{check="{check["name"]}"}} '
+                     f'{check["latency"]:.6f}')
+
+    metrics = {}
+    for check in report["checks"]:
+        metrics.update(check["metrics"])
+    for name, value in sorted(metrics.items()):
+        lines.append(f"# TYPE aria_{name} gauge")
+        lines.append(f"aria_{name} {float(value)}")
+
+    lines += [
+        "# TYPE aria_health_check_duration_seconds gauge",
+        f"aria_health_check_duration_seconds {report['duration']:.6f}"
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def format_text(report: Dict[str, Any]) -> str:
+    """Human-readable report, one line per check"""
+    marks = {OK: "✓", WARN: "!", FAIL: "✗"}
+    lines = [f"  {marks[c['status']]} {c['name']:<16} {c['detail']} ({c['latency'] * 1000:.0f}ms)"
+             for c in report["checks"]]
+    lines.append(f"Status: {report['status']} in {report['duration']:.2f}s")
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ARIA health check")
+    parser.add_argument("--format", choices=["text", "json", "prometheus"], default="text")
+    parser.add_argument("--deadline", type=float, default=3.0,
+                        help="Seconds the whole check may take (default: 3)")
+    parser.add_argument("--only", help="Comma-separated subset of " + ",".join(PROBES))
+    args = parser.parse_args()
+
+    selected = PROBES
+    if args.only:
+        selected = {name: PROBES[name] for name in args.only.split(",")}
+
+    report = run_checks(args.deadline, selected)
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+    elif args.format == "prometheus":
+        sys.stdout.write(format_prometheus(report))
+    else:
+        sys.stdout.write(format_text(report))
+    sys.exit(1 if report["status"] == FAIL else 0)
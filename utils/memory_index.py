@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Memory Index Module for ARIA
+In-process vector index (optionally quantized) over active aria_unified_memory rows
+
+Memory recall runs on every turn, so the active memories are held in a
+NumPy matrix of normalized embeddings and searched in-process instead of
+calling pgvector over the network: one BLAS matrix-vector product and an
+argpartition top-k. The default float32 matrix is the fastest to score.
+int8 (one scale per row, 4x smaller) and float16 (2x smaller) trade search
+time for memory, since NumPy has no fast kernels for either and each query
+upcasts them block by block.
+
+The index follows the table through the aria_memory NOTIFY channel
+(017_aria_memory_notify.sql) while its listener thread runs. Without a
+listener, refresh() picks up new rows by created_at. Either way it
+reloads fully every resync_interval as a safety net. Until the first load
+succeeds, or when it can't be refreshed, searches fall back to
+match_aria_memory (014_aria_vector_search.sql).
+
+    python memory_index.py stats --dtype float32
+    python memory_index.py benchmark --queries 200 -k 10
+"""
+
+import json
+import logging
+import select
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Sequence, Tuple
+
+import numpy as np
+import psycopg2
+import psycopg2.extensions
+
+from db_pool import PoolTimeout
+from vector_search import VectorSearch
+
+logger = logging.getLogger("aria.memory_index")
+
+CHANNEL = "aria_memory"
+DTYPES = ("int8", "float16", "float32")
+
+# Rows upcast to float32 per matrix-vector product for int8/float16; small
+# enough that the upcast block stays in cache for the product that follows
+SCORE_BLOCK = 64
+
+# created_at is set when a transaction starts, so rows can commit after
+# the watermark has moved past them
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+MEMORY_COLUMNS = "id::text, memory_type, content, confidence, created_at, embedding::real[]"
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """Immutable index state; searches read one without locking"""
+    ids: List[str]
+    rows: List[tuple]               # (id, memory_type, content, confidence, created_at)
+    matrix: np.ndarray              # n x d, quantized
+    scales: Optional[np.ndarray]    # n, int8 only
+    positions: Dict[str, int]
+
+
+def quantize(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Quantize L2-normalized float32 rows.
+
+    int8 uses a symmetric per-row scale (max |x| maps to 127).
+
+    Returns:
+        (matrix, scales); scales is None for float16/float32
+    """
+    if dtype == "float32":
+        return vectors.astype(np.float32, copy=False), None
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    if dtype != "int8":
+        raise ValueError(f"Invalid dtype: {dtype}")
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    matrix = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return matrix, scales.astype(np.float32)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class MemoryIndex:
+    """Cosine top-k over active memories, kept in process"""
+
+    def __init__(
+        self,
+        search: Optional[VectorSearch] = None,
+        dtype: str = "float32",
+        resync_interval: float = 3600.0,
+        max_staleness: float = 60.0
+    ):
+        """
+        Initialize memory index.
+
+        Args:
+            search: VectorSearch used for loading and for the database
+                    fallback (default: one on the shared pool)
+            dtype: Stored vector type: 'float32' (fastest), 'int8' (4x
+                   smaller) or 'float16' (2x smaller)
+            resync_interval: Seconds between full reloads
+            max_staleness: Without a listener, seconds after which a search
+                           first runs an incremental refresh
+        """
+        if dtype not in DTYPES:
+            raise ValueError(f"Invalid dtype: {dtype}")
+        self.search = search or VectorSearch()
+        self.dtype = dtype
+        self.resync_interval = resync_interval
+        self.max_staleness = max_staleness
+
+        self._snapshot: Optional[_Snapshot] = None
+        self._watermark: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._last_refresh = 0.0
+        self._last_load = 0.0
+
+        self._listening = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            "searches": 0,
+            "fallbacks": 0,
+            "loads": 0,
+            "refreshes": 0,
+            "notifications": 0,
+            "load_seconds": 0.0,
+            "last_error": None
+        }
+
+    # Loading
+
+    def _fetch(self, where: str, params: tuple = ()) -> List[tuple]:
+        with self.search.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"SELECT {MEMORY_COLUMNS} FROM aria_unified_memory "
+                    f"WHERE is_active = TRUE AND embedding IS NOT NULL AND {where}",
+                    params
+                )
+                return cur.fetchall()
+
+    def _encode(self, fetched: List[tuple]) -> Tuple[List[tuple], np.ndarray, Optional[np.ndarray]]:
+        rows = [row[:5] for row in fetched]
+        if not fetched:
+            return rows, np.empty((0, 0), dtype=np.float32), None
+        vectors = _normalize(np.asarray([row[5] for row in fetched], dtype=np.float32))
+        matrix, scales = quantize(vectors, self.dtype)
+        return rows, matrix, scales
+
+    def _advance_watermark(self, rows: List[tuple]):
+        if rows:
+            newest = max(row[4] for row in rows)
+            if self._watermark is None or newest > self._watermark:
+                self._watermark = newest
+
+    def load(self):
+        """Replace the index with every active, embedded memory"""
+        start = time.monotonic()
+        fetched = self._fetch("TRUE")
+        rows, matrix, scales = self._encode(fetched)
+        with self._lock:
+            self._snapshot = _Snapshot(
+                ids=[row[0] for row in rows], rows=rows, matrix=matrix, scales=scales,
+                positions={row[0]: i for i, row in enumerate(rows)}
+            )
+            self._watermark = None
+            self._advance_watermark(rows)
+            self._last_refresh = self._last_load = time.monotonic()
+        self.stats["loads"] += 1
+        self.stats["load_seconds"] = time.monotonic() - start
+        logger.info("Loaded %d memories (%s, %d bytes)", len(rows), self.dtype, self.nbytes)
+
+    def _apply(self, fetched: List[tuple], removed: Sequence[str] = ()):
+        """Upsert fetched rows and drop removed ids, building a new snapshot"""
+        new_rows, new_matrix, new_scales = self._encode(fetched)
+        with self._lock:
+            snap = self._snapshot
+            if snap is None:
+                return
+            replaced = set(removed) | {row[0] for row in new_rows}
+            if not replaced:
+                return
+            keep = [i for i, row_id in enumerate(snap.ids) if row_id not in replaced]
+
+            matrix = snap.matrix[keep] if len(snap.ids) else snap.matrix
+            scales = snap.scales[keep] if snap.scales is not None else None
+            rows = [snap.rows[i] for i in keep] + new_rows
+            if new_rows:
+                matrix = new_matrix if matrix.size == 0 else np.concatenate([matrix, new_matrix])
+                if new_scales is not None:
+                    scales = new_scales if scales is None else np.concatenate([scales, new_scales])
+
+            self._snapshot = _Snapshot(
+                ids=[row[0] for row in rows], rows=rows, matrix=matrix, scales=scales,
+                positions={row[0]: i for i, row in enumerate(rows)}
+            )
+            self._advance_watermark(new_rows)
+
+    def refresh(self):
+        """
+        Pick up memories created since the last load or refresh.
+
+        Deactivations and embeddings added to old rows are only seen by
+        the listener or the next full load.
+        """
+        if self._snapshot is None or time.monotonic() - self._last_load >= self.resync_interval:
+            self.load()
+            return
+        if self._watermark is None:
+            fetched = self._fetch("TRUE")
+        else:
+            fetched = self._fetch("created_at >= %s", (self._watermark - REFRESH_OVERLAP,))
+        self._apply(fetched)
+        self._last_refresh = time.monotonic()
+        self.stats["refreshes"] += 1
+
+    def _refresh_ids(self, ids: List[str]):
+        """Re-read specific memories, dropping those no longer indexable"""
+        fetched = self._fetch("id = ANY(%s::uuid[])", (ids,))
+        found = {row[0] for row in fetched}
+        self._apply(fetched, [row_id for row_id in ids if row_id not in found])
+        self._last_refresh = time.monotonic()
+
+    # Search
+
+    @property
+    def size(self) -> int:
+        return len(self._snapshot.ids) if self._snapshot else 0
+
+    @property
+    def nbytes(self) -> int:
+        snap = self._snapshot
+        if snap is None:
+            return 0
+        return snap.matrix.nbytes + (snap.scales.nbytes if snap.scales is not None else 0)
+
+    def _scores(self, snap: _Snapshot, query: np.ndarray) -> np.ndarray:
+        if snap.matrix.dtype == np.float32:
+            return snap.matrix @ query
+        scores = np.empty(len(snap.ids), dtype=np.float32)
+        for start in range(0, len(snap.ids), SCORE_BLOCK):
+            block = snap.matrix[start:start + SCORE_BLOCK].astype(np.float32)
+            scores[start:start + SCORE_BLOCK] = block @ query
+        if snap.scales is not None:
+            scores *= snap.scales
+        return scores
+
+    def search_local(
+        self,
+        embedding: Sequence[float],
+        k: int = 10,
+        threshold: float = 0.0
+    ) -> Optional[List[Dict[str, Any]]]:
+        """In-process search; None if the index isn't loaded"""
+        snap = self._snapshot
+        if snap is None:
+            return None
+        if not snap.ids or k <= 0:
+            return []
+
+        query = _normalize(np.asarray(embedding, dtype=np.float32))
+        scores = self._scores(snap, query)
+        k = min(k, len(scores))
+        top = np.argpartition(scores, len(scores) - k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+
+        results = []
+        for i in top:
+            similarity = float(scores[i])
+            if similarity <= threshold:
+                break
+            row_id, memory_type, content, confidence, created_at = snap.rows[i]
+            results.append({"id": row_id, "memory_type": memory_type, "content": content,
+                            "confidence": confidence, "created_at": created_at,
+                            "similarity": similarity})
+        return results
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        k: int = 10,
+        threshold: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Active memories most similar to an embedding, most similar first.
+
+        Same result shape as VectorSearch.search_memory, which serves the
+        search when the index is not loaded or can't be brought up to date.
+        """
+        self.stats["searches"] += 1
+        if not self._listening and time.monotonic() - self._last_refresh > self.max_staleness:
+            try:
+                self.refresh()
+            except (psycopg2.Error, PoolTimeout) as e:
+                self.stats["last_error"] = str(e)
+                logger.warning("Memory index refresh failed: %s", e)
+                self._snapshot = None
+
+        results = self.search_local(embedding, k, threshold)
+        if results is None:
+            self.stats["fallbacks"] += 1
+            return self.search.search_memory(embedding, k, threshold)
+        return results
+
+    # Listener
+
+    def _connect_listener(self):
+        cfg = self.search.db_config
+        conn = psycopg2.connect(
+            host=cfg["host"],
+            port=cfg["port"],
+            user=cfg["user"],
+            password=cfg["password"],
+            database=cfg["database"]
+        )
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {CHANNEL}")
+        return conn
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            listener = None
+            try:
+                listener = self._connect_listener()
+                # Load after LISTEN so no change between the two is missed
+                self.load()
+                self._listening = True
+                backoff = 1.0
+
+                while not self._stop.is_set():
+                    timeout = max(0.0, self.resync_interval - (time.monotonic() - self._last_load))
+                    readable, _, _ = select.select([listener], [], [], min(timeout, 1.0))
+                    if readable:
+                        listener.poll()
+                        ids = []
+                        while listener.notifies:
+                            notify = listener.notifies.pop(0)
+                            self.stats["notifications"] += 1
+                            try:
+                                ids.append(json.loads(notify.payload)["id"])
+                            except (ValueError, KeyError):
+                                logger.warning("Ignoring malformed notification: %r", notify.payload)
+                        if ids:
+                            self._refresh_ids(list(dict.fromkeys(ids)))
+                    if time.monotonic() - self._last_load >= self.resync_interval:
+                        self.load()
+
+            except (psycopg2.Error, PoolTimeout) as e:
+                self.stats["last_error"] = str(e)
+                logger.exception("Memory index listener failed, reconnecting in %.0fs", backoff)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+            finally:
+                self._listening = False
+                if listener is not None:
+                    try:
+                        listener.close()
+                    except psycopg2.Error:
+                        pass
+
+    def start(self) -> "MemoryIndex":
+        """Load the index and keep it current from the aria_memory channel"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="aria-memory-index",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the listener; the index keeps serving, refreshed on demand"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Counters plus size, memory footprint and listener state"""
+        return dict(
+            self.stats,
+            size=self.size,
+            dtype=self.dtype,
+            bytes=self.nbytes,
+            listening=self._listening,
+            watermark=self._watermark
+        )
+
+
+def benchmark(search: VectorSearch, queries: int = 200, k: int = 10) -> Dict[str, Any]:
+    """
+    Recall@k against exact float32 and search latency for each dtype.
+
+    Queries are stored memory embeddings; the pgvector fallback is timed on
+    the same queries for comparison.
+    """
+    exact = MemoryIndex(search, "float32")
+    exact.load()
+    snap = exact._snapshot
+    if not snap.ids:
+        raise ValueError("No embedded active memories to benchmark against")
+    picks = np.random.default_rng(0).choice(len(snap.ids), min(queries, len(snap.ids)),
+                                            replace=False)
+    vectors = [snap.matrix[i].tolist() for i in picks]
+    truth = [{r["id"] for r in exact.search_local(v, k, -1.0)} for v in vectors]
+
+    def percentile(samples: List[float], p: float) -> float:
+        samples = sorted(samples)
+        return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+    results = []
+    for dtype in DTYPES:
+        index = exact if dtype == "float32" else MemoryIndex(search, dtype)
+        if index is not exact:
+            index.load()
+        recalls, samples = [], []
+        for vector, expected in zip(vectors, truth):
+            start = time.perf_counter_ns()
+            found = index.search_local(vector, k, -1.0)
+            samples.append((time.perf_counter_ns() - start) / 1e3)
+            recalls.append(len({r["id"] for r in found} & expected) / len(expected))
+        results.append({
+            "dtype": dtype,
+            "bytes": index.nbytes,
+            "recall_mean": float(np.mean(recalls)),
+            "median_us": percentile(samples, 0.5),
+            "p95_us": percentile(samples, 0.95)
+        })
+
+    db_samples = []
+    for vector in vectors[:50]:
+        start = time.perf_counter_ns()
+        search.search_memory(vector, k, -1.0)
+        db_samples.append((time.perf_counter_ns() - start) / 1e3)
+    return {
+        "memories": len(snap.ids),
+        "queries": len(vectors),
+        "k": k,
+        "database_median_us": percentile(db_samples, 0.5),
+        "results": results
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="ARIA in-process memory index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    stats = sub.add_parser("stats", help="Load the index and print its metrics")
+    stats.add_argument("--dtype", choices=DTYPES, default="float32")
+    bench = sub.add_parser("benchmark", help="Recall and latency per dtype vs pgvector")
+    bench.add_argument("--queries", type=int, default=200)
+    bench.add_argument("-k", "--k", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr,
+                        format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "stats":
+        index = MemoryIndex(dtype=args.dtype)
+        index.load()
+        output = index.get_metrics()
+    else:
+        output = benchmark(VectorSearch(), args.queries, args.k)
+    print(json.dumps(output, indent=2, default=str))
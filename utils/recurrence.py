@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Recurrence Module for ARIA
+Lazy expansion of recurring reminders into concrete occurrences
+
+The database only stores the next occurrence of a recurring reminder. These
+generators compute the ones after it on demand, in the user's timezone, so
+a daily 9am reminder stays at 9am local time across DST changes. Nothing is
+materialized: the n-th occurrence is computed directly from the anchor, so
+iteration can start at any window without walking the occurrences before it.
+
+complete_reminder steps recurring rows in SQL instead, in the session zone
+and one interval at a time, so after a DST change or a month-end anchor the
+stored next row can differ from the projection (see
+ReminderManager.iter_occurrences).
+"""
+
+import calendar
+from datetime import date, datetime, timedelta
+from typing import Iterator, Optional
+
+import pytz
+
+
+def _add_months(day: date, months: int) -> date:
+    """Add months, clamping the day to the target month's length (Jan 31 -> Feb 28)"""
+    index = day.month - 1 + months
+    year, month = day.year + index // 12, index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def nth_date(anchor: date, recurrence: str, n: int) -> date:
+    """Date of the n-th occurrence after anchor (n=0 is the anchor itself)"""
+    if recurrence == "daily":
+        return anchor + timedelta(days=n)
+    if recurrence == "weekly":
+        return anchor + timedelta(weeks=n)
+    if recurrence == "monthly":
+        return _add_months(anchor, n)
+    if recurrence == "yearly":
+        return _add_months(anchor, 12 * n)
+    raise ValueError(f"Invalid recurrence: {recurrence}")
+
+
+def _index_before(anchor: date, recurrence: str, day: date) -> int:
+    """An occurrence index whose date is on or before day (0 if day precedes anchor)"""
+    if day <= anchor:
+        return 0
+    if recurrence == "daily":
+        n = (day - anchor).days
+    elif recurrence == "weekly":
+        n = (day - anchor).days // 7
+    elif recurrence == "monthly":
+        n = (day.year - anchor.year) * 12 + day.month - anchor.month
+    else:
+        n = day.year - anchor.year
+    # Step back one so month-end clamping and DST can't overshoot the window
+    return max(0, n - 1)
+
+
+def occurrences(
+    anchor: datetime,
+    recurrence: str,
+    tz: pytz.BaseTzInfo,
+    start: datetime,
+    end: datetime,
+    until: Optional[datetime] = None,
+    first: int = 0
+) -> Iterator[datetime]:
+    """
+    Yield occurrences of a recurring time in [start, end), oldest first.
+
+    Args:
+        anchor: Time of occurrence 0; its local wall-clock time is kept
+        recurrence: 'daily', 'weekly', 'monthly' or 'yearly'
+        tz: Timezone whose wall clock the recurrence follows
+        start: Window start (inclusive, timezone-aware)
+        end: Window end (exclusive, timezone-aware)
+        until: Last allowed occurrence time (recurrence_end_date), inclusive
+        first: Skip occurrences before this index
+
+    Yields:
+        Timezone-aware datetimes in tz
+    """
+    local = anchor.astimezone(tz)
+    anchor_day, clock = local.date(), local.time().replace(tzinfo=None)
+    stop = end if until is None else min(end, until + timedelta(microseconds=1))
+
+    n = max(first, _index_before(anchor_day, recurrence, start.astimezone(tz).date()))
+    while True:
+        # localize + normalize moves a time that falls in a spring-forward gap
+        # to the equivalent wall time after the gap
+        occurrence = tz.normalize(tz.localize(datetime.combine(
+            nth_date(anchor_day, recurrence, n), clock
+        )))
+        if occurrence >= stop:
+            return
+        if occurrence >= start:
+            yield occurrence
+        n += 1
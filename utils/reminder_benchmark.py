@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Reminder Benchmark Module for ARIA
+Times the reminder and time-context hot paths against a throwaway Postgres
+
+Creates a scratch database, applies the reminder migrations with psql,
+seeds it at each requested table size and writes JSON results that can be
+compared between commits:
+
+    python reminder_benchmark.py --sizes 1000,100000 --output after.json
+    python reminder_benchmark.py --compare before.json after.json
+"""
+
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from glob import glob
+from typing import Callable, Optional, List, Dict, Any
+
+import psycopg2
+import psycopg2.extensions
+
+from reminders import ReminderManager, STATEMENTS
+from time_context import TimeContext
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "supabase", "migrations")
+REMINDER_MIGRATIONS = "*_aria_reminder*.sql"
+
+# Statements known to fail on a current server, skipped when applying the
+# migrations: 004's NOW()-predicate indexes (index predicates must be
+# IMMUTABLE), which 008 drops and replaces anyway
+SKIPPED_STATEMENTS = {
+    "004_aria_reminders.sql": ("idx_reminders_remind_at", "idx_reminders_overdue"),
+}
+
+# Superseded definitions, installed under other names so the benchmarks can
+# time them against the current ones: the pre-010 plpgsql read functions and
+# the pre-011 full-scan summary view
+LEGACY_SQL = """
+CREATE OR REPLACE FUNCTION bench_upcoming_reminders_plpgsql(p_user_id TEXT, p_hours INTEGER)
+RETURNS TABLE (id UUID, reminder_text TEXT, remind_at TIMESTAMPTZ,
+               priority TEXT, category TEXT, time_until INTERVAL) AS $$
+BEGIN
+  RETURN QUERY
+  SELECT r.id, r.reminder_text, r.remind_at, r.priority, r.category,
+         COALESCE(r.snoozed_until, r.remind_at) - NOW()
+  FROM aria_reminders r
+  WHERE r.user_id = p_user_id
+    AND NOT r.completed
+    AND COALESCE(r.snoozed_until, r.remind_at) >= NOW()
+    AND COALESCE(r.snoozed_until, r.remind_at) <= NOW() + (p_hours || ' hours')::INTERVAL
+  ORDER BY COALESCE(r.snoozed_until, r.remind_at);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION bench_overdue_reminders_plpgsql(p_user_id TEXT)
+RETURNS TABLE (id UUID, reminder_text TEXT, remind_at TIMESTAMPTZ,
+               priority TEXT, category TEXT, overdue_by INTERVAL) AS $$
+BEGIN
+  RETURN QUERY
+  SELECT r.id, r.reminder_text, r.remind_at, r.priority, r.category,
+         NOW() - COALESCE(r.snoozed_until, r.remind_at)
+  FROM aria_reminders r
+  WHERE r.user_id = p_user_id
+    AND NOT r.completed
+    AND COALESCE(r.snoozed_until, r.remind_at) < NOW()
+  ORDER BY COALESCE(r.snoozed_until, r.remind_at);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE VIEW bench_reminder_summary_scan AS
+SELECT
+  user_id,
+  COUNT(*) FILTER (WHERE NOT completed AND remind_at < NOW()) as overdue_count,
+  COUNT(*) FILTER (WHERE NOT completed AND remind_at BETWEEN NOW() AND NOW() + INTERVAL '2 hours') as upcoming_soon,
+  COUNT(*) FILTER (WHERE NOT completed AND remind_at BETWEEN NOW() AND NOW() + INTERVAL '24 hours') as upcoming_today,
+  COUNT(*) FILTER (WHERE NOT completed) as total_active,
+  COUNT(*) FILTER (WHERE completed AND completed_at > NOW() - INTERVAL '7 days') as completed_this_week
+FROM aria_reminders
+GROUP BY user_id;
+"""
+
+PARSE_PHRASES = [
+    "in 2 hours", "tomorrow at 3pm", "next friday", "tonight",
+    "monday at 9:30am", "in 45 minutes", "today", "next week", "tonight at 12am"
+]
+
+
+def _admin_config() -> Dict[str, str]:
+    """Connection settings for the server that hosts the scratch database"""
+    return {
+        "host": os.environ.get("BENCH_POSTGRES_HOST", "localhost"),
+        "port": os.environ.get("BENCH_POSTGRES_PORT", "5432"),
+        "user": os.environ.get("BENCH_POSTGRES_USER", "postgres"),
+        "password": os.environ.get("BENCH_POSTGRES_PASSWORD", "postgres"),
+        "database": os.environ.get("BENCH_POSTGRES_DB", "postgres")
+    }
+
+
+def _connect(cfg: Dict[str, str]):
+    return psycopg2.connect(
+        host=cfg["host"], port=cfg["port"], user=cfg["user"],
+        password=cfg["password"], database=cfg["database"]
+    )
+
+
+class ScratchDatabase:
+    """Throwaway database with the reminder schema applied"""
+
+    def __init__(self, admin_config: Dict[str, str], keep: bool = False):
+        self.admin_config = admin_config
+        self.name = f"aria_bench_{os.getpid()}"
+        self.config = dict(admin_config, database=self.name)
+        self.keep = keep
+
+    def _admin(self, sql: str):
+        conn = _connect(self.admin_config)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql)
+        finally:
+            conn.close()
+
+    def __enter__(self) -> "ScratchDatabase":
+        self._admin(f"DROP DATABASE IF EXISTS {self.name}")
+        self._admin(f"CREATE DATABASE {self.name}")
+        self.apply_migrations()
+        return self
+
+    def __exit__(self, *exc):
+        if not self.keep:
+            self._admin(f"DROP DATABASE IF EXISTS {self.name}")
+
+    def apply_migrations(self):
+        """Apply reminder migrations with psql, the same way the README does"""
+        env = dict(
+            os.environ,
+            PGHOST=self.config["host"], PGPORT=str(self.config["port"]),
+            PGUSER=self.config["user"], PGPASSWORD=self.config["password"],
+            PGDATABASE=self.name
+        )
+        for path in sorted(glob(os.path.join(MIGRATIONS_DIR, REMINDER_MIGRATIONS))):
+            with open(path) as f:
+                script = f.read()
+            for index in SKIPPED_STATEMENTS.get(os.path.basename(path), ()):
+                script, found = re.subn(rf"CREATE INDEX {index}\b[^;]*;", "", script)
+                if not found:
+                    raise RuntimeError(f"{path}: expected statement for {index} not found")
+            result = subprocess.run(
+                ["psql", "-q", "-v", "ON_ERROR_STOP=1", "-f", "-"], input=script, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"Migration {os.path.basename(path)} failed:\n{result.stderr}")
+            if result.stderr.strip():
+                print(result.stderr.strip(), file=sys.stderr)
+
+
+def seed_reminders(conn, size: int, users: int = 50, active_every: int = 20):
+    """
+    Replace aria_reminders with a deterministic data set.
+
+    Args:
+        conn: Connection to the scratch database
+        size: Total rows
+        users: Number of distinct users ('damon' is user 0)
+        active_every: One in N rows is active; the rest are completed history
+    """
+    with conn.cursor() as cur:
+        cur.execute("TRUNCATE aria_reminders")
+        # Don't queue a NOTIFY per seeded row
+        cur.execute("ALTER TABLE aria_reminders DISABLE TRIGGER aria_reminders_notify")
+        cur.execute("""
+            INSERT INTO aria_reminders (
+                user_id, reminder_text, remind_at, completed, completed_at,
+                recurrence, priority, category
+            )
+            SELECT
+                CASE WHEN g %% %(users)s = 0 THEN 'damon' ELSE 'user_' || (g %% %(users)s) END,
+                'Benchmark reminder ' || g,
+                NOW() + ((g %% 4320) - 1440) * INTERVAL '1 minute',
+                g %% %(active)s <> 0,
+                CASE WHEN g %% %(active)s <> 0 THEN NOW() - (g %% 2000) * INTERVAL '1 hour' END,
+                (ARRAY[NULL, NULL, NULL, 'daily', 'weekly', 'monthly'])[1 + g %% 6],
+                (ARRAY['low', 'normal', 'normal', 'high', 'urgent'])[1 + g %% 5],
+                (ARRAY['work', 'health', 'home', NULL])[1 + g %% 4]
+            FROM generate_series(1, %(size)s) g
+        """, {"size": size, "users": users, "active": active_every})
+        cur.execute("ALTER TABLE aria_reminders ENABLE TRIGGER aria_reminders_notify")
+        cur.execute("ANALYZE aria_reminders")
+    conn.commit()
+
+
+def time_call(fn: Callable[[], Any], iterations: int, warmup: int = 3) -> Dict[str, float]:
+    """
+    Time repeated calls of fn.
+
+    Returns:
+        Dict with iterations, min/median/mean/p95/max in milliseconds and ops_per_sec
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+
+    samples.sort()
+    mean = statistics.fmean(samples)
+    return {
+        "iterations": iterations,
+        "min_ms": samples[0],
+        "median_ms": statistics.median(samples),
+        "mean_ms": mean,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max_ms": samples[-1],
+        "ops_per_sec": 1000.0 / mean if mean else 0.0
+    }
+
+
+def bench_time_context(iterations: int) -> List[Dict[str, Any]]:
+    """Benchmarks that don't touch the database"""
+    tc = TimeContext()
+    phrases = iter(PARSE_PHRASES * (iterations // len(PARSE_PHRASES) + 10))
+    return [
+        {"name": "parse_natural_time", "size": None,
+         **time_call(lambda: tc.parse_natural_time(next(phrases)), iterations)},
+        {"name": "get_system_prompt_block", "size": None,
+         **time_call(tc.get_system_prompt_block, iterations)},
+    ]
+
+
+def bench_reminders(manager: ReminderManager, size: int, iterations: int) -> List[Dict[str, Any]]:
+    """Benchmarks against a seeded aria_reminders table"""
+    results = []
+
+    def record(name: str, fn: Callable[[], Any], n: int = iterations):
+        results.append({"name": name, "size": size, **time_call(fn, n)})
+
+    record("set_reminder", lambda: manager.set_reminder(
+        "Benchmark insert", datetime.now(timezone.utc), priority="normal"))
+    record("get_upcoming_reminders", lambda: manager.get_upcoming_reminders(hours=24))
+    record("get_overdue_reminders", manager.get_overdue_reminders)
+    record("get_reminder_summary", manager.get_reminder_summary)
+    record("get_proactive_message", manager.get_proactive_message)
+
+    # Each completion needs its own active recurring reminder
+    warmup = 3
+    created = manager.set_reminders_bulk([
+        {"text": "Benchmark recurring", "remind_at": datetime.now(timezone.utc), "recurrence": "daily"}
+        for _ in range(iterations + warmup)
+    ])
+    ids = iter([r["reminder"].id for r in created])
+    results.append({"name": "complete_reminder_recurring", "size": size,
+                    **time_call(lambda: manager.complete_reminder(next(ids)), iterations, warmup)})
+
+    return results
+
+
+def bench_statements(manager: ReminderManager, size: int, iterations: int) -> List[Dict[str, Any]]:
+    """Current statements and SQL definitions against their predecessors"""
+    results = []
+    read_params = {
+        "upcoming": ("damon", 24),
+        "overdue": ("damon",),
+        "summary": ("damon",),
+        "snapshot": ("damon", 2),
+    }
+
+    with manager._get_connection() as conn:
+        with conn.cursor() as cur:
+            def record(name: str, sql_or_fn, params=()):
+                if callable(sql_or_fn):
+                    fn = sql_or_fn
+                else:
+                    def fn():
+                        cur.execute(sql_or_fn, params)
+                        cur.fetchall()
+                results.append({"name": name, "size": size, **time_call(fn, iterations)})
+
+            for key, params in read_params.items():
+                statement = STATEMENTS[key]
+                record(f"statement_{key}_text",
+                       lambda: (statement.execute_unprepared(cur, params), cur.fetchall()))
+                record(f"statement_{key}_prepared",
+                       lambda: (statement.execute(cur, params), cur.fetchall()))
+
+            record("function_upcoming_plpgsql",
+                   "SELECT * FROM bench_upcoming_reminders_plpgsql(%s, %s)", ("damon", 24))
+            record("function_upcoming_sql",
+                   "SELECT * FROM get_upcoming_reminders(%s, %s)", ("damon", 24))
+            record("function_overdue_plpgsql",
+                   "SELECT * FROM bench_overdue_reminders_plpgsql(%s)", ("damon",))
+            record("function_overdue_sql",
+                   "SELECT * FROM get_overdue_reminders(%s)", ("damon",))
+
+            # Summary: full-scan view vs trigger-maintained counts + index ranges
+            record("summary_view_scan",
+                   "SELECT * FROM bench_reminder_summary_scan WHERE user_id = %s", ("damon",))
+            record("summary_counts",
+                   "SELECT * FROM aria_reminder_summary WHERE user_id = %s", ("damon",))
+
+    return results
+
+
+def run(sizes: List[int], iterations: int, keep: bool = False) -> Dict[str, Any]:
+    """Run the full suite and return the JSON-serializable report"""
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "sizes": sizes,
+            "iterations": iterations
+        },
+        "results": bench_time_context(iterations * 10)
+    }
+
+    with ScratchDatabase(_admin_config(), keep=keep) as db:
+        manager = ReminderManager(db.config)
+        with manager._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SHOW server_version")
+                report["meta"]["postgres"] = cur.fetchone()[0]
+                cur.execute(LEGACY_SQL)
+
+        for size in sizes:
+            conn = _connect(db.config)
+            try:
+                seed_reminders(conn, size)
+            finally:
+                conn.close()
+            print(f"Seeded {size} reminders", file=sys.stderr)
+            report["results"].extend(bench_reminders(manager, size, iterations))
+            report["results"].extend(bench_statements(manager, size, iterations))
+
+        report["meta"]["pool"] = manager.get_pool_metrics()
+        manager.pool.close()
+
+    return report
+
+
+def compare(before: Dict[str, Any], after: Dict[str, Any]) -> List[str]:
+    """Render a median-latency comparison of two reports"""
+    base = {(r["name"], r["size"]): r for r in before["results"]}
+    lines = [f"{'benchmark':<32} {'size':>9} {'before ms':>11} {'after ms':>11} {'change':>8}"]
+    for r in after["results"]:
+        old = base.get((r["name"], r["size"]))
+        if old is None:
+            continue
+        change = (r["median_ms"] - old["median_ms"]) / old["median_ms"] * 100 if old["median_ms"] else 0.0
+        lines.append(
+            f"{r['name']:<32} {str(r['size'] or '-'):>9} "
+            f"{old['median_ms']:>11.3f} {r['median_ms']:>11.3f} {change:>+7.1f}%"
+        )
+    return lines
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ARIA reminder benchmarks")
+    parser.add_argument("--sizes", default="1000,100000,1000000",
+                        help="Comma-separated aria_reminders row counts")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="Compare two result files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f_before, open(args.compare[1]) as f_after:
+            print("\n".join(compare(json.load(f_before), json.load(f_after))))
+        sys.exit(0)
+
+    report = run([int(s) for s in args.sizes.split(",")], args.iterations, args.keep)
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Reminder Conformance Module for ARIA
+Checks that ReminderManager and AsyncReminderManager return identical results
+
+Runs the same scenario through both managers against a scratch database
+(see reminder_benchmark.ScratchDatabase) and reports every mismatch:
+
+    python reminder_conformance.py
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Tuple
+
+from reminders import ReminderManager, Reminder
+from reminders_async import AsyncReminderManager
+from reminder_benchmark import ScratchDatabase, _admin_config
+
+# Keys that legitimately differ between twin rows (or between the two calls)
+TWIN_KEYS = ("id", "reminder_id", "next_reminder_id", "created_at", "as_of")
+
+
+def normalize(value: Any, drop_ids: bool = False) -> Any:
+    """
+    Make results comparable across drivers and across the few milliseconds
+    between the two calls.
+
+    Intervals are rounded to the minute; ids are dropped when the two sides
+    operate on twin rows rather than the same row.
+    """
+    if isinstance(value, Reminder):
+        value = value.to_dict()
+    if isinstance(value, dict):
+        skip = TWIN_KEYS if drop_ids else ("as_of",)
+        return {k: normalize(v, drop_ids) for k, v in sorted(value.items()) if k not in skip}
+    if isinstance(value, (list, tuple)):
+        return [normalize(v, drop_ids) for v in value]
+    if isinstance(value, timedelta):
+        return round(value.total_seconds() / 60)
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat()
+    return value
+
+
+class Conformance:
+    """Runs paired sync/async calls and collects mismatches"""
+
+    def __init__(self, sync: ReminderManager, aio: AsyncReminderManager):
+        self.sync = sync
+        self.aio = aio
+        self.checks = 0
+        self.failures: List[Tuple[str, Any, Any]] = []
+
+    async def same(self, name: str, sync_call: Callable, async_call: Callable, drop_ids: bool = False):
+        """Compare one sync call with its async counterpart"""
+        self.checks += 1
+        expected = normalize(sync_call(), drop_ids)
+        actual = normalize(await async_call(), drop_ids)
+        if expected != actual:
+            self.failures.append((name, expected, actual))
+
+    def twins(self, **fields) -> Tuple[str, str]:
+        """Create two identical reminders, one for each side to modify"""
+        created = self.sync.set_reminders_bulk([dict(fields), dict(fields)])
+        return created[0]["reminder"].id, created[1]["reminder"].id
+
+
+async def run_scenario(c: Conformance):
+    s, a = c.sync, c.aio
+    now = datetime.now(timezone.utc)
+
+    s.set_reminders_bulk([
+        {"text": "Overdue one", "remind_at": now - timedelta(hours=3), "priority": "high"},
+        {"text": "Overdue two", "remind_at": now - timedelta(minutes=20), "category": "work"},
+        {"text": "Soon", "remind_at": now + timedelta(minutes=45)},
+        {"text": "Later today", "remind_at": now + timedelta(hours=6), "recurrence": "daily"},
+        {"text": "Next week", "remind_at": now + timedelta(days=7), "recurrence": "weekly"},
+        {"text": "Other user", "remind_at": now + timedelta(hours=1), "user_id": "alex"},
+    ])
+
+    # Reads on shared state
+    for user_id in ("damon", "alex", "nobody"):
+        await c.same(f"upcoming[{user_id}]", lambda: s.get_upcoming_reminders(24, user_id),
+                     lambda: a.get_upcoming_reminders(24, user_id))
+        await c.same(f"overdue[{user_id}]", lambda: s.get_overdue_reminders(user_id),
+                     lambda: a.get_overdue_reminders(user_id))
+        await c.same(f"summary[{user_id}]", lambda: s.get_reminder_summary(user_id),
+                     lambda: a.get_reminder_summary(user_id))
+        await c.same(f"snapshot[{user_id}]", lambda: s.get_reminder_snapshot(user_id),
+                     lambda: a.get_reminder_snapshot(user_id))
+        await c.same(f"proactive[{user_id}]", lambda: s.get_proactive_message(user_id),
+                     lambda: a.get_proactive_message(user_id))
+        await c.same(f"history[{user_id}]", lambda: s.get_reminder_history(user_id),
+                     lambda: a.get_reminder_history(user_id))
+
+    # Writes on twin rows
+    await c.same("set_reminder",
+                 lambda: s.set_reminder("Created", now + timedelta(hours=2), priority="urgent"),
+                 lambda: a.set_reminder("Created", now + timedelta(hours=2), priority="urgent"),
+                 drop_ids=True)
+
+    x, y = c.twins(text="Recurring", remind_at=now, recurrence="monthly")
+    await c.same("complete_reminder", lambda: s.complete_reminder(x),
+                 lambda: a.complete_reminder(y), drop_ids=True)
+    await c.same("complete_reminder[again]", lambda: s.complete_reminder(x),
+                 lambda: a.complete_reminder(y), drop_ids=True)
+
+    x, y = c.twins(text="Snooze me", remind_at=now)
+    await c.same("snooze_reminder", lambda: s.snooze_reminder(x, 15),
+                 lambda: a.snooze_reminder(y, 15))
+    await c.same("delete_reminder", lambda: s.delete_reminder(x),
+                 lambda: a.delete_reminder(y))
+
+    bulk = [{"text": "Bulk", "remind_at": now + timedelta(hours=1)},
+            {"text": "", "remind_at": now},
+            {"text": "Bad time", "remind_at": "someday maybe"}]
+    await c.same("set_reminders_bulk", lambda: s.set_reminders_bulk(bulk),
+                 lambda: a.set_reminders_bulk(bulk), drop_ids=True)
+
+    pairs = [c.twins(text=f"Bulk {i}", remind_at=now, recurrence=r)
+             for i, r in enumerate([None, "daily", "yearly"])]
+    xs, ys = [p[0] for p in pairs], [p[1] for p in pairs]
+    await c.same("complete_reminders", lambda: s.complete_reminders(xs),
+                 lambda: a.complete_reminders(ys), drop_ids=True)
+    await c.same("snooze_reminders", lambda: s.snooze_reminders(xs, 10),
+                 lambda: a.snooze_reminders(ys, 10), drop_ids=True)
+    await c.same("delete_reminders", lambda: s.delete_reminders(xs),
+                 lambda: a.delete_reminders(ys), drop_ids=True)
+
+
+async def main() -> int:
+    with ScratchDatabase(_admin_config()) as db:
+        sync = ReminderManager(db.config)
+        async with AsyncReminderManager(db.config) as aio:
+            c = Conformance(sync, aio)
+            await run_scenario(c)
+        sync.pool.close()
+
+    for name, expected, actual in c.failures:
+        print(f"MISMATCH {name}\n  sync:  {expected}\n  async: {actual}")
+    print(f"{c.checks - len(c.failures)}/{c.checks} checks matched")
+    return 1 if c.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Reminder Dispatcher Module for ARIA
+Long-running daemon that fires reminders at their due time
+
+Active reminders are kept in an in-memory min-heap keyed on
+COALESCE(snoozed_until, remind_at). The heap is kept current through the
+aria_reminders NOTIFY channel (007_aria_reminder_notify.sql), so the table
+is only scanned at startup, after a reconnect, and on the periodic resync.
+"""
+
+import heapq
+import json
+import logging
+import os
+import queue
+import select
+import socket
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone, timedelta
+from typing import Optional, List, Dict, Any
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import RealDictCursor
+
+from reminders import ReminderManager, shared_managers
+from db_pool import PoolTimeout
+
+logger = logging.getLogger("aria.reminder_dispatcher")
+
+CHANNEL = "aria_reminders"
+
+
+class ReminderSink:
+    """Destination for due reminders"""
+
+    def send(self, reminder: Dict[str, Any]):
+        raise NotImplementedError
+
+
+class StdoutSink(ReminderSink):
+    """Print due reminders as JSON lines"""
+
+    def send(self, reminder: Dict[str, Any]):
+        print(json.dumps(reminder, default=str), flush=True)
+
+
+class WebhookSink(ReminderSink):
+    """POST due reminders as JSON to a webhook (e.g. an n8n webhook node)"""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, reminder: Dict[str, Any]):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(reminder, default=str).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class QueueSink(ReminderSink):
+    """Put due reminders on a queue.Queue for in-process consumers"""
+
+    def __init__(self, q: Optional[queue.Queue] = None):
+        self.queue = q if q is not None else queue.Queue()
+
+    def send(self, reminder: Dict[str, Any]):
+        self.queue.put(reminder)
+
+
+class ReminderDispatcher:
+    """Fires reminders to a sink when they become due"""
+
+    def __init__(
+        self,
+        manager: ReminderManager,
+        sink: ReminderSink,
+        user_id: Optional[str] = None,
+        catch_up: float = 300.0,
+        resync_interval: float = 3600.0,
+        heartbeat_interval: float = 15.0,
+        sink_workers: int = 4
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            manager: ReminderManager used for database access
+            sink: Where due reminders are sent
+            user_id: Only dispatch this user's reminders (None = all users)
+            catch_up: Seconds in the past a reminder may be due and still fire
+                      at startup; older overdue reminders are left to the
+                      proactive message
+            resync_interval: Seconds between full reloads, as a safety net for
+                             missed notifications
+            heartbeat_interval: Seconds between aria_dispatcher_heartbeat
+                                updates (0 disables them)
+            sink_workers: Threads calling sink.send, so a slow sink never
+                          delays the timer loop
+        """
+        self.manager = manager
+        self.sink = sink
+        self.user_id = user_id
+        self.catch_up = timedelta(seconds=catch_up)
+        self.resync_interval = resync_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.dispatcher_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._last_beat = 0.0
+
+        self._heap: List[tuple] = []
+        self._due: Dict[str, datetime] = {}
+        self._fired: Dict[str, datetime] = {}
+        # Popped but not fired because the re-check query failed; survives
+        # the reload after reconnecting even if older than catch_up
+        self._retry: Dict[str, datetime] = {}
+        self._seq = 0
+        self._listener = None
+        self._stop = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+        self.sink_workers = sink_workers
+        self._outgoing: queue.Queue = queue.Queue()
+        self._senders: List[threading.Thread] = []
+
+        self.stats = {
+            "scheduled": 0,
+            "fired": 0,
+            "sink_errors": 0,
+            "notifications": 0,
+            "reloads": 0,
+            "last_lag": 0.0,
+            "max_lag": 0.0
+        }
+
+    # Heap maintenance
+
+    def _schedule(self, reminder_id: str, due_at: datetime):
+        """Add or move a reminder in the timer heap"""
+        if self._fired.get(reminder_id) == due_at:
+            return
+        self._due[reminder_id] = due_at
+        self._seq += 1
+        heapq.heappush(self._heap, (due_at, self._seq, reminder_id))
+
+    def _unschedule(self, reminder_id: str):
+        """Remove a reminder; its stale heap entry is skipped when popped"""
+        self._due.pop(reminder_id, None)
+
+    def _compact(self):
+        """Rebuild the heap once stale entries dominate it"""
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._heap = [e for e in self._heap if self._due.get(e[2]) == e[0]]
+            heapq.heapify(self._heap)
+
+    def load(self):
+        """Load all active reminders into the heap"""
+        query = """
+            SELECT id, COALESCE(snoozed_until, remind_at) AS due_at
+            FROM aria_reminders
+            WHERE NOT completed
+        """
+        params: tuple = ()
+        if self.user_id is not None:
+            query += " AND user_id = %s"
+            params = (self.user_id,)
+
+        with self.manager._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                rows = cur.fetchall()
+
+        cutoff = datetime.now(timezone.utc) - self.catch_up
+        self._heap = []
+        self._due = {}
+        for reminder_id, due_at in rows:
+            reminder_id = str(reminder_id)
+            if due_at >= cutoff or self._retry.get(reminder_id) == due_at:
+                self._schedule(reminder_id, due_at)
+        self._retry = {}
+        self._fired = {rid: due for rid, due in self._fired.items() if due >= cutoff}
+
+        self.stats["reloads"] += 1
+        self.stats["scheduled"] = len(self._due)
+        logger.info("Loaded %d active reminders", len(self._due))
+
+    # Notifications
+
+    def _connect_listener(self):
+        """Open the dedicated LISTEN connection"""
+        cfg = self.manager.db_config
+        conn = psycopg2.connect(
+            host=cfg["host"],
+            port=cfg["port"],
+            user=cfg["user"],
+            password=cfg["password"],
+            database=cfg["database"]
+        )
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {CHANNEL}")
+        self._listener = conn
+
+    def _handle_notification(self, payload: str):
+        """Apply one aria_reminders change notification to the heap"""
+        self.stats["notifications"] += 1
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed notification: %r", payload)
+            return
+
+        try:
+            reminder_id = event["id"]
+            if self.user_id is not None and event.get("user_id") != self.user_id:
+                return
+
+            if event["op"] == "DELETE" or event.get("completed"):
+                self._unschedule(reminder_id)
+                self._fired.pop(reminder_id, None)
+            else:
+                due_at = datetime.fromisoformat(event["due_at"])
+                # Same cutoff as load(): _fired only remembers the catch-up
+                # window, so an edit to a long-overdue reminder must not
+                # fire it again. An entry already scheduled for retry stays.
+                if due_at >= datetime.now(timezone.utc) - self.catch_up:
+                    self._schedule(reminder_id, due_at)
+                elif self._due.get(reminder_id) != due_at:
+                    self._unschedule(reminder_id)
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Ignoring malformed notification: %r", payload)
+            return
+        self.stats["scheduled"] = len(self._due)
+
+    def _drain_notifications(self):
+        """Read all pending notifications from the listener connection"""
+        self._listener.poll()
+        while self._listener.notifies:
+            notify = self._listener.notifies.pop(0)
+            self._handle_notification(notify.payload)
+        self._compact()
+
+    # Dispatching
+
+    def _pop_due(self, now: datetime) -> List[tuple]:
+        """Pop every live heap entry that is due at or before now"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, _, reminder_id = heapq.heappop(self._heap)
+            if self._due.get(reminder_id) != due_at:
+                continue  # stale entry (moved, completed or deleted)
+            del self._due[reminder_id]
+            due.append((reminder_id, due_at))
+        return due
+
+    def _fire(self, due: List[tuple]):
+        """
+        Re-check due reminders in one query and hand them to the senders.
+
+        If the query fails the reminders are put back on the heap (and kept
+        through the reload that follows a reconnect) before re-raising.
+        """
+        ids = [reminder_id for reminder_id, _ in due]
+        try:
+            with self.manager._get_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute("""
+                        SELECT id, user_id, reminder_text, remind_at, snoozed_until,
+                               priority, category, recurrence, metadata,
+                               COALESCE(snoozed_until, remind_at) AS due_at
+                        FROM aria_reminders
+                        WHERE id = ANY(%s::uuid[]) AND NOT completed
+                    """, (ids,))
+                    rows = {str(row['id']): dict(row) for row in cur.fetchall()}
+        except (psycopg2.Error, PoolTimeout):
+            for reminder_id, due_at in due:
+                self._retry[reminder_id] = due_at
+                self._schedule(reminder_id, due_at)
+            raise
+
+        for reminder_id, due_at in due:
+            self._retry.pop(reminder_id, None)
+            row = rows.get(reminder_id)
+            if row is None or row['due_at'] != due_at:
+                continue  # completed or moved since it was scheduled
+
+            self._fired[reminder_id] = due_at
+            lag = (datetime.now(timezone.utc) - due_at).total_seconds()
+            self.stats["last_lag"] = lag
+            self.stats["max_lag"] = max(self.stats["max_lag"], lag)
+
+            row['id'] = reminder_id
+            row['fired_at'] = datetime.now(timezone.utc)
+            self._outgoing.put(row)
+
+        self.stats["scheduled"] = len(self._due)
+
+    def _send_loop(self):
+        """Sender thread: deliver queued reminders until a None sentinel"""
+        while True:
+            row = self._outgoing.get()
+            if row is None:
+                return
+            try:
+                self.sink.send(row)
+                self.stats["fired"] += 1
+            except Exception:
+                self.stats["sink_errors"] += 1
+                logger.exception("Sink failed for reminder %s", row['id'])
+
+    def _start_senders(self):
+        self._senders = [
+            threading.Thread(target=self._send_loop, name=f"aria-reminder-sender-{i}", daemon=True)
+            for i in range(max(1, self.sink_workers))
+        ]
+        for thread in self._senders:
+            thread.start()
+
+    def _stop_senders(self, timeout: float = 10.0):
+        """Let the senders deliver what is already queued, then stop them"""
+        for _ in self._senders:
+            self._outgoing.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in self._senders:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self._senders = []
+
+    # Heartbeat
+
+    def _heartbeat(self):
+        """Record liveness and lag in aria_dispatcher_heartbeat (013 migration)"""
+        self._last_beat = time.monotonic()
+        try:
+            with self.manager._get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "SELECT dispatcher_heartbeat(%s, %s, %s, %s, %s, %s)",
+                        (self.dispatcher_id, self.user_id, self.stats["scheduled"],
+                         self.stats["fired"], self.stats["last_lag"], self.stats["max_lag"])
+                    )
+        except (psycopg2.Error, PoolTimeout) as e:
+            # Monitoring only; never let it stop dispatching
+            logger.warning("Heartbeat failed: %s", e)
+
+    def _next_timeout(self, last_load: float) -> float:
+        """Seconds until the next due reminder, resync or heartbeat"""
+        timeout = max(0.0, self.resync_interval - (time.monotonic() - last_load))
+        if self.heartbeat_interval:
+            timeout = min(timeout, max(0.0, self.heartbeat_interval
+                                       - (time.monotonic() - self._last_beat)))
+        if self._heap:
+            until_due = (self._heap[0][0] - datetime.now(timezone.utc)).total_seconds()
+            timeout = min(timeout, max(0.0, until_due))
+        return timeout
+
+    def run(self):
+        """Run until stop() is called"""
+        self._start_senders()
+        try:
+            self._run()
+        finally:
+            self._stop_senders()
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                self._connect_listener()
+                # Load after LISTEN so no change between the two is missed
+                self.load()
+                last_load = time.monotonic()
+                backoff = 1.0
+
+                while not self._stop.is_set():
+                    timeout = self._next_timeout(last_load)
+                    readable, _, _ = select.select([self._listener, self._wake_r], [], [], timeout)
+
+                    if self._wake_r in readable:
+                        os.read(self._wake_r, 1024)
+                    if self._listener in readable:
+                        self._drain_notifications()
+
+                    due = self._pop_due(datetime.now(timezone.utc))
+                    if due:
+                        self._fire(due)
+
+                    if time.monotonic() - last_load >= self.resync_interval:
+                        self.load()
+                        last_load = time.monotonic()
+
+                    if (self.heartbeat_interval
+                            and time.monotonic() - self._last_beat >= self.heartbeat_interval):
+                        self._heartbeat()
+
+            except (psycopg2.Error, PoolTimeout):
+                logger.exception("Database error, reconnecting in %.0fs", backoff)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+            finally:
+                if self._listener is not None:
+                    try:
+                        self._listener.close()
+                    except psycopg2.Error:
+                        pass
+                    self._listener = None
+
+    def stop(self):
+        """Ask run() to exit"""
+        self._stop.set()
+        os.write(self._wake_w, b"x")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ARIA reminder dispatcher")
+    parser.add_argument("--webhook", help="POST due reminders to this URL instead of stdout")
+    parser.add_argument("--user", help="Only dispatch reminders for this user")
+    parser.add_argument("--catch-up", type=float, default=300.0,
+                        help="Fire reminders overdue by at most this many seconds at startup")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr,
+                        format="%(asctime)s %(levelname)s %(message)s")
+
+    sink = WebhookSink(args.webhook) if args.webhook else StdoutSink()
+    dispatcher = ReminderDispatcher(shared_managers.get(), sink,
+                                    user_id=args.user, catch_up=args.catch_up)
+    try:
+        dispatcher.run()
+    except KeyboardInterrupt:
+        dispatcher.stop()
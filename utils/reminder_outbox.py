@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Reminder Outbox Module for ARIA
+Durable local write queue for reminders while Postgres is slow or down
+
+Writes go to a SQLite file (WAL, synchronous=FULL) and return immediately.
+A background thread flushes them to aria_reminders in batches through
+ReminderManager.set_reminders_bulk / complete_reminders. Reminder ids are
+generated client-side, so the id handed back at enqueue time is the final
+id and doubles as the idempotency key: replaying an insert hits
+ON CONFLICT (id) DO NOTHING, replaying a completion reports
+"already completed". An entry is removed from the outbox only after the
+database has accepted it, so a crash at any point loses nothing. A batch
+the database rejects is split until the offending entries are found; those
+are parked as 'failed' and the rest flush normally; requeue() sends parked
+entries again once the cause is fixed.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+import psycopg2
+
+from reminders import ReminderManager, Reminder, RECURRENCES, PRIORITIES
+from db_pool import PoolTimeout
+
+logger = logging.getLogger("aria.reminder_outbox")
+
+DEFAULT_PATH = os.environ.get(
+    "ARIA_OUTBOX_PATH", os.path.expanduser("~/.aria/reminder_outbox.sqlite3")
+)
+
+# Errors that mean "database unavailable, try again later"
+TRANSIENT_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError, PoolTimeout)
+
+# Errors that mean "the database rejected something in this batch"; retrying
+# the same batch would fail again, so it is split to find the bad entries.
+# ProgrammingError is left out: a missing migration or permission affects
+# every entry and is fixed on the server, so entries stay pending.
+REJECTED_ERRORS = (psycopg2.DataError, psycopg2.IntegrityError)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,               -- 'insert' or 'complete'
+    reminder_id TEXT NOT NULL,
+    payload TEXT NOT NULL,          -- JSON
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',  -- 'pending' or 'failed'
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox (status, seq);
+"""
+
+
+class ReminderOutbox:
+    """Accepts reminder writes locally and flushes them to Postgres"""
+
+    def __init__(
+        self,
+        manager: ReminderManager,
+        path: str = DEFAULT_PATH,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_backoff: float = 60.0
+    ):
+        """
+        Initialize outbox.
+
+        Args:
+            manager: ReminderManager used to flush to the database
+            path: SQLite file holding queued writes
+            batch_size: Maximum entries per flush round trip
+            flush_interval: Seconds between background flushes when idle
+            max_backoff: Upper bound on the retry delay while the database is down
+        """
+        self.manager = manager
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backoff = max_backoff
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._backoff = 0.0
+
+        self.stats = {
+            "enqueued": 0,
+            "flushed": 0,
+            "failed": 0,
+            "flush_errors": 0,
+            "last_flush_at": None,
+            "last_error": None
+        }
+
+    # Enqueue
+
+    def _enqueue(self, op: str, reminder_id: str, payload: Dict[str, Any]):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO outbox (op, reminder_id, payload, created_at) VALUES (?, ?, ?, ?)",
+                (op, reminder_id, json.dumps(payload), time.time())
+            )
+        self.stats["enqueued"] += 1
+        self._wake.set()
+
+    def set_reminder(
+        self,
+        text: str,
+        remind_at: datetime | str,
+        recurrence: Optional[str] = None,
+        priority: str = "normal",
+        category: Optional[str] = None,
+        user_id: str = "damon"
+    ) -> Reminder:
+        """
+        Queue a new reminder.
+
+        Validation happens here, so a queued reminder is one the database
+        will accept. The returned Reminder has its final id but no
+        created_at until it has been flushed.
+
+        Raises:
+            ValueError: If the time can't be parsed or a field is invalid
+        """
+        if isinstance(remind_at, str):
+            parsed = self.manager.time_context.parse_natural_time(remind_at)
+            if parsed is None:
+                raise ValueError(f"Could not parse time: {remind_at}")
+            remind_at = parsed
+        if not text:
+            raise ValueError("Missing reminder text")
+        if recurrence is not None and recurrence not in RECURRENCES:
+            raise ValueError(f"Invalid recurrence: {recurrence}")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Invalid priority: {priority}")
+
+        reminder_id = str(uuid.uuid4())
+        self._enqueue("insert", reminder_id, {
+            "id": reminder_id,
+            "text": text,
+            "remind_at": remind_at.isoformat(),
+            "recurrence": recurrence,
+            "priority": priority,
+            "category": category,
+            "user_id": user_id
+        })
+        return Reminder(
+            id=reminder_id, user_id=user_id, reminder_text=text, remind_at=remind_at,
+            recurrence=recurrence, priority=priority, category=category
+        )
+
+    def complete_reminder(self, reminder_id: str) -> Dict[str, Any]:
+        """
+        Queue completion of a reminder.
+
+        Returns:
+            Result dict with success, message and queued=True; the next
+            occurrence of a recurring reminder is created at flush time
+
+        Raises:
+            ValueError: If reminder_id is not a UUID
+        """
+        try:
+            reminder_id = str(uuid.UUID(str(reminder_id)))
+        except ValueError:
+            raise ValueError(f"Invalid reminder id: {reminder_id}") from None
+        self._enqueue("complete", reminder_id, {})
+        return {"success": True, "message": "Completion queued", "queued": True,
+                "next_reminder_id": None}
+
+    # Flushing
+
+    def _pending(self, limit: int) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT seq, op, reminder_id, payload FROM outbox "
+                "WHERE status = 'pending' ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+
+    def _finish(self, done: List[int], failed: Dict[int, str]):
+        """Remove flushed entries and park rejected ones"""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany("DELETE FROM outbox WHERE seq = ?", [(s,) for s in done])
+                self._db.executemany(
+                    "UPDATE outbox SET status = 'failed', attempts = attempts + 1, last_error = ? "
+                    "WHERE seq = ?", [(error, s) for s, error in failed.items()]
+                )
+                self._db.execute("COMMIT")
+            except sqlite3.Error:
+                self._db.execute("ROLLBACK")
+                raise
+        self.stats["flushed"] += len(done)
+        self.stats["failed"] += len(failed)
+
+    def _send(self, entries: List[tuple], done: List[int], failed: Dict[int, str]):
+        """
+        Send entries to the database, sorting them into done and failed.
+
+        Inserts go before completions: a completion can only refer to a
+        reminder queued earlier, and an insert never depends on a completion.
+        """
+        inserts = []
+        for seq, op, _, payload in entries:
+            if op == "insert":
+                item = json.loads(payload)
+                item["remind_at"] = datetime.fromisoformat(item["remind_at"])
+                inserts.append((seq, item))
+        completes = [(seq, rid) for seq, op, rid, _ in entries if op == "complete"]
+
+        if inserts:
+            results = self.manager.set_reminders_bulk([payload for _, payload in inserts])
+            for (seq, _), result in zip(inserts, results):
+                # "already exists" means an earlier flush committed it
+                if result["success"] or result["message"] == "Reminder already exists":
+                    done.append(seq)
+                else:
+                    failed[seq] = result["message"]
+
+        if completes:
+            results = self.manager.complete_reminders([rid for _, rid in completes])
+            for (seq, _), result in zip(completes, results):
+                if result["success"] or result["message"] == "Reminder already completed":
+                    done.append(seq)
+                else:
+                    failed[seq] = result["message"]
+
+    def _send_bisecting(self, entries: List[tuple], done: List[int], failed: Dict[int, str]):
+        """
+        Send entries; if the database rejects the batch, split it until
+        the entries it rejects are isolated and park those as failed.
+
+        Halves that did commit before a later half failed are replayed
+        safely, since inserts and completions are idempotent.
+        """
+        try:
+            self._send(entries, done, failed)
+        except REJECTED_ERRORS as e:
+            if len(entries) == 1:
+                failed[entries[0][0]] = str(e).strip()
+                return
+            middle = len(entries) // 2
+            self._send_bisecting(entries[:middle], done, failed)
+            self._send_bisecting(entries[middle:], done, failed)
+
+    def _flush_batch(self, entries: List[tuple]):
+        """Send one batch to the database and record the outcome"""
+        done: List[int] = []
+        failed: Dict[int, str] = {}
+        self._send_bisecting(entries, done, failed)
+
+        # done may repeat a seq replayed during bisection
+        self._finish([seq for seq in dict.fromkeys(done) if seq not in failed], failed)
+        for seq, error in failed.items():
+            logger.warning("Outbox entry %d rejected: %s", seq, error)
+
+    def flush(self) -> int:
+        """
+        Flush everything queued so far.
+
+        Returns:
+            Number of entries written to the database
+
+        Raises:
+            The underlying error if the database is unavailable; unflushed
+            entries stay queued
+        """
+        flushed = 0
+        with self._flush_lock:
+            while True:
+                entries = self._pending(self.batch_size)
+                if not entries:
+                    break
+                before = self.stats["flushed"] + self.stats["failed"]
+                self._flush_batch(entries)
+                flushed += self.stats["flushed"] + self.stats["failed"] - before
+                if len(entries) < self.batch_size:
+                    break
+        self.stats["last_flush_at"] = time.time()
+        return flushed
+
+    def pending(self) -> int:
+        """Number of entries waiting to be flushed"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status = 'pending'"
+            ).fetchone()[0]
+
+    def get_failed(self) -> List[Dict[str, Any]]:
+        """Entries the database rejected, for inspection before requeue()"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, op, reminder_id, payload, created_at, last_error "
+                "FROM outbox WHERE status = 'failed' ORDER BY seq"
+            ).fetchall()
+        return [
+            {"seq": seq, "op": op, "reminder_id": rid, "payload": json.loads(payload),
+             "created_at": created_at, "error": error}
+            for seq, op, rid, payload, created_at, error in rows
+        ]
+
+    def requeue(self, *seqs: int) -> int:
+        """
+        Move failed entries back to pending so the next flush retries them.
+
+        Args:
+            seqs: Entries to requeue (see get_failed); all failed entries if none
+
+        Returns:
+            Number of entries requeued
+        """
+        query = "UPDATE outbox SET status = 'pending' WHERE status = 'failed'"
+        if seqs:
+            query += f" AND seq IN ({', '.join('?' * len(seqs))})"
+        with self._lock:
+            count = self._db.execute(query, seqs).rowcount
+        if count:
+            self._wake.set()
+        return count
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get outbox counters, queue depth and age of the oldest pending entry"""
+        with self._lock:
+            depth, oldest = self._db.execute(
+                "SELECT COUNT(*), MIN(created_at) FROM outbox WHERE status = 'pending'"
+            ).fetchone()
+        return dict(
+            self.stats,
+            pending=depth,
+            oldest_pending_age=(time.time() - oldest) if oldest else 0.0,
+            backoff=self._backoff
+        )
+
+    # Background flusher
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self._backoff or self.flush_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.flush()
+                self._backoff = 0.0
+            except TRANSIENT_ERRORS as e:
+                self.stats["flush_errors"] += 1
+                self.stats["last_error"] = str(e)
+                self._backoff = min(max(self._backoff * 2, 1.0), self.max_backoff)
+                logger.warning("Database unavailable, retrying in %.0fs: %s", self._backoff, e)
+                # Don't let new writes cut the backoff short
+                self._stop.wait(self._backoff)
+            except Exception as e:
+                self.stats["flush_errors"] += 1
+                self.stats["last_error"] = str(e)
+                logger.exception("Outbox flush failed")
+
+    def start(self) -> "ReminderOutbox":
+        """Start the background flusher"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="aria-reminder-outbox",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, flush: bool = True, timeout: float = 10.0):
+        """
+        Stop the background flusher.
+
+        Args:
+            flush: Try a final flush; entries that can't be written stay queued
+            timeout: Seconds to wait for the flusher thread
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if flush:
+            try:
+                self.flush()
+            except TRANSIENT_ERRORS as e:
+                logger.warning("Final flush skipped, %d entries remain queued: %s",
+                               self.pending(), e)
+
+    def close(self):
+        """Stop flushing and close the SQLite file"""
+        self.stop()
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "ReminderOutbox":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    import sys
+    from reminders import shared_managers
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr,
+                        format="%(asctime)s %(levelname)s %(message)s")
+
+    outbox = ReminderOutbox(shared_managers.get())
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+
+    if command == "flush":
+        print(f"Flushed {outbox.flush()} entries, {outbox.pending()} pending")
+    elif command == "failed":
+        print(json.dumps(outbox.get_failed(), indent=2, default=str))
+    elif command == "requeue":
+        print(f"Requeued {outbox.requeue(*map(int, sys.argv[2:]))} entries")
+    else:
+        print(json.dumps(outbox.get_metrics(), indent=2, default=str))
@@ -6,13 +6,18 @@ CRUD operations for the aria_reminders table
 
 import os
 import json
+import heapq
+import threading
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, Iterator, List, Dict, Any
 from dataclasses import dataclass, asdict
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 
-from time_context import TimeContext
+from time_context import TimeContext, registry as time_contexts
+from db_pool import ConnectionPool, get_pool
+from db_statements import Statement
+from recurrence import occurrences
 
 
 @dataclass
@@ -43,21 +48,83 @@ class Reminder:
         return d
 
 
+RECURRENCES = ("daily", "weekly", "monthly", "yearly")
+PRIORITIES = ("low", "normal", "high", "urgent")
+
+EMPTY_SUMMARY = {
+    "overdue_count": 0,
+    "upcoming_soon": 0,
+    "upcoming_today": 0,
+    "total_active": 0,
+    "completed_this_week": 0
+}
+
+# Columns read by _row_to_reminder
+REMINDER_COLUMNS = (
+    "id, user_id, reminder_text, remind_at, created_at, completed, completed_at, "
+    "snoozed_until, snooze_count, recurrence, recurrence_end_date, priority, "
+    "category, metadata, source"
+)
+
+# Hot single-reminder statements, prepared once per pooled connection.
+# Column lists are explicit so a prepared statement's result type does not
+# change when a column is added to the table or view behind it.
+STATEMENTS = {
+    "insert": Statement("aria_insert_reminder", f"""
+        INSERT INTO aria_reminders (
+            user_id, reminder_text, remind_at, recurrence, priority, category
+        ) VALUES ($1, $2, $3, $4, $5, $6)
+        RETURNING {REMINDER_COLUMNS}
+    """, ("text", "text", "timestamptz", "text", "text", "text")),
+    "upcoming": Statement("aria_upcoming_reminders", """
+        SELECT id, reminder_text, remind_at, priority, category, time_until
+        FROM get_upcoming_reminders($1, $2)
+    """, ("text", "integer")),
+    "overdue": Statement("aria_overdue_reminders", """
+        SELECT id, reminder_text, remind_at, priority, category, overdue_by
+        FROM get_overdue_reminders($1)
+    """, ("text",)),
+    "complete": Statement("aria_complete_reminder",
+                          "SELECT success, message, next_reminder_id FROM complete_reminder($1)",
+                          ("uuid",)),
+    "snooze": Statement("aria_snooze_reminder",
+                        "SELECT snooze_reminder($1, $2)", ("uuid", "integer")),
+    "delete": Statement("aria_delete_reminder",
+                        "DELETE FROM aria_reminders WHERE id = $1", ("uuid",)),
+    "summary": Statement("aria_reminder_summary_for", """
+        SELECT user_id, overdue_count, upcoming_soon, upcoming_today, total_active, completed_this_week
+        FROM aria_reminder_summary WHERE user_id = $1
+    """, ("text",)),
+    "snapshot": Statement("aria_reminder_snapshot",
+                          "SELECT as_of, overdue, upcoming, summary FROM get_reminder_snapshot($1, $2)",
+                          ("text", "integer")),
+}
+
+
 class ReminderManager:
     """Manages ARIA reminders"""
 
-    def __init__(self, db_config: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        db_config: Optional[Dict[str, str]] = None,
+        pool: Optional[ConnectionPool] = None,
+        timezone: str = "America/Los_Angeles"
+    ):
         """
         Initialize reminder manager.
 
         Args:
             db_config: Database configuration dict with host, port, user, password, database
                       If None, reads from environment or uses Docker defaults
+            pool: Connection pool to use. If None, uses the shared pool for db_config
+            timezone: Timezone used to parse natural language times
         """
         self.db_config = db_config or self._get_db_config()
-        self.time_context = TimeContext()
+        self.pool = pool or get_pool(self.db_config)
+        self.time_context = time_contexts.get(timezone)
 
-    def _get_db_config(self) -> Dict[str, str]:
+    @staticmethod
+    def _get_db_config() -> Dict[str, str]:
         """Get database configuration from environment or defaults"""
         return {
             "host": os.environ.get("POSTGRES_HOST", "localhost"),
@@ -68,14 +135,17 @@ class ReminderManager:
         }
 
     def _get_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(
-            host=self.db_config["host"],
-            port=self.db_config["port"],
-            user=self.db_config["user"],
-            password=self.db_config["password"],
-            database=self.db_config["database"]
-        )
+        """
+        Borrow a pooled database connection.
+
+        Use as a context manager; the connection is committed and returned
+        to the pool when the block exits.
+        """
+        return self.pool.connection()
+
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Get connection pool hit rate and wait time metrics"""
+        return self.pool.get_metrics()
 
     def set_reminder(
         self,
@@ -109,12 +179,9 @@ class ReminderManager:
 
         with self._get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    INSERT INTO aria_reminders (
-                        user_id, reminder_text, remind_at, recurrence, priority, category
-                    ) VALUES (%s, %s, %s, %s, %s, %s)
-                    RETURNING *
-                """, (user_id, text, remind_at, recurrence, priority, category))
+                STATEMENTS["insert"].execute(
+                    cur, (user_id, text, remind_at, recurrence, priority, category)
+                )
 
                 row = cur.fetchone()
                 conn.commit()
@@ -138,9 +205,7 @@ class ReminderManager:
         """
         with self._get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT * FROM get_upcoming_reminders(%s, %s)
-                """, (user_id, hours))
+                STATEMENTS["upcoming"].execute(cur, (user_id, hours))
 
                 rows = cur.fetchall()
                 return [dict(row) for row in rows]
@@ -157,9 +222,7 @@ class ReminderManager:
         """
         with self._get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT * FROM get_overdue_reminders(%s)
-                """, (user_id,))
+                STATEMENTS["overdue"].execute(cur, (user_id,))
 
                 rows = cur.fetchall()
                 return [dict(row) for row in rows]
@@ -176,9 +239,7 @@ class ReminderManager:
         """
         with self._get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT * FROM complete_reminder(%s)
-                """, (reminder_id,))
+                STATEMENTS["complete"].execute(cur, (reminder_id,))
 
                 row = cur.fetchone()
                 conn.commit()
@@ -198,9 +259,7 @@ class ReminderManager:
         """
         with self._get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT snooze_reminder(%s, %s)
-                """, (reminder_id, minutes))
+                STATEMENTS["snooze"].execute(cur, (reminder_id, minutes))
 
                 result = cur.fetchone()[0]
                 conn.commit()
@@ -219,15 +278,127 @@ class ReminderManager:
         """
         with self._get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    DELETE FROM aria_reminders WHERE id = %s
-                """, (reminder_id,))
+                STATEMENTS["delete"].execute(cur, (reminder_id,))
 
                 deleted = cur.rowcount > 0
                 conn.commit()
 
                 return deleted
 
+    def set_reminders_bulk(self, reminders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create many reminders with a single batched INSERT.
+
+        Args:
+            reminders: List of dicts with the set_reminder() arguments
+                       (text, remind_at, and optionally recurrence, priority,
+                       category, user_id)
+
+        Returns:
+            One result dict per input item, in order, with success, message
+            and reminder (Reminder object or None). Items that fail validation
+            are reported and skipped; the rest are inserted.
+        """
+        results, rows = prepare_bulk_rows(reminders, self.time_context)
+
+        inserted = []
+        if rows:
+            with self._get_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    inserted = execute_values(cur, """
+                        INSERT INTO aria_reminders (
+                            id, user_id, reminder_text, remind_at, recurrence, priority, category
+                        ) VALUES %s
+                        ON CONFLICT (id) DO NOTHING
+                        RETURNING *
+                    """, rows, template="(%s::uuid, %s, %s, %s, %s, %s, %s)",
+                        page_size=500, fetch=True)
+
+        return apply_bulk_results(results, inserted)
+
+    def complete_reminders(self, reminder_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Complete many reminders in one transaction, handling recurrence.
+
+        Args:
+            reminder_ids: UUIDs of the reminders
+
+        Returns:
+            One result dict per input id, in order, with reminder_id, success,
+            message and next_reminder_id (for recurring)
+        """
+        if not reminder_ids:
+            return []
+
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT * FROM complete_reminders(%s::uuid[])
+                """, (list(reminder_ids),))
+
+                by_id = {str(row['reminder_id']): dict(row) for row in cur.fetchall()}
+
+        return [
+            by_id.get(str(rid), {
+                "reminder_id": rid, "success": False,
+                "message": "Reminder not found", "next_reminder_id": None
+            })
+            for rid in reminder_ids
+        ]
+
+    def snooze_reminders(self, reminder_ids: List[str], minutes: int = 30) -> List[Dict[str, Any]]:
+        """
+        Snooze many reminders with a single UPDATE.
+
+        Args:
+            reminder_ids: UUIDs of the reminders
+            minutes: Minutes to snooze
+
+        Returns:
+            One result dict per input id, in order, with reminder_id and success
+        """
+        if not reminder_ids:
+            return []
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE aria_reminders
+                    SET
+                        snoozed_until = NOW() + make_interval(mins => %s),
+                        snooze_count = snooze_count + 1
+                    WHERE id = ANY(%s::uuid[]) AND NOT completed
+                    RETURNING id
+                """, (minutes, list(reminder_ids)))
+
+                snoozed = {str(row[0]) for row in cur.fetchall()}
+
+        return [{"reminder_id": rid, "success": str(rid) in snoozed} for rid in reminder_ids]
+
+    def delete_reminders(self, reminder_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Delete many reminders with a single DELETE.
+
+        Args:
+            reminder_ids: UUIDs of the reminders
+
+        Returns:
+            One result dict per input id, in order, with reminder_id and success
+        """
+        if not reminder_ids:
+            return []
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    DELETE FROM aria_reminders WHERE id = ANY(%s::uuid[])
+                    RETURNING id
+                """, (list(reminder_ids),))
+
+                deleted = {str(row[0]) for row in cur.fetchall()}
+
+        return [{"reminder_id": rid, "success": str(rid) in deleted} for rid in reminder_ids]
+
     def get_reminder_summary(self, user_id: str = "damon") -> Dict[str, int]:
         """
         Get reminder summary statistics.
@@ -240,20 +411,198 @@ class ReminderManager:
         """
         with self._get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT * FROM aria_reminder_summary WHERE user_id = %s
-                """, (user_id,))
+                STATEMENTS["summary"].execute(cur, (user_id,))
 
                 row = cur.fetchone()
                 if row:
                     return dict(row)
-                return {
-                    "overdue_count": 0,
-                    "upcoming_soon": 0,
-                    "upcoming_today": 0,
-                    "total_active": 0,
-                    "completed_this_week": 0
-                }
+                return dict(EMPTY_SUMMARY)
+
+    def refresh_summary_counts(self, user_id: Optional[str] = None) -> int:
+        """
+        Recompute the trigger-maintained active counts behind get_reminder_summary.
+
+        Only needed after writes that bypassed triggers (e.g. a restore with
+        triggers disabled).
+
+        Args:
+            user_id: Refresh one user, or all users if None
+
+        Returns:
+            Number of users refreshed
+        """
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT refresh_reminder_counts(%s)", (user_id,))
+                return cur.fetchone()[0]
+
+    def iter_occurrences(
+        self,
+        user_id: str,
+        start: datetime,
+        end: datetime
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every reminder occurrence in [start, end), in time order.
+
+        One-off reminders appear once; recurring reminders are expanded
+        lazily past their stored row (see recurrence.py), following the wall
+        clock of this manager's timezone and stopping at recurrence_end_date.
+        Rows are read up front, so no connection is held while iterating.
+
+        Projections can differ from the rows complete_reminder creates later.
+        The SQL adds the interval in the session zone (UTC on Supabase), so
+        across a DST change the next stored row moves an hour against the
+        projection. It also chains +1 month from the previous row, so a
+        month-end anchor drifts earlier (Jan 31, Feb 28, Mar 28) where the
+        projection returns to the 31st.
+
+        Args:
+            user_id: User ID
+            start: Window start (naive times are taken in this manager's timezone)
+            end: Window end, exclusive
+
+        Yields:
+            Dicts with reminder_id, occurs_at, reminder_text, priority,
+            category, recurrence and stored (True for the row's own due time,
+            False for a projected future occurrence)
+        """
+        tz = self.time_context.timezone
+        if start.tzinfo is None:
+            start = tz.localize(start)
+        if end.tzinfo is None:
+            end = tz.localize(end)
+
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT id, reminder_text, remind_at, recurrence, recurrence_end_date,
+                           priority, category,
+                           COALESCE(snoozed_until, remind_at) AS due_at
+                    FROM aria_reminders
+                    WHERE user_id = %(user_id)s
+                      AND NOT completed
+                      AND (
+                        (COALESCE(snoozed_until, remind_at) >= %(start)s
+                         AND COALESCE(snoozed_until, remind_at) < %(end)s)
+                        OR (recurrence IS NOT NULL
+                            AND remind_at < %(end)s
+                            AND (recurrence_end_date IS NULL OR recurrence_end_date >= %(start)s))
+                      )
+                """, {"user_id": user_id, "start": start, "end": end})
+                rows = cur.fetchall()
+
+        def occurrence(row, occurs_at: datetime, stored: bool) -> Dict[str, Any]:
+            return {
+                "reminder_id": str(row['id']),
+                "occurs_at": occurs_at.astimezone(tz),
+                "reminder_text": row['reminder_text'],
+                "priority": row['priority'],
+                "category": row['category'],
+                "recurrence": row['recurrence'],
+                "stored": stored
+            }
+
+        stored = sorted(
+            (occurrence(row, row['due_at'], True) for row in rows if start <= row['due_at'] < end),
+            key=lambda o: o['occurs_at']
+        )
+        def projected(row) -> Iterator[Dict[str, Any]]:
+            for when in occurrences(row['remind_at'], row['recurrence'], tz, start, end,
+                                    until=row['recurrence_end_date'], first=1):
+                yield occurrence(row, when, False)
+
+        return heapq.merge(
+            stored, *(projected(row) for row in rows if row['recurrence']),
+            key=lambda o: o['occurs_at']
+        )
+
+    def get_reminder_history(
+        self,
+        user_id: str = "damon",
+        since: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Get completed reminders, including archived ones.
+
+        Other methods only see active reminders and recent completions;
+        this is the opt-in path to full history.
+
+        Args:
+            user_id: User ID
+            since: Only reminders completed at or after this time
+            limit: Maximum rows to return
+
+        Returns:
+            Completed reminders, newest completion first, with an archived flag
+        """
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT * FROM get_reminder_history(%s, %s, %s)
+                """, (user_id, since, limit))
+
+                return [dict(row) for row in cur.fetchall()]
+
+    def archive_completed_reminders(
+        self,
+        older_than_days: int = 7,
+        batch_size: int = 10000
+    ) -> int:
+        """
+        Move old completed reminders to aria_reminders_archive.
+
+        Runs one transaction per batch so locks stay short. Use this where
+        pg_cron isn't available.
+
+        Args:
+            older_than_days: Archive reminders completed more than this many days ago
+            batch_size: Rows moved per transaction
+
+        Returns:
+            Total rows archived
+        """
+        total = 0
+        while True:
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT archive_completed_reminders(make_interval(days => %s), %s)
+                    """, (older_than_days, batch_size))
+                    moved = cur.fetchone()[0]
+            total += moved
+            if moved < batch_size:
+                return total
+
+    def get_reminder_snapshot(
+        self,
+        user_id: str = "damon",
+        upcoming_hours: int = 2
+    ) -> Dict[str, Any]:
+        """
+        Get overdue reminders, upcoming reminders and summary counts in one query.
+
+        Args:
+            user_id: User ID
+            upcoming_hours: Hours to look ahead for upcoming reminders
+
+        Returns:
+            Dict with as_of, overdue (with overdue_by), upcoming (with time_until)
+            and summary, matching the shapes of the individual methods
+        """
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                STATEMENTS["snapshot"].execute(cur, (user_id, upcoming_hours))
+
+                row = cur.fetchone()
+
+        return {
+            "as_of": row['as_of'],
+            "overdue": [self._snapshot_row(r, 'overdue_by') for r in row['overdue']],
+            "upcoming": [self._snapshot_row(r, 'time_until') for r in row['upcoming']],
+            "summary": row['summary'] or dict(EMPTY_SUMMARY)
+        }
 
     def get_proactive_message(self, user_id: str = "damon") -> Optional[str]:
         """
@@ -265,9 +614,15 @@ class ReminderManager:
         Returns:
             Natural language message about reminders, or None
         """
-        overdue = self.get_overdue_reminders(user_id)
-        upcoming = self.get_upcoming_reminders(hours=2, user_id=user_id)
-
+        snapshot = self.get_reminder_snapshot(user_id, upcoming_hours=2)
+        return self._format_proactive_message(snapshot['overdue'], snapshot['upcoming'])
+
+    @staticmethod
+    def _format_proactive_message(
+        overdue: List[Dict[str, Any]],
+        upcoming: List[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Render overdue and upcoming reminders as a proactive message"""
         messages = []
 
         if overdue:
@@ -299,7 +654,16 @@ class ReminderManager:
             return "\n".join(messages)
         return None
 
-    def _row_to_reminder(self, row: Dict) -> Reminder:
+    @staticmethod
+    def _snapshot_row(row: Dict[str, Any], interval_key: str) -> Dict[str, Any]:
+        """Convert a JSON reminder row from get_reminder_snapshot back to Python types"""
+        row = dict(row)
+        row['remind_at'] = datetime.fromisoformat(row['remind_at'])
+        row[interval_key] = timedelta(seconds=float(row.pop(f"{interval_key}_seconds")))
+        return row
+
+    @staticmethod
+    def _row_to_reminder(row: Dict) -> Reminder:
         """Convert database row to Reminder object"""
         return Reminder(
             id=str(row['id']),
@@ -320,36 +684,145 @@ class ReminderManager:
         )
 
 
+def prepare_bulk_rows(reminders: List[Dict[str, Any]], time_context: TimeContext) -> tuple:
+    """
+    Validate bulk reminder items.
+
+    Returns:
+        (results, rows): a pending result dict per item, and insert rows
+        (id, user_id, text, remind_at, recurrence, priority, category)
+        for the items that passed validation
+    """
+    results: List[Dict[str, Any]] = []
+    rows = []
+
+    for item in reminders:
+        result = {"success": False, "message": "", "reminder": None}
+        results.append(result)
+
+        remind_at = item.get("remind_at")
+        if isinstance(remind_at, str):
+            remind_at = time_context.parse_natural_time(remind_at)
+        recurrence = item.get("recurrence")
+        priority = item.get("priority", "normal")
+
+        if not item.get("text"):
+            result["message"] = "Missing reminder text"
+        elif remind_at is None:
+            result["message"] = f"Could not parse time: {item.get('remind_at')}"
+        elif recurrence is not None and recurrence not in RECURRENCES:
+            result["message"] = f"Invalid recurrence: {recurrence}"
+        elif priority not in PRIORITIES:
+            result["message"] = f"Invalid priority: {priority}"
+        else:
+            reminder_id = str(item.get("id") or uuid.uuid4())
+            result["id"] = reminder_id
+            rows.append((
+                reminder_id, item.get("user_id", "damon"), item["text"], remind_at,
+                recurrence, priority, item.get("category")
+            ))
+
+    return results, rows
+
+
+def apply_bulk_results(
+    results: List[Dict[str, Any]],
+    inserted: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Fill pending bulk results from the rows the INSERT returned"""
+    by_id = {str(row['id']): row for row in inserted}
+    for result in results:
+        reminder_id = result.pop("id", None)
+        if reminder_id is None:
+            continue
+        row = by_id.get(reminder_id)
+        if row is None:
+            result["message"] = "Reminder already exists"
+        else:
+            result["success"] = True
+            result["message"] = "Reminder created"
+            result["reminder"] = ReminderManager._row_to_reminder(row)
+    return results
+
+
+class SharedManagers:
+    """
+    Process-wide ReminderManager instances, keyed by db config and timezone.
+
+    Managers are created lazily on first use and rebuilt in a forked child
+    so a worker never reuses its parent's connections.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._managers: Dict[tuple, ReminderManager] = {}
+        self._pid = os.getpid()
+
+    def get(
+        self,
+        db_config: Optional[Dict[str, str]] = None,
+        timezone: str = "America/Los_Angeles"
+    ) -> ReminderManager:
+        """
+        Get the shared manager for a configuration.
+
+        Args:
+            db_config: Database configuration dict. If None, reads from environment
+            timezone: Timezone for natural language parsing
+
+        Returns:
+            Shared ReminderManager
+        """
+        db_config = db_config or ReminderManager._get_db_config()
+        key = (tuple(sorted((k, str(v)) for k, v in db_config.items())), timezone)
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._managers.clear()
+                self._pid = os.getpid()
+
+            manager = self._managers.get(key)
+            if manager is None:
+                manager = ReminderManager(db_config, timezone=timezone)
+                self._managers[key] = manager
+            return manager
+
+    def reset(self):
+        """Drop all shared managers (for tests and config reloads)"""
+        with self._lock:
+            self._managers.clear()
+            self._pid = os.getpid()
+
+
+shared_managers = SharedManagers()
+
+
 # Convenience functions for n8n code nodes
 def set_reminder(text: str, remind_at: str, recurrence: str = None) -> Dict:
     """Create a reminder (for n8n)"""
-    manager = ReminderManager()
+    manager = shared_managers.get()
     reminder = manager.set_reminder(text, remind_at, recurrence)
     return reminder.to_dict()
 
 
 def get_upcoming(hours: int = 24) -> List[Dict]:
     """Get upcoming reminders (for n8n)"""
-    manager = ReminderManager()
-    return manager.get_upcoming_reminders(hours)
+    return shared_managers.get().get_upcoming_reminders(hours)
 
 
 def get_overdue() -> List[Dict]:
     """Get overdue reminders (for n8n)"""
-    manager = ReminderManager()
-    return manager.get_overdue_reminders()
+    return shared_managers.get().get_overdue_reminders()
 
 
 def complete(reminder_id: str) -> Dict:
     """Complete a reminder (for n8n)"""
-    manager = ReminderManager()
-    return manager.complete_reminder(reminder_id)
+    return shared_managers.get().complete_reminder(reminder_id)
 
 
 def get_proactive_message() -> Optional[str]:
     """Get proactive reminder message (for n8n)"""
-    manager = ReminderManager()
-    return manager.get_proactive_message()
+    return shared_managers.get().get_proactive_message()
 
 
 if __name__ == "__main__":
@@ -388,6 +861,11 @@ if __name__ == "__main__":
             print("Overdue reminders:")
             print(json.dumps(reminders, indent=2, default=str))
 
+        elif command == "snapshot":
+            snapshot = manager.get_reminder_snapshot()
+            print("Reminder snapshot:")
+            print(json.dumps(snapshot, indent=2, default=str))
+
         elif command == "summary":
             summary = manager.get_reminder_summary()
             print("Reminder summary:")
@@ -404,6 +882,23 @@ if __name__ == "__main__":
             result = manager.complete_reminder(sys.argv[2])
             print(json.dumps(result, indent=2, default=str))
 
+        elif command == "occurrences":
+            days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+            start = manager.time_context.get_current_time()
+            print(f"Occurrences in the next {days} days:")
+            for occ in manager.iter_occurrences("damon", start, start + timedelta(days=days)):
+                print(json.dumps(occ, default=str))
+
+        elif command == "history":
+            history = manager.get_reminder_history()
+            print("Reminder history:")
+            print(json.dumps(history, indent=2, default=str))
+
+        elif command == "archive":
+            days = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+            print(f"Archived {manager.archive_completed_reminders(days)} reminders")
+
     else:
         print("Usage: python reminders.py <command> [args]")
-        print("Commands: test, upcoming [hours], overdue, summary, proactive, complete <id>")
+        print("Commands: test, upcoming [hours], overdue, summary, snapshot, proactive, complete <id>, "
+              "occurrences [days], history, archive [days]")
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Async Reminders Module for ARIA
+asyncio counterpart of ReminderManager, backed by an asyncpg pool
+
+Methods mirror ReminderManager one for one and return the same shapes, so
+bot and webhook handlers can await them instead of pushing psycopg2 calls
+onto a thread executor.
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+import asyncpg
+
+from reminders import (
+    ReminderManager, Reminder, EMPTY_SUMMARY, prepare_bulk_rows, apply_bulk_results
+)
+from time_context import registry as time_contexts
+
+
+def _record_to_dict(record: asyncpg.Record) -> Dict[str, Any]:
+    """Convert an asyncpg record to the dict shape psycopg2 returns"""
+    return {
+        key: str(value) if isinstance(value, uuid.UUID) else value
+        for key, value in record.items()
+    }
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Decode json/jsonb to Python objects, as psycopg2 does"""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+class AsyncReminderManager:
+    """Manages ARIA reminders from asyncio code"""
+
+    def __init__(
+        self,
+        db_config: Optional[Dict[str, str]] = None,
+        timezone: str = "America/Los_Angeles",
+        min_size: int = 1,
+        max_size: int = 10,
+        query_timeout: float = 10.0
+    ):
+        """
+        Initialize async reminder manager.
+
+        Call open() (or use "async with") before the first query.
+
+        Args:
+            db_config: Database configuration dict with host, port, user, password, database
+                      If None, reads from environment or uses Docker defaults
+            timezone: Timezone used to parse natural language times
+            min_size: Connections opened when the pool starts
+            max_size: Upper bound on pool connections
+            query_timeout: Default seconds to wait for a connection and, separately,
+                before a query is cancelled
+        """
+        self.db_config = db_config or ReminderManager._get_db_config()
+        self.time_context = time_contexts.get(timezone)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.query_timeout = query_timeout
+        self.pool: Optional[asyncpg.Pool] = None
+
+    async def open(self) -> "AsyncReminderManager":
+        """Create the connection pool"""
+        if self.pool is None:
+            self.pool = await asyncpg.create_pool(
+                host=self.db_config["host"],
+                port=int(self.db_config["port"]),
+                user=self.db_config["user"],
+                password=self.db_config["password"],
+                database=self.db_config["database"],
+                min_size=self.min_size,
+                max_size=self.max_size,
+                init=_init_connection
+            )
+        return self
+
+    async def close(self):
+        """Close the connection pool"""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def __aenter__(self) -> "AsyncReminderManager":
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _fetch(self, query: str, *args, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Run a query and return rows as dicts; cancelled server-side on timeout.
+
+        Waiting for a pooled connection is bounded by the same timeout, so an
+        exhausted pool raises asyncio.TimeoutError instead of waiting forever.
+        """
+        timeout = self.query_timeout if timeout is None else timeout
+        async with self.pool.acquire(timeout=timeout) as conn:
+            records = await conn.fetch(query, *args, timeout=timeout)
+        return [_record_to_dict(r) for r in records]
+
+    async def _fetchrow(self, query: str, *args, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        rows = await self._fetch(query, *args, timeout=timeout)
+        return rows[0] if rows else None
+
+    async def set_reminder(
+        self,
+        text: str,
+        remind_at: datetime | str,
+        recurrence: Optional[str] = None,
+        priority: str = "normal",
+        category: Optional[str] = None,
+        user_id: str = "damon"
+    ) -> Reminder:
+        """Create a new reminder (see ReminderManager.set_reminder)"""
+        if isinstance(remind_at, str):
+            parsed = self.time_context.parse_natural_time(remind_at)
+            if parsed is None:
+                raise ValueError(f"Could not parse time: {remind_at}")
+            remind_at = parsed
+
+        row = await self._fetchrow("""
+            INSERT INTO aria_reminders (
+                user_id, reminder_text, remind_at, recurrence, priority, category
+            ) VALUES ($1, $2, $3, $4, $5, $6)
+            RETURNING *
+        """, user_id, text, remind_at, recurrence, priority, category)
+
+        return ReminderManager._row_to_reminder(row)
+
+    async def get_upcoming_reminders(
+        self,
+        hours: int = 24,
+        user_id: str = "damon"
+    ) -> List[Dict[str, Any]]:
+        """Get reminders coming up in the next N hours"""
+        return await self._fetch("SELECT * FROM get_upcoming_reminders($1, $2)", user_id, hours)
+
+    async def get_overdue_reminders(self, user_id: str = "damon") -> List[Dict[str, Any]]:
+        """Get reminders that are past due"""
+        return await self._fetch("SELECT * FROM get_overdue_reminders($1)", user_id)
+
+    async def complete_reminder(self, reminder_id: str) -> Dict[str, Any]:
+        """Mark a reminder as completed (handles recurrence)"""
+        row = await self._fetchrow("SELECT * FROM complete_reminder($1::uuid)", reminder_id)
+        return row if row else {"success": False, "message": "Unknown error"}
+
+    async def snooze_reminder(self, reminder_id: str, minutes: int = 30) -> bool:
+        """Snooze a reminder"""
+        row = await self._fetchrow(
+            "SELECT snooze_reminder($1::uuid, $2) AS snoozed", reminder_id, minutes
+        )
+        return row["snoozed"]
+
+    async def delete_reminder(self, reminder_id: str) -> bool:
+        """Delete a reminder"""
+        rows = await self._fetch(
+            "DELETE FROM aria_reminders WHERE id = $1::uuid RETURNING id", reminder_id
+        )
+        return len(rows) > 0
+
+    async def set_reminders_bulk(self, reminders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many reminders with one INSERT ... SELECT FROM unnest()"""
+        results, rows = prepare_bulk_rows(reminders, self.time_context)
+
+        inserted = []
+        if rows:
+            columns = list(zip(*rows))
+            inserted = await self._fetch("""
+                INSERT INTO aria_reminders (
+                    id, user_id, reminder_text, remind_at, recurrence, priority, category
+                )
+                SELECT * FROM unnest(
+                    $1::uuid[], $2::text[], $3::text[], $4::timestamptz[],
+                    $5::text[], $6::text[], $7::text[]
+                )
+                ON CONFLICT (id) DO NOTHING
+                RETURNING *
+            """, *[list(col) for col in columns])
+
+        return apply_bulk_results(results, inserted)
+
+    async def complete_reminders(self, reminder_ids: List[str]) -> List[Dict[str, Any]]:
+        """Complete many reminders in one transaction, handling recurrence"""
+        if not reminder_ids:
+            return []
+        rows = await self._fetch(
+            "SELECT * FROM complete_reminders($1::uuid[])", [str(r) for r in reminder_ids]
+        )
+        by_id = {row['reminder_id']: row for row in rows}
+        return [
+            by_id.get(str(rid), {
+                "reminder_id": rid, "success": False,
+                "message": "Reminder not found", "next_reminder_id": None
+            })
+            for rid in reminder_ids
+        ]
+
+    async def snooze_reminders(self, reminder_ids: List[str], minutes: int = 30) -> List[Dict[str, Any]]:
+        """Snooze many reminders with a single UPDATE"""
+        if not reminder_ids:
+            return []
+        rows = await self._fetch("""
+            UPDATE aria_reminders
+            SET
+                snoozed_until = NOW() + make_interval(mins => $1),
+                snooze_count = snooze_count + 1
+            WHERE id = ANY($2::uuid[]) AND NOT completed
+            RETURNING id
+        """, minutes, [str(r) for r in reminder_ids])
+        snoozed = {row['id'] for row in rows}
+        return [{"reminder_id": rid, "success": str(rid) in snoozed} for rid in reminder_ids]
+
+    async def delete_reminders(self, reminder_ids: List[str]) -> List[Dict[str, Any]]:
+        """Delete many reminders with a single DELETE"""
+        if not reminder_ids:
+            return []
+        rows = await self._fetch(
+            "DELETE FROM aria_reminders WHERE id = ANY($1::uuid[]) RETURNING id",
+            [str(r) for r in reminder_ids]
+        )
+        deleted = {row['id'] for row in rows}
+        return [{"reminder_id": rid, "success": str(rid) in deleted} for rid in reminder_ids]
+
+    async def get_reminder_summary(self, user_id: str = "damon") -> Dict[str, int]:
+        """Get reminder summary statistics"""
+        row = await self._fetchrow("SELECT * FROM aria_reminder_summary WHERE user_id = $1", user_id)
+        return row if row else dict(EMPTY_SUMMARY)
+
+    async def get_reminder_snapshot(
+        self,
+        user_id: str = "damon",
+        upcoming_hours: int = 2
+    ) -> Dict[str, Any]:
+        """Get overdue, upcoming and summary data in one query"""
+        row = await self._fetchrow(
+            "SELECT * FROM get_reminder_snapshot($1, $2)", user_id, upcoming_hours
+        )
+        return {
+            "as_of": row['as_of'],
+            "overdue": [ReminderManager._snapshot_row(r, 'overdue_by') for r in row['overdue']],
+            "upcoming": [ReminderManager._snapshot_row(r, 'time_until') for r in row['upcoming']],
+            "summary": row['summary'] or dict(EMPTY_SUMMARY)
+        }
+
+    async def get_reminder_history(
+        self,
+        user_id: str = "damon",
+        since: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Get completed reminders, including archived ones"""
+        return await self._fetch(
+            "SELECT * FROM get_reminder_history($1, $2, $3)", user_id, since, limit
+        )
+
+    async def get_proactive_message(self, user_id: str = "damon") -> Optional[str]:
+        """Generate proactive reminder message for conversation start"""
+        snapshot = await self.get_reminder_snapshot(user_id, upcoming_hours=2)
+        return ReminderManager._format_proactive_message(snapshot['overdue'], snapshot['upcoming'])
+
+    async def get_snapshots(
+        self,
+        user_ids: List[str],
+        upcoming_hours: int = 2,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch snapshots for many users concurrently.
+
+        Args:
+            user_ids: Users to fetch
+            upcoming_hours: Hours to look ahead for upcoming reminders
+            timeout: Overall deadline in seconds; unfinished queries are cancelled
+
+        Returns:
+            Dict of user_id -> snapshot, or the exception raised for that user
+            (asyncio.TimeoutError if it missed the deadline)
+        """
+        tasks = [
+            asyncio.ensure_future(self.get_reminder_snapshot(user_id, upcoming_hours))
+            for user_id in user_ids
+        ]
+        if not tasks:
+            return {}
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        # Let cancelled queries unwind and release their connections
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        results = {}
+        for user_id, task in zip(user_ids, tasks):
+            if task in pending:
+                results[user_id] = asyncio.TimeoutError(f"No snapshot within {timeout}s")
+            else:
+                results[user_id] = task.exception() or task.result()
+        return results
+
+    async def get_proactive_messages(
+        self,
+        user_ids: List[str],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Optional[str]]:
+        """Generate proactive messages for many users concurrently"""
+        snapshots = await self.get_snapshots(user_ids, upcoming_hours=2, timeout=timeout)
+        return {
+            user_id: None if isinstance(snapshot, BaseException) else
+            ReminderManager._format_proactive_message(snapshot['overdue'], snapshot['upcoming'])
+            for user_id, snapshot in snapshots.items()
+        }
+
+
+if __name__ == "__main__":
+    import sys
+
+    async def main():
+        async with AsyncReminderManager() as manager:
+            users = sys.argv[1:] or ["damon"]
+            messages = await manager.get_proactive_messages(users, timeout=10)
+            for user_id, message in messages.items():
+                print(f"[{user_id}] {message or 'No reminders to surface'}")
+
+    asyncio.run(main())
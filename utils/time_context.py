@@ -4,20 +4,151 @@ Time Context Module for ARIA
 Provides time awareness for system prompts and responses
 """
 
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Callable, Optional, List, Dict, Any, Tuple
 import pytz
 
 
+def _time_of_day(hour: int) -> str:
+    """Get time of day category for an hour"""
+    if 5 <= hour < 12:
+        return "morning"
+    elif 12 <= hour < 17:
+        return "afternoon"
+    elif 17 <= hour < 21:
+        return "evening"
+    else:
+        return "night"
+
+
+@dataclass(frozen=True)
+class TimeSnapshot:
+    """Every time context field, computed once from a single instant"""
+    now: datetime
+    timezone: str
+    date: str
+    time: str
+    time_12h: str
+    day_name: str
+    day_of_week: int  # 1=Monday, 7=Sunday
+    month_name: str
+    timezone_abbrev: str
+    utc_offset: str
+    time_of_day: str
+    is_weekend: bool
+    is_business_hours: bool
+
+    @classmethod
+    def at(cls, now: datetime, timezone: str) -> "TimeSnapshot":
+        """Build a snapshot from an aware datetime and its zone name"""
+        day_of_week = now.isoweekday()
+        return cls(
+            now=now,
+            timezone=timezone,
+            date=now.strftime("%Y-%m-%d"),
+            time=now.strftime("%H:%M:%S"),
+            time_12h=now.strftime("%I:%M %p").lstrip("0"),
+            day_name=now.strftime("%A"),
+            day_of_week=day_of_week,
+            month_name=now.strftime("%B"),
+            timezone_abbrev=now.strftime("%Z"),
+            utc_offset=now.strftime("%z"),
+            time_of_day=_time_of_day(now.hour),
+            is_weekend=day_of_week >= 6,
+            is_business_hours=9 <= now.hour < 17 and day_of_week < 6
+        )
+
+    @property
+    def greeting(self) -> str:
+        return f"Good {self.time_of_day}"
+
+    @property
+    def natural_string(self) -> str:
+        """Natural language string, e.g. "It's Wednesday, January 14, 2026 at 10:15 AM PST" """
+        return (
+            f"It's {self.day_name}, {self.month_name} {self.now.day}, {self.now.year} "
+            f"at {self.time_12h} {self.timezone_abbrev}"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape as TimeContext.get_full_context()"""
+        now = self.now
+        return {
+            "datetime": now.isoformat(),
+            "date": self.date,
+            "time": self.time,
+            "time_12h": self.time_12h,
+            "day_name": self.day_name,
+            "day_of_week": self.day_of_week,
+            "month_name": self.month_name,
+            "month": now.month,
+            "day": now.day,
+            "year": now.year,
+            "hour": now.hour,
+            "minute": now.minute,
+            "timezone": self.timezone,
+            "timezone_abbrev": self.timezone_abbrev,
+            "utc_offset": self.utc_offset,
+            "time_of_day": self.time_of_day,
+            "greeting": self.greeting,
+            "is_weekend": self.is_weekend,
+            "is_business_hours": self.is_business_hours,
+            "natural_string": self.natural_string
+        }
+
+    def prompt_block(self) -> str:
+        """Render the system prompt time block"""
+        lines = [
+            "## Current Time Context",
+            f"**{self.natural_string}**",
+            f"- Day: {self.day_name} (Day {self.day_of_week} of the week)",
+            f"- Date: {self.month_name} {self.now.day}, {self.now.year}",
+            f"- Time: {self.time_12h} {self.timezone_abbrev}",
+        ]
+
+        if self.is_weekend:
+            lines.append("- It's the weekend")
+        elif self.is_business_hours:
+            lines.append("- During business hours")
+        else:
+            lines.append(f"- It's {self.time_of_day} time")
+
+        return "\n".join(lines)
+
+
 class TimeContext:
     """Generates time context strings for ARIA"""
 
-    def __init__(self, timezone: str = "America/Los_Angeles"):
+    def __init__(
+        self,
+        timezone: str = "America/Los_Angeles",
+        clock: Optional[Callable[[], datetime]] = None
+    ):
+        """
+        Initialize time context.
+
+        Args:
+            timezone: IANA timezone name
+            clock: Returns the current aware datetime (any zone); defaults to
+                   the system clock. Inject a fixed clock in tests.
+        """
         self.timezone = pytz.timezone(timezone)
+        self.clock = clock
+        self._prompt_cache: Optional[tuple] = None
 
     def get_current_time(self) -> datetime:
         """Get current time in configured timezone"""
-        return datetime.now(self.timezone)
+        if self.clock is None:
+            return datetime.now(self.timezone)
+        return self.clock().astimezone(self.timezone)
+
+    def snapshot(self) -> TimeSnapshot:
+        """Get every time context field computed from a single now"""
+        return TimeSnapshot.at(self.get_current_time(), str(self.timezone))
 
     def get_time_context(self) -> str:
         """
@@ -26,35 +157,15 @@ class TimeContext:
         Returns:
             String like "It's Wednesday, January 14, 2026 at 10:15 AM PST"
         """
-        now = self.get_current_time()
-
-        # Format components
-        day_name = now.strftime("%A")  # Wednesday
-        month_name = now.strftime("%B")  # January
-        day = now.day  # 14
-        year = now.year  # 2026
-        time_str = now.strftime("%I:%M %p").lstrip("0")  # 10:15 AM
-        tz_abbrev = now.strftime("%Z")  # PST
-
-        return f"It's {day_name}, {month_name} {day}, {year} at {time_str} {tz_abbrev}"
+        return self.snapshot().natural_string
 
     def get_time_of_day(self) -> str:
         """Get time of day category"""
-        hour = self.get_current_time().hour
-
-        if 5 <= hour < 12:
-            return "morning"
-        elif 12 <= hour < 17:
-            return "afternoon"
-        elif 17 <= hour < 21:
-            return "evening"
-        else:
-            return "night"
+        return _time_of_day(self.get_current_time().hour)
 
     def get_greeting(self) -> str:
         """Get appropriate greeting based on time"""
-        time_of_day = self.get_time_of_day()
-        return f"Good {time_of_day}"
+        return f"Good {self.get_time_of_day()}"
 
     def get_full_context(self) -> Dict[str, Any]:
         """
@@ -63,178 +174,337 @@ class TimeContext:
         Returns:
             Dict with all time-related information
         """
-        now = self.get_current_time()
-
-        return {
-            "datetime": now.isoformat(),
-            "date": now.strftime("%Y-%m-%d"),
-            "time": now.strftime("%H:%M:%S"),
-            "time_12h": now.strftime("%I:%M %p").lstrip("0"),
-            "day_name": now.strftime("%A"),
-            "day_of_week": now.isoweekday(),  # 1=Monday, 7=Sunday
-            "month_name": now.strftime("%B"),
-            "month": now.month,
-            "day": now.day,
-            "year": now.year,
-            "hour": now.hour,
-            "minute": now.minute,
-            "timezone": str(self.timezone),
-            "timezone_abbrev": now.strftime("%Z"),
-            "utc_offset": now.strftime("%z"),
-            "time_of_day": self.get_time_of_day(),
-            "greeting": self.get_greeting(),
-            "is_weekend": now.isoweekday() >= 6,
-            "is_business_hours": 9 <= now.hour < 17 and now.isoweekday() < 6,
-            "natural_string": self.get_time_context()
-        }
+        return self.snapshot().to_dict()
 
     def get_system_prompt_block(self) -> str:
         """
         Generate a time context block for system prompts.
 
+        The block only shows minutes, so the rendered string is reused until
+        the minute changes.
+
         Returns:
             Formatted block for inclusion in system prompts
         """
-        ctx = self.get_full_context()
-
-        lines = [
-            "## Current Time Context",
-            f"**{ctx['natural_string']}**",
-            f"- Day: {ctx['day_name']} (Day {ctx['day_of_week']} of the week)",
-            f"- Date: {ctx['month_name']} {ctx['day']}, {ctx['year']}",
-            f"- Time: {ctx['time_12h']} {ctx['timezone_abbrev']}",
-        ]
+        now = self.get_current_time()
+        minute = now.replace(second=0, microsecond=0)
 
-        if ctx['is_weekend']:
-            lines.append("- It's the weekend")
-        elif ctx['is_business_hours']:
-            lines.append("- During business hours")
-        else:
-            lines.append(f"- It's {ctx['time_of_day']} time")
+        cached = self._prompt_cache
+        if cached is not None and cached[0] == minute:
+            return cached[1]
 
-        return "\n".join(lines)
+        block = TimeSnapshot.at(now, str(self.timezone)).prompt_block()
+        self._prompt_cache = (minute, block)
+        return block
 
     def parse_natural_time(self, text: str) -> Optional[datetime]:
         """
         Parse natural language time references.
 
+        Results are cached per (phrase, minute), so repeated phrases within
+        a minute are a dictionary lookup. "now" and "in ..." results are
+        shifted by the seconds into the minute, so they stay exact.
+
         Args:
-            text: Natural language like "tomorrow at 3pm", "in 2 hours", "next Monday"
+            text: Natural language like "tomorrow at 3pm", "in 2h30m", "next Monday",
+                  "Jan 15 at 3pm", "next week", "end of day"
 
         Returns:
             Datetime object or None if unparseable
         """
         now = self.get_current_time()
-        text = text.lower().strip()
-
-        # Handle relative times
-        if text.startswith("in "):
-            return self._parse_relative_time(text[3:], now)
-
-        # Handle specific references
-        if text == "now":
-            return now
-        elif text == "today":
-            return now.replace(hour=9, minute=0, second=0, microsecond=0)
-        elif text == "tonight":
-            return now.replace(hour=20, minute=0, second=0, microsecond=0)
-        elif text == "tomorrow":
-            return (now + timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
-        elif "tomorrow at" in text:
-            time_part = text.replace("tomorrow at", "").strip()
-            base = now + timedelta(days=1)
-            return self._parse_time_into_date(base, time_part)
-
-        # Handle day references
-        days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-        for i, day in enumerate(days):
-            if f"next {day}" in text or text == day:
-                target_weekday = i
-                current_weekday = now.weekday()
-                days_ahead = target_weekday - current_weekday
-                if days_ahead <= 0:
-                    days_ahead += 7
-                target_date = now + timedelta(days=days_ahead)
-                target_date = target_date.replace(hour=9, minute=0, second=0, microsecond=0)
-
-                # Check for time specification
-                if " at " in text:
-                    time_part = text.split(" at ")[-1]
-                    return self._parse_time_into_date(target_date, time_part)
-                return target_date
-
+        minute = now.replace(second=0, microsecond=0)
+        when, relative = _parse_cached(_normalize(text), minute, self.timezone)
+        if when is not None and relative:
+            when = self.timezone.normalize(when + (now - minute))
+        return when
+
+
+_WEEKDAYS = {
+    "monday": 0, "mon": 0,
+    "tuesday": 1, "tue": 1, "tues": 1,
+    "wednesday": 2, "wed": 2,
+    "thursday": 3, "thu": 3, "thur": 3, "thurs": 3,
+    "friday": 4, "fri": 4,
+    "saturday": 5, "sat": 5,
+    "sunday": 6, "sun": 6,
+}
+
+_MONTHS = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3,
+    "april": 4, "apr": 4, "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7,
+    "august": 8, "aug": 8, "september": 9, "sep": 9, "sept": 9,
+    "october": 10, "oct": 10, "november": 11, "nov": 11, "december": 12, "dec": 12,
+}
+
+_UNITS = {
+    "m": "minutes", "min": "minutes", "mins": "minutes", "minute": "minutes", "minutes": "minutes",
+    "h": "hours", "hr": "hours", "hrs": "hours", "hour": "hours", "hours": "hours",
+    "d": "days", "day": "days", "days": "days",
+    "w": "weeks", "wk": "weeks", "wks": "weeks", "week": "weeks", "weeks": "weeks",
+}
+
+_DEFAULT_TIME = time(9, 0)
+
+_TIME = r"(?:noon|midnight|\d{1,2}(?::\d{2})?\s*(?:am|pm)?)"
+_AT_TIME = rf"(?:\s+(?:at\s+)?(?P<time>{_TIME}))?"
+_WEEKDAY = "|".join(sorted(_WEEKDAYS, key=len, reverse=True))
+_MONTH = "|".join(sorted(_MONTHS, key=len, reverse=True))
+_UNIT = "|".join(sorted(_UNITS, key=len, reverse=True))
+
+_RE_WHITESPACE = re.compile(r"\s+")
+_RE_TIME = re.compile(r"(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>am|pm)?")
+_RE_RELATIVE = re.compile(rf"in\s+(?P<body>(?:(?:\d+\s*|an?\s+)(?:{_UNIT})(?![a-z])(?:\s*,?\s*(?:and\s+)?)?)+)")
+_RE_DURATION = re.compile(rf"(?:(?P<amount>\d+)\s*|an?\s+)(?P<unit>{_UNIT})(?![a-z])")
+_RE_KEYWORD = re.compile(rf"(?P<word>now|today|tonight|tomorrow|next week|end of (?:the )?day|eod){_AT_TIME}")
+_RE_WEEKDAY = re.compile(rf"(?:(?:next|this|on)\s+)?(?P<weekday>{_WEEKDAY}){_AT_TIME}")
+_RE_MONTH_DAY = re.compile(
+    rf"(?:on\s+)?(?:(?P<month>{_MONTH})\.?\s+(?P<day>\d{{1,2}})|(?P<day2>\d{{1,2}})\s+(?P<month2>{_MONTH})\.?)"
+    rf"(?:st|nd|rd|th)?(?:,?\s+(?P<year>\d{{4}}))?{_AT_TIME}"
+)
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and collapse whitespace so equivalent phrases share a cache entry"""
+    return _RE_WHITESPACE.sub(" ", text.lower().strip())
+
+
+def _parse_clock(text: Optional[str], default: Optional[time] = _DEFAULT_TIME) -> Optional[time]:
+    """Parse '3pm', '15:30', '9:30 am', 'noon' into a time"""
+    if text is None:
+        return default
+    if text == "noon":
+        return time(12, 0)
+    if text == "midnight":
+        return time(0, 0)
+
+    match = _RE_TIME.fullmatch(text)
+    if match is None:
         return None
+    hour = int(match.group("hour"))
+    minute = int(match.group("minute") or 0)
+    ampm = match.group("ampm")
 
-    def _parse_relative_time(self, text: str, base: datetime) -> Optional[datetime]:
-        """Parse relative time like '2 hours', '30 minutes', '1 day'"""
-        parts = text.split()
-        if len(parts) < 2:
+    if ampm:
+        if not 1 <= hour <= 12:
             return None
-
+        if ampm == "pm" and hour != 12:
+            hour += 12
+        elif ampm == "am" and hour == 12:
+            hour = 0
+    if hour > 23 or minute > 59:
+        return None
+    return time(hour, minute)
+
+
+def _at(tz, day: date, clock: time) -> datetime:
+    """Localize a wall-clock date and time (correct across DST changes)"""
+    return tz.localize(datetime.combine(day, clock))
+
+
+@lru_cache(maxsize=2048)
+def _parse_cached(text: str, now: datetime, tz) -> Tuple[Optional[datetime], bool]:
+    """
+    Parse a normalized phrase relative to a minute-aligned now.
+
+    Returns (datetime or None, whether the result is relative to now and
+    so needs the seconds dropped from the cache key added back).
+    """
+    match = _RE_RELATIVE.fullmatch(text)
+    if match:
+        delta = timedelta()
+        for part in _RE_DURATION.finditer(match.group("body")):
+            amount = int(part.group("amount") or 1)
+            delta += timedelta(**{_UNITS[part.group("unit")]: amount})
+        return tz.normalize(now + delta), True
+
+    today = now.date()
+
+    match = _RE_KEYWORD.fullmatch(text)
+    if match:
+        word = match.group("word")
+        if word == "now":
+            return (None, False) if match.group("time") else (now, True)
+        if word == "tonight":
+            spoken = match.group("time")
+            clock = _parse_clock(spoken, time(20, 0))
+            day = today
+            bare = _RE_TIME.fullmatch(spoken) if spoken else None
+            if clock is not None and bare and not bare.group("ampm") and clock.hour == 12:
+                clock = clock.replace(hour=0)  # "tonight at 12" means midnight, not noon
+            if clock is not None and spoken and clock.hour < 12:
+                if bare and not bare.group("ampm") and clock.hour >= 1:
+                    clock = clock.replace(hour=clock.hour + 12)  # "tonight at 8" means 8pm
+                else:
+                    day = today + timedelta(days=1)  # "tonight at 12am/1am/midnight" is after midnight
+        elif word == "tomorrow":
+            clock = _parse_clock(match.group("time"))
+            day = today + timedelta(days=1)
+        elif word == "next week":
+            clock = _parse_clock(match.group("time"))
+            day = today + timedelta(days=7 - today.weekday())
+        elif word == "today":
+            clock = _parse_clock(match.group("time"))
+            day = today
+        else:  # end of day
+            clock = _parse_clock(match.group("time"), time(17, 0))
+            day = today
+            if clock is not None and not match.group("time") and now.time() >= clock:
+                clock = time(23, 59)
+        return (None if clock is None else _at(tz, day, clock)), False
+
+    match = _RE_WEEKDAY.fullmatch(text)
+    if match:
+        clock = _parse_clock(match.group("time"))
+        if clock is None:
+            return None, False
+        days_ahead = _WEEKDAYS[match.group("weekday")] - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        return _at(tz, today + timedelta(days=days_ahead), clock), False
+
+    match = _RE_MONTH_DAY.fullmatch(text)
+    if match:
+        clock = _parse_clock(match.group("time"))
+        month = _MONTHS[match.group("month") or match.group("month2")]
+        day_of_month = int(match.group("day") or match.group("day2"))
+        year = int(match.group("year")) if match.group("year") else today.year
         try:
-            amount = int(parts[0])
+            day = date(year, month, day_of_month)
+            if not match.group("year") and day < today:
+                day = date(year + 1, month, day_of_month)
         except ValueError:
-            return None
+            return None, False
+        return (None if clock is None else _at(tz, day, clock)), False
 
-        unit = parts[1].rstrip("s")  # Remove plural
+    return None, False
 
-        if unit == "minute":
-            return base + timedelta(minutes=amount)
-        elif unit == "hour":
-            return base + timedelta(hours=amount)
-        elif unit == "day":
-            return base + timedelta(days=amount)
-        elif unit == "week":
-            return base + timedelta(weeks=amount)
 
-        return None
+DEFAULT_TIMEZONE = "America/Los_Angeles"
 
-    def _parse_time_into_date(self, base: datetime, time_str: str) -> datetime:
-        """Parse a time string and apply it to a base date"""
-        time_str = time_str.strip().lower()
-
-        # Handle 12-hour format with am/pm
-        hour = None
-        minute = 0
-
-        if "am" in time_str or "pm" in time_str:
-            is_pm = "pm" in time_str
-            time_str = time_str.replace("am", "").replace("pm", "").strip()
-
-            if ":" in time_str:
-                parts = time_str.split(":")
-                hour = int(parts[0])
-                minute = int(parts[1])
-            else:
-                hour = int(time_str)
-
-            if is_pm and hour != 12:
-                hour += 12
-            elif not is_pm and hour == 12:
-                hour = 0
-        elif ":" in time_str:
-            parts = time_str.split(":")
-            hour = int(parts[0])
-            minute = int(parts[1])
-        else:
+
+class TimeContextRegistry:
+    """
+    Process-wide cache of timezones, per-zone TimeContexts and user timezones.
+
+    TimeContext instances are shared per zone, so their per-minute prompt
+    block cache is shared too.
+    """
+
+    def __init__(
+        self,
+        default_timezone: str = DEFAULT_TIMEZONE,
+        clock: Optional[Callable[[], datetime]] = None
+    ):
+        """
+        Initialize registry.
+
+        Args:
+            default_timezone: Zone for users without a setting
+            clock: Clock passed to every TimeContext (see TimeContext)
+        """
+        self.default_timezone = default_timezone
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._contexts: Dict[str, TimeContext] = {}
+        self._user_zones: Dict[str, str] = {}
+
+    def get(self, timezone: Optional[str] = None) -> TimeContext:
+        """Get the shared TimeContext for a zone"""
+        timezone = timezone or self.default_timezone
+        tc = self._contexts.get(timezone)
+        if tc is None:
+            with self._lock:
+                tc = self._contexts.get(timezone)
+                if tc is None:
+                    tc = TimeContext(timezone, clock=self.clock)
+                    self._contexts[timezone] = tc
+        return tc
+
+    def set_user_timezone(self, user_id: str, timezone: str):
+        """Record a user's zone (validated against the tz database)"""
+        self.get(timezone)
+        with self._lock:
+            self._user_zones[user_id] = timezone
+
+    def for_user(self, user_id: str) -> TimeContext:
+        """Get the TimeContext for a user's zone (default zone if unknown)"""
+        return self.get(self._user_zones.get(user_id))
+
+    def load_user_timezones(self, conn, user_ids: List[str]) -> Dict[str, str]:
+        """
+        Load timezones for many users from aria_user_settings in one query.
+
+        Args:
+            conn: psycopg2 connection
+            user_ids: Users to look up
+
+        Returns:
+            Dict of user_id -> timezone for every requested user (unknown
+            users and invalid zone names get the default zone)
+        """
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT user_id, timezone FROM aria_user_settings
+                WHERE user_id = ANY(%s)
+            """, (list(user_ids),))
+            rows = cur.fetchall()
+
+        zones = {user_id: self.default_timezone for user_id in user_ids}
+        for user_id, timezone in rows:
             try:
-                hour = int(time_str)
-            except ValueError:
-                hour = 9  # Default
+                self.get(timezone)
+            except pytz.UnknownTimeZoneError:
+                continue
+            zones[user_id] = timezone
+
+        with self._lock:
+            self._user_zones.update(zones)
+        return zones
+
+    def render_prompt_blocks(self, user_ids: List[str]) -> Dict[str, str]:
+        """
+        Render the system prompt time block for many users in one pass.
+
+        Every block is rendered from the same instant, once per distinct zone.
+
+        Returns:
+            Dict of user_id -> prompt block
+        """
+        default = self.get()
+        instant = default.clock() if default.clock else datetime.now(pytz.utc)
+
+        blocks: Dict[str, str] = {}
+        by_zone: Dict[str, str] = {}
+        for user_id in user_ids:
+            timezone = self._user_zones.get(user_id, self.default_timezone)
+            block = by_zone.get(timezone)
+            if block is None:
+                tc = self.get(timezone)
+                now = instant.astimezone(tc.timezone)
+                block = TimeSnapshot.at(now, timezone).prompt_block()
+                by_zone[timezone] = block
+            blocks[user_id] = block
+        return blocks
+
+    def reset(self):
+        """Drop cached contexts and user zones (for tests)"""
+        with self._lock:
+            self._contexts.clear()
+            self._user_zones.clear()
+
 
-        if hour is not None:
-            return base.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        return base
+registry = TimeContextRegistry()
 
 
-def get_time_context_string(timezone: str = "America/Los_Angeles") -> str:
+def get_time_context_string(timezone: str = DEFAULT_TIMEZONE) -> str:
     """Convenience function to get time context string"""
-    return TimeContext(timezone).get_time_context()
+    return registry.get(timezone).get_time_context()
 
 
-def get_system_prompt_time_block(timezone: str = "America/Los_Angeles") -> str:
+def get_system_prompt_time_block(timezone: str = DEFAULT_TIMEZONE) -> str:
     """Convenience function to get system prompt block"""
-    return TimeContext(timezone).get_system_prompt_block()
+    return registry.get(timezone).get_system_prompt_block()
 
 
 if __name__ == "__main__":
@@ -250,3 +520,7 @@ if __name__ == "__main__":
     # Remove non-serializable datetime
     ctx['datetime'] = str(ctx['datetime'])
     print(json.dumps(ctx, indent=2))
+    print("\nParsing:")
+    for phrase in ("in 2 hours", "tomorrow at 3pm", "tonight", "tonight at 8",
+                   "tonight at 12", "next friday", "end of day"):
+        print(f"  {phrase!r}: {tc.parse_natural_time(phrase)}")
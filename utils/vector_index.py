@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Vector Index Module for ARIA
+Sizes, rebuilds and measures the embedding indexes without blocking writes
+
+For each embedding table the plan picks HNSW (no training, best recall per
+millisecond) unless the table is too large to build one in reasonable time
+and memory, in which case it picks ivfflat with lists sized from the row
+count (rows/1000 up to 1M rows, sqrt(rows) beyond). A rebuild creates the
+new index CONCURRENTLY under a temporary name, swaps it in, and records
+recall@k against exact search before and after in aria_vector_index_reports
+(015_aria_vector_indexes.sql):
+
+    python vector_index.py plan
+    python vector_index.py --tables aria_messages rebuild --queries 100
+    python vector_index.py report
+"""
+
+import json
+import math
+import statistics
+import sys
+import time
+from typing import Optional, List, Dict, Any, Tuple
+
+from data_export import connect
+
+# Embedding table -> its main index (001_aria_schema.sql names)
+INDEXES = {
+    "aria_conversations": "idx_aria_conversations_embedding",
+    "aria_messages": "idx_aria_messages_embedding",
+    "aria_attachments": "idx_aria_attachments_embedding",
+    "aria_unified_memory": "idx_aria_memory_embedding",
+}
+
+# Above this many embedded rows an HNSW build takes hours and needs more
+# maintenance_work_mem than a small server has; use ivfflat instead
+HNSW_MAX_ROWS = 2_000_000
+IVFFLAT_MAX_LISTS = 32768
+
+HNSW_OPTIONS = {"m": 16, "ef_construction": 64}
+
+
+def plan_index(rows: int, method: str = "auto") -> Tuple[str, Dict[str, int]]:
+    """
+    Choose an index method and its build options for a table size.
+
+    Args:
+        rows: Rows with a non-NULL embedding
+        method: 'auto', 'hnsw' or 'ivfflat'
+
+    Returns:
+        (method, options); ivfflat options include the probes to query with
+    """
+    if method == "auto":
+        method = "hnsw" if rows <= HNSW_MAX_ROWS else "ivfflat"
+    if method == "hnsw":
+        return method, dict(HNSW_OPTIONS)
+    if method != "ivfflat":
+        raise ValueError(f"Invalid index method: {method}")
+
+    lists = rows // 1000 if rows <= 1_000_000 else int(math.sqrt(rows))
+    lists = max(1, min(lists, IVFFLAT_MAX_LISTS))
+    return method, {"lists": lists, "probes": max(1, round(math.sqrt(lists)))}
+
+
+class VectorIndexMaintenance:
+    """Plans and performs embedding index rebuilds on one autocommit connection"""
+
+    def __init__(self, conn, maintenance_work_mem: str = "1GB"):
+        """
+        Args:
+            conn: psycopg2 connection; switched to autocommit, which
+                  CREATE INDEX CONCURRENTLY requires
+            maintenance_work_mem: Memory for index builds (HNSW builds are far
+                                  faster when the graph fits)
+        """
+        self.conn = conn
+        self.conn.autocommit = True
+        self.maintenance_work_mem = maintenance_work_mem
+
+    def _fetchall(self, query: str, params: tuple = ()) -> List[tuple]:
+        with self.conn.cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
+
+    def _execute(self, *statements: str, params: tuple = ()):
+        with self.conn.cursor() as cur:
+            for statement in statements:
+                cur.execute(statement, params or None)
+
+    def row_count(self, table: str) -> int:
+        return self._fetchall(f"SELECT COUNT(*) FROM {table} WHERE embedding IS NOT NULL")[0][0]
+
+    def current_index(self, index: str) -> Optional[Dict[str, Any]]:
+        """Method, definition and validity of an index (None if it doesn't exist)"""
+        rows = self._fetchall("""
+            SELECT am.amname, pg_get_indexdef(i.oid), x.indisvalid
+            FROM pg_class i
+            JOIN pg_index x ON x.indexrelid = i.oid
+            JOIN pg_am am ON am.oid = i.relam
+            WHERE i.relname = %s
+        """, (index,))
+        if not rows:
+            return None
+        method, definition, valid = rows[0]
+        return {"method": method, "definition": definition, "valid": valid}
+
+    def plan(self, tables: List[str], method: str = "auto") -> List[Dict[str, Any]]:
+        """Current and recommended index for each table"""
+        plans = []
+        for table in tables:
+            rows = self.row_count(table)
+            current = self.current_index(INDEXES[table])
+            recommended, options = plan_index(rows, method)
+            plans.append({
+                "table": table,
+                "index": INDEXES[table],
+                "rows": rows,
+                "current": current["method"] if current else None,
+                "method": recommended,
+                "options": options
+            })
+        return plans
+
+    # Recall measurement
+
+    def sample(self, table: str, n: int) -> List[str]:
+        """Random stored embeddings (pgvector text form) to query with"""
+        return [row[0] for row in self._fetchall(
+            f"SELECT embedding::text FROM {table} WHERE embedding IS NOT NULL "
+            f"ORDER BY random() LIMIT %s", (n,)
+        )]
+
+    def _nearest(self, table: str, vector: str, k: int) -> Tuple[List[str], float]:
+        with self.conn.cursor() as cur:
+            start = time.perf_counter_ns()
+            cur.execute(
+                f"SELECT id FROM {table} WHERE embedding IS NOT NULL "
+                f"ORDER BY embedding <=> %s::vector LIMIT %s", (vector, k)
+            )
+            ids = [str(row[0]) for row in cur.fetchall()]
+            return ids, (time.perf_counter_ns() - start) / 1e6
+
+    def exact(self, table: str, vectors: List[str], k: int) -> List[set]:
+        """Ground-truth k nearest ids for each query vector, by sequential scan"""
+        self._execute("SET enable_indexscan = off")
+        try:
+            return [set(self._nearest(table, v, k)[0]) for v in vectors]
+        finally:
+            self._execute("RESET enable_indexscan")
+
+    def measure(
+        self,
+        table: str,
+        vectors: List[str],
+        truth: List[set],
+        k: int,
+        options: Optional[Dict[str, int]] = None
+    ) -> Tuple[float, float]:
+        """
+        Recall@k and median latency (ms) of the index for the query vectors.
+
+        ivfflat is queried with options['probes'] when given, HNSW with
+        ef_search of at least k; otherwise session defaults apply.
+        """
+        settings = ["SET enable_seqscan = off"]
+        if options and "probes" in options:
+            settings.append(f"SET ivfflat.probes = {int(options['probes'])}")
+        settings.append(f"SET hnsw.ef_search = {max(40, int(k))}")
+        self._execute(*settings)
+        try:
+            recalls, latencies = [], []
+            for vector, expected in zip(vectors, truth):
+                found, ms = self._nearest(table, vector, k)
+                recalls.append(len(set(found) & expected) / len(expected) if expected else 1.0)
+                latencies.append(ms)
+        finally:
+            self._execute("RESET enable_seqscan", "RESET ivfflat.probes", "RESET hnsw.ef_search")
+        return statistics.fmean(recalls), statistics.median(latencies)
+
+    # Rebuild
+
+    def build(self, table: str, method: str, options: Dict[str, int]) -> float:
+        """
+        Build the table's index concurrently and swap it in.
+
+        Returns:
+            Build time in seconds
+        """
+        index = INDEXES[table]
+        new = f"{index}_new"
+        if method == "hnsw":
+            with_clause = f"m = {int(options['m'])}, ef_construction = {int(options['ef_construction'])}"
+        else:
+            with_clause = f"lists = {int(options['lists'])}"
+
+        # A failed earlier run can leave an INVALID index behind
+        self._execute(f"DROP INDEX CONCURRENTLY IF EXISTS {new}")
+        self._execute("SET maintenance_work_mem = %s", params=(self.maintenance_work_mem,))
+        start = time.monotonic()
+        try:
+            self._execute(
+                f"CREATE INDEX CONCURRENTLY {new} ON {table} "
+                f"USING {method} (embedding vector_cosine_ops) WITH ({with_clause})"
+            )
+        finally:
+            self._execute("RESET maintenance_work_mem")
+        elapsed = time.monotonic() - start
+
+        if not self.current_index(new)["valid"]:
+            self._execute(f"DROP INDEX CONCURRENTLY IF EXISTS {new}")
+            raise RuntimeError(f"Concurrent build of {new} left an invalid index")
+
+        # The new index already serves queries, so the gap between the drop
+        # and the rename costs nothing
+        self._execute(
+            f"DROP INDEX CONCURRENTLY IF EXISTS {index}",
+            f"ALTER INDEX {new} RENAME TO {index}",
+            f"ANALYZE {table}"
+        )
+        return elapsed
+
+    def rebuild(
+        self,
+        table: str,
+        method: str = "auto",
+        k: int = 10,
+        queries: int = 50,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Rebuild one table's index if the plan differs from what exists (or
+        force), measuring recall@k before and after, and record the result.
+
+        Returns:
+            The report row as a dict (skipped=True if nothing was rebuilt)
+        """
+        rows = self.row_count(table)
+        method, options = plan_index(rows, method)
+        current = self.current_index(INDEXES[table])
+        report: Dict[str, Any] = {"table": table, "index": INDEXES[table], "method": method,
+                                  "options": options, "rows": rows, "k": k}
+
+        # An HNSW index never goes stale; an ivfflat one is rebuilt so its
+        # lists follow the row count
+        if (not force and current and current["valid"]
+                and current["method"] == method == "hnsw"):
+            report["skipped"] = True
+            return report
+
+        vectors = self.sample(table, queries)
+        truth = self.exact(table, vectors, k)
+        before = (None, None)
+        if vectors and current and current["valid"]:
+            before = self.measure(table, vectors, truth, k)
+
+        build_seconds = self.build(table, method, options)
+        after = self.measure(table, vectors, truth, k, options) if vectors else (None, None)
+
+        report.update({
+            "queries": len(vectors),
+            "recall_before": before[0],
+            "recall_after": after[0],
+            "latency_before_ms": before[1],
+            "latency_after_ms": after[1],
+            "build_seconds": build_seconds
+        })
+        self._execute("""
+            INSERT INTO aria_vector_index_reports
+              (table_name, index_name, method, options, row_count, k, queries,
+               recall_before, recall_after, latency_before_ms, latency_after_ms, build_seconds)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, params=(table, INDEXES[table], method, json.dumps(options), rows, k, len(vectors),
+                     before[0], after[0], before[1], after[1], build_seconds))
+        return report
+
+    def reports(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent rebuild reports"""
+        rows = self._fetchall("""
+            SELECT created_at, table_name, method, options, row_count, k, queries,
+                   recall_before, recall_after, latency_before_ms, latency_after_ms, build_seconds
+            FROM aria_vector_index_reports
+            ORDER BY created_at DESC
+            LIMIT %s
+        """, (limit,))
+        keys = ["created_at", "table", "method", "options", "rows", "k", "queries",
+                "recall_before", "recall_after", "latency_before_ms", "latency_after_ms",
+                "build_seconds"]
+        return [dict(zip(keys, row)) for row in rows]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ARIA vector index maintenance")
+    parser.add_argument("--dsn", help="Postgres DSN (default: $SUPABASE_DB_URL or POSTGRES_* env)")
+    parser.add_argument("--tables", default=",".join(INDEXES),
+                        help="Comma-separated subset of " + ",".join(INDEXES))
+    parser.add_argument("--method", choices=["auto", "hnsw", "ivfflat"], default="auto")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("plan", help="Show current and recommended indexes")
+    rebuild = sub.add_parser("rebuild", help="Rebuild indexes concurrently and record recall")
+    rebuild.add_argument("-k", "--k", type=int, default=10)
+    rebuild.add_argument("--queries", type=int, default=50)
+    rebuild.add_argument("--force", action="store_true",
+                         help="Rebuild even if the index already matches the plan")
+    rebuild.add_argument("--maintenance-work-mem", default="1GB")
+    sub.add_parser("report", help="Show recent rebuild reports")
+    args = parser.parse_args()
+
+    tables = args.tables.split(",")
+    unknown = [t for t in tables if t not in INDEXES]
+    if unknown:
+        parser.error(f"Unknown tables: {', '.join(unknown)}")
+
+    maintenance = VectorIndexMaintenance(
+        connect(args.dsn), getattr(args, "maintenance_work_mem", "1GB")
+    )
+    if args.command == "plan":
+        output = maintenance.plan(tables, args.method)
+    elif args.command == "rebuild":
+        output = []
+        for table in tables:
+            print(f"Rebuilding {table}...", file=sys.stderr)
+            output.append(maintenance.rebuild(table, args.method, args.k, args.queries, args.force))
+    else:
+        output = maintenance.reports()
+    print(json.dumps(output, indent=2, default=str))
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Vector Search Module for ARIA
+Client for the k-NN-first match_* search functions, with a recall/latency
+benchmark against exact search
+
+The match_* functions (014_aria_vector_search.sql) take the k nearest rows
+from the ivfflat/HNSW index and apply the similarity threshold afterwards.
+probes / ef_search trade recall for latency per call; the benchmark measures
+that trade-off on real embeddings:
+
+    python vector_search.py benchmark --queries 50 --k 10 --ef-search 40,100,200
+    python vector_search.py benchmark --interface telegram --probes 1,10,40
+"""
+
+import json
+import statistics
+import time
+from typing import Optional, List, Dict, Any, Sequence
+
+from psycopg2.extras import RealDictCursor
+
+from db_pool import ConnectionPool, get_pool
+from reminders import ReminderManager
+
+
+def to_vector_literal(embedding: Sequence[float]) -> str:
+    """pgvector text form of an embedding, for use with %s::vector"""
+    return "[" + ",".join(repr(float(x)) for x in embedding) + "]"
+
+
+def parse_vector(value: str) -> List[float]:
+    """Parse pgvector text output ('[0.1,0.2,...]')"""
+    return [float(x) for x in value.strip("[]").split(",")] if value else []
+
+
+class VectorSearch:
+    """Semantic search over messages and memories"""
+
+    def __init__(
+        self,
+        db_config: Optional[Dict[str, str]] = None,
+        pool: Optional[ConnectionPool] = None
+    ):
+        """
+        Initialize vector search.
+
+        Args:
+            db_config: Database configuration dict with host, port, user, password, database
+                      If None, reads from environment or uses Docker defaults
+            pool: Connection pool to use. If None, uses the shared pool for db_config
+        """
+        self.db_config = db_config or ReminderManager._get_db_config()
+        self.pool = pool or get_pool(self.db_config)
+
+    def _query(self, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(sql, params)
+                return [dict(row) for row in cur.fetchall()]
+
+    def search_messages(
+        self,
+        embedding: Sequence[float],
+        k: int = 10,
+        threshold: float = 0.0,
+        interface: Optional[str] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the messages most similar to an embedding.
+
+        Args:
+            embedding: Query embedding (1536 floats)
+            k: Maximum number of results
+            threshold: Minimum cosine similarity, applied to the k nearest
+            interface: Only search messages from this interface_source
+            probes: ivfflat.probes for this call (higher = better recall, slower)
+            ef_search: hnsw.ef_search for this call (raised to k if lower)
+
+        Returns:
+            Dicts with id, conversation_id, role, content, interface_source,
+            created_at and similarity, most similar first
+        """
+        return self._query(
+            "SELECT * FROM match_aria_messages(%s::vector, %s, %s, %s, %s, %s)",
+            (to_vector_literal(embedding), k, threshold, interface, probes, ef_search)
+        )
+
+    def search_conversations(
+        self,
+        embedding: Sequence[float],
+        k: int = 10,
+        threshold: float = 0.0,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Messages with their conversation's session_id (search_similar_conversations columns)"""
+        return self._query(
+            "SELECT * FROM match_similar_conversations(%s::vector, %s, %s, %s, %s)",
+            (to_vector_literal(embedding), k, threshold, probes, ef_search)
+        )
+
+    def search_memory(
+        self,
+        embedding: Sequence[float],
+        k: int = 10,
+        threshold: float = 0.0,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Active memories most similar to an embedding"""
+        return self._query(
+            "SELECT * FROM match_aria_memory(%s::vector, %s, %s, %s, %s)",
+            (to_vector_literal(embedding), k, threshold, probes, ef_search)
+        )
+
+    def exact_messages(
+        self,
+        embedding: Sequence[float],
+        k: int = 10,
+        interface: Optional[str] = None
+    ) -> List[str]:
+        """
+        Ids of the true k nearest messages, by sequential scan.
+
+        Index scans are disabled for the transaction so the result is exact;
+        this reads every embedding and is only meant for measuring recall.
+        """
+        query = """
+            SELECT id FROM aria_messages
+            WHERE embedding IS NOT NULL
+        """
+        params: list = []
+        if interface is not None:
+            query += " AND interface_source = %s"
+            params.append(interface)
+        query += " ORDER BY embedding <=> %s::vector LIMIT %s"
+        params += [to_vector_literal(embedding), k]
+
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SET LOCAL enable_indexscan = off")
+                cur.execute(query, tuple(params))
+                ids = [str(row[0]) for row in cur.fetchall()]
+            conn.rollback()
+        return ids
+
+    def sample_embeddings(self, n: int, interface: Optional[str] = None) -> List[List[float]]:
+        """Random stored message embeddings, to use as realistic queries"""
+        query = "SELECT embedding::text FROM aria_messages WHERE embedding IS NOT NULL"
+        params: tuple = ()
+        if interface is not None:
+            query += " AND interface_source = %s"
+            params = (interface,)
+        query += " ORDER BY random() LIMIT %s"
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params + (n,))
+                return [parse_vector(row[0]) for row in cur.fetchall()]
+
+
+def benchmark(
+    search: VectorSearch,
+    queries: int = 50,
+    k: int = 10,
+    interface: Optional[str] = None,
+    probes: Sequence[Optional[int]] = (None,),
+    ef_search: Sequence[Optional[int]] = (None,)
+) -> Dict[str, Any]:
+    """
+    Measure recall@k and latency of match_aria_messages against exact search.
+
+    Every probes x ef_search combination runs the same sampled queries. The
+    exact ground truth is computed once per query.
+
+    Returns:
+        Dict with the parameters, exact-search latency and one result per
+        setting (recall mean/min, latency median/p95 in milliseconds)
+    """
+    vectors = search.sample_embeddings(queries, interface)
+    if not vectors:
+        raise ValueError("No embedded messages to benchmark against")
+
+    truth = []
+    exact_ms = []
+    for vector in vectors:
+        start = time.perf_counter_ns()
+        truth.append(set(search.exact_messages(vector, k, interface)))
+        exact_ms.append((time.perf_counter_ns() - start) / 1e6)
+
+    results = []
+    for p in probes:
+        for ef in ef_search:
+            recalls, samples = [], []
+            for vector, expected in zip(vectors, truth):
+                start = time.perf_counter_ns()
+                rows = search.search_messages(vector, k, -1.0, interface, p, ef)
+                samples.append((time.perf_counter_ns() - start) / 1e6)
+                found = {str(row["id"]) for row in rows}
+                recalls.append(len(found & expected) / len(expected) if expected else 1.0)
+            samples.sort()
+            results.append({
+                "probes": p,
+                "ef_search": ef,
+                "recall_mean": statistics.fmean(recalls),
+                "recall_min": min(recalls),
+                "median_ms": statistics.median(samples),
+                "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            })
+
+    exact_ms.sort()
+    return {
+        "queries": len(vectors),
+        "k": k,
+        "interface": interface,
+        "exact_median_ms": statistics.median(exact_ms),
+        "exact_p95_ms": exact_ms[min(len(exact_ms) - 1, int(len(exact_ms) * 0.95))],
+        "results": results
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    def int_list(value: str) -> List[Optional[int]]:
+        return [int(v) for v in value.split(",")] if value else [None]
+
+    parser = argparse.ArgumentParser(description="ARIA vector search")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench = sub.add_parser("benchmark", help="Recall@k and latency vs exact search")
+    bench.add_argument("--queries", type=int, default=50)
+    bench.add_argument("-k", "--k", type=int, default=10)
+    bench.add_argument("--interface", help="Only search this interface_source")
+    bench.add_argument("--probes", type=int_list, default=[None],
+                       help="Comma-separated ivfflat.probes values")
+    bench.add_argument("--ef-search", type=int_list, default=[None],
+                       help="Comma-separated hnsw.ef_search values")
+    args = parser.parse_args()
+
+    report = benchmark(VectorSearch(), args.queries, args.k, args.interface,
+                       args.probes, args.ef_search)
+    print(json.dumps(report, indent=2))